@@ -0,0 +1,386 @@
+"""API regression benchmarks: query counts, latency and payload size per endpoint.
+
+``seed`` creates a deterministic dataset, ``run_benchmarks`` requests every
+read-only API route through the DRF test client and ``compare`` checks the
+measurements against the checked-in baseline (``core/benchmarks/baseline.json``).
+
+Query counts are taken from the first, cold-cache request so cached endpoints
+still report the work they do on a miss; latency percentiles cover the
+following warm requests.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmarks" / "baseline.json"
+DEFAULT_TOLERANCES = {
+	"queries": 0,
+	"p50_ratio": 2.0,
+	"p95_ratio": 3.0,
+	"latency_slack_ms": 15.0,
+	"bytes_ratio": 0.1,
+}
+PASSWORD = "benchmark-pass-123"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+	"""A GET route to benchmark; ``pk`` names an object created by ``seed``.
+
+	``params`` values may contain ``{placeholders}`` filled from the ``params``
+	returned by ``seed`` (for example a sync token).
+	"""
+
+	name: str
+	url_name: str
+	params: dict[str, str] = field(default_factory=dict)
+	pk: str | None = None
+	admin: bool = False
+
+
+ENDPOINTS: tuple[Endpoint, ...] = (
+	Endpoint("users.list", "user-list", admin=True),
+	Endpoint("users.me", "user-me"),
+	Endpoint("users.detail", "user-detail", pk="student"),
+	Endpoint("finance.incomes", "income-list"),
+	Endpoint("finance.incomes.detail", "income-detail", pk="income"),
+	Endpoint("finance.incomes.search", "income-search", {"q": "job"}),
+	Endpoint("finance.expenses", "expense-list"),
+	Endpoint("finance.expenses.detail", "expense-detail", pk="expense"),
+	Endpoint("finance.expenses.search", "expense-search", {"q": "cafe"}),
+	Endpoint("finance.budgets", "budget-list"),
+	Endpoint("finance.budgets.detail", "budget-detail", pk="budget"),
+	Endpoint("finance.budgets.utilization", "budget-utilization"),
+	Endpoint("finance.recurring", "recurring-transaction-list"),
+	Endpoint("finance.recurring.detail", "recurring-transaction-detail", pk="recurring"),
+	Endpoint("finance.categories", "category-list"),
+	Endpoint("finance.categories.detail", "category-detail", pk="category"),
+	Endpoint("finance.summary", "finance-summary-list"),
+	Endpoint("finance.summary.trends", "finance-summary-trends", {"window": "12m"}),
+	Endpoint("finance.summary.expenses_by_category", "finance-summary-expenses-by-category", {"period": "last_6_months"}),
+	Endpoint("finance.summary.category_breakdown", "finance-summary-expenses-category-breakdown", {"mode": "last_6_months"}),
+	Endpoint("finance.summary.incomes_by_category", "finance-summary-incomes-by-category"),
+	Endpoint("finance.summary.analytics", "finance-summary-analytics"),
+	Endpoint("finance.summary.forecast", "finance-summary-forecast"),
+	Endpoint("finance.summary.departments", "finance-summary-departments", admin=True),
+	Endpoint("finance.summary.cache_stats", "finance-summary-response-cache-stats", admin=True),
+	Endpoint("finance.export", "finance-export", {"format": "csv"}),
+	Endpoint("finance.changes", "finance-changes", {"since": "{sync_token}"}),
+	Endpoint("loan.schemes", "loan-schemes-list"),
+	Endpoint("loan.schemes.detail", "loan-schemes-detail", pk="scheme"),
+	Endpoint("loan.loans", "loan-list"),
+	Endpoint("loan.loans.admin", "loan-list", admin=True),
+	Endpoint("loan.loans.detail", "loan-detail", pk="loan"),
+	Endpoint("loan.loans.repayments", "loan-list-repayments", pk="loan"),
+	Endpoint("loan.summary", "loan-summary"),
+	Endpoint("loan.history", "loan-history"),
+	Endpoint("loan.admin_history", "loan-admin-history", admin=True),
+	Endpoint("scholarships.list", "scholarship:scholarship-list"),
+	Endpoint("scholarships.list.admin", "scholarship:scholarship-list", admin=True),
+	Endpoint("scholarships.detail", "scholarship:scholarship-detail", pk="scholarship"),
+	Endpoint("scholarships.disbursements", "scholarship:scholarship-disbursements", admin=True),
+	Endpoint("scholarships.applications", "scholarship:scholarship-list-applications", pk="scholarship", admin=True),
+	Endpoint("scholarships.my_applications", "scholarship:scholarship-my-applications"),
+	Endpoint("notifications.list", "notification-list"),
+)
+
+
+@dataclass
+class Measurement:
+	status: int
+	queries: int
+	p50_ms: float
+	p95_ms: float
+	bytes: int
+
+
+def seed(scale: int = 1, *, random_seed: int = 1234) -> dict[str, Any]:
+	"""Create a realistic dataset and return the users and object ids it made."""
+
+	from finance.bulk import insert_expenses, insert_incomes
+	from finance.models import Budget, Category, Expense, Income, RecurringTransaction
+	from finance.sync import issue_token, latest_change_id
+	from loan.models import Loan, LoanScheme
+	from notifications.models import Notification
+	from scholarship.models import Scholarship, ScholarshipApplication, ScholarshipDisbursement
+
+	User = get_user_model()
+	rng = random.Random(random_seed)
+	today = timezone.localdate()
+	admin = User.objects.create_superuser(email="bench-admin@example.com", password=PASSWORD, role=User.Roles.ADMIN)
+	students = [
+		User.objects.create_user(
+			email=f"bench-student{index}@example.com",
+			password=PASSWORD,
+			role=User.Roles.STUDENT,
+			student_id=f"BENCH{index:04d}",
+			department=rng.choice(["Science", "Arts", "Engineering"]),
+		)
+		for index in range(5 * scale)
+	]
+	student = students[0]
+
+	categories = [Category.objects.create(name=name) for name in ("Books", "Food", "Rent", "Transport", "Fees", "Health", "Leisure", "Utilities")]
+	merchants = ["Cafe", "Campus Store", "Landlord", "Bus Pass", "Bursary Office", "Pharmacy", "Cinema", "Power Co"]
+	sources = ["Part-time job", "Allowance", "Scholarship", "Tutoring"]
+	for owner in students:
+		incomes = [
+			Income(
+				user=owner,
+				source=rng.choice(sources),
+				amount=Decimal(rng.randint(2000, 40000)) / 100,
+				date_received=today - timedelta(days=rng.randint(0, 730)),
+			)
+			for _ in range(150 * scale)
+		]
+		expenses = []
+		for _ in range(600 * scale):
+			slot = rng.randrange(len(categories))
+			expenses.append(
+				Expense(
+					user=owner,
+					merchant=merchants[slot],
+					amount=Decimal(rng.randint(100, 15000)) / 100,
+					date_spent=today - timedelta(days=rng.randint(0, 730)),
+					category=categories[slot],
+				)
+			)
+		insert_incomes(incomes)
+		insert_expenses(expenses)
+		month = today.replace(day=1)
+		Budget.objects.bulk_create(
+			Budget(
+				user=owner,
+				period_start=_shift_month(month, -offset),
+				period_end=_shift_month(month, -offset + 1) - timedelta(days=1),
+				allocated_amount=Decimal("500.00"),
+			)
+			for offset in range(12)
+		)
+		RecurringTransaction.objects.bulk_create(
+			RecurringTransaction(
+				user=owner,
+				kind=RecurringTransaction.Kind.EXPENSE,
+				description=merchants[slot],
+				amount=Decimal("45.00"),
+				category=categories[slot],
+				start_date=today.replace(day=1),
+				next_occurrence=_shift_month(today.replace(day=1), 1),
+			)
+			for slot in range(4)
+		)
+
+	schemes = [
+		LoanScheme.objects.create(
+			name=f"Scheme {index}",
+			lender_name="Campus Credit",
+			principal=Decimal("1000.00") * (index + 1),
+			interest_rate=Decimal("5.00"),
+			term_months=6 * (index + 1),
+			created_by=admin,
+		)
+		for index in range(6)
+	]
+	loans = []
+	for index, owner in enumerate(students * 4):
+		# The last two schemes stay open to students for the scheme endpoints.
+		scheme = schemes[index % 4]
+		loan = Loan.objects.create(
+			user=owner,
+			scheme=scheme,
+			lender_name=scheme.lender_name,
+			principal=scheme.principal,
+			interest_rate=scheme.interest_rate,
+			term_months=scheme.term_months,
+		)
+		if index % 3:
+			loan.activate()
+		loans.append(loan)
+
+	scholarships = [
+		Scholarship.objects.create(
+			name=f"Bench Scholarship {index}",
+			description="Benchmark scholarship",
+			amount=Decimal("750.00"),
+			provider="Benchmark Trust",
+			eligibility_criteria="Enrolled students",
+			deadline=today + timedelta(days=30 + index),
+		)
+		for index in range(20 * scale)
+	]
+	for index, scholarship in enumerate(scholarships):
+		applicants = students[: 1 + index % len(students)]
+		ScholarshipApplication.objects.bulk_create(
+			ScholarshipApplication(scholarship=scholarship, applicant=applicant, note="Please consider me.")
+			for applicant in applicants
+		)
+		ScholarshipDisbursement.objects.create(
+			scholarship=scholarship,
+			user=applicants[0],
+			amount=scholarship.amount,
+			disbursement_date=today,
+			reference=f"BENCH-{index:05d}",
+		)
+	Notification.objects.bulk_create(
+		Notification(user=owner, title="Reminder", message="Benchmark notification")
+		for owner in students
+		for _ in range(40 * scale)
+	)
+	# A delta sync from this token only sees the edits below.
+	sync_token = issue_token(latest_change_id())
+	recent = list(Expense.objects.filter(user=student)[:3])
+	for expense in recent:
+		expense.notes = "Edited"
+		expense.save()
+	Budget.objects.filter(user=student).first().delete()
+
+	return {
+		"admin": admin,
+		"student": student,
+		"params": {"sync_token": sync_token},
+		"pks": {
+			"student": student.pk,
+			"income": Income.objects.filter(user=student).values_list("pk", flat=True).first(),
+			"expense": Expense.objects.filter(user=student).values_list("pk", flat=True).first(),
+			"budget": Budget.objects.filter(user=student).values_list("pk", flat=True).first(),
+			"recurring": RecurringTransaction.objects.filter(user=student).values_list("pk", flat=True).first(),
+			"category": categories[0].pk,
+			"scheme": schemes[-1].pk,
+			"loan": next(loan.pk for loan in loans if loan.user_id == student.pk and loan.status == Loan.Status.ACTIVE),
+			"scholarship": scholarships[0].pk,
+		},
+	}
+
+
+def _shift_month(month: date, offset: int) -> date:
+	index = month.month - 1 + offset
+	return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def _client_for(user) -> APIClient:
+	client = APIClient()
+	response = client.post(reverse("auth-token"), {"email": user.email, "password": PASSWORD}, format="json")
+	client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+	return client
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+	if len(samples) == 1:
+		return samples[0]
+	return statistics.quantiles(samples, n=100, method="inclusive")[int(percent) - 1]
+
+
+def _body_size(response) -> int:
+	if getattr(response, "streaming", False):
+		return sum(len(chunk) for chunk in response.streaming_content)
+	return len(response.content)
+
+
+def measure(client: APIClient, url: str, params: dict[str, str], iterations: int) -> Measurement:
+	cache.clear()
+	with CaptureQueriesContext(connection) as queries:
+		response = client.get(url, params)
+		size = _body_size(response)
+	# Read the count now: later requests reset the connection's query log.
+	query_count = len(queries.captured_queries)
+	timings = []
+	# Keep collector pauses out of the percentiles.
+	gc.collect()
+	gc.disable()
+	try:
+		for _ in range(max(1, iterations)):
+			started = time.perf_counter()
+			warm = client.get(url, params)
+			_body_size(warm)
+			timings.append((time.perf_counter() - started) * 1000)
+	finally:
+		gc.enable()
+	return Measurement(
+		status=response.status_code,
+		queries=query_count,
+		p50_ms=round(_percentile(timings, 50), 2),
+		p95_ms=round(_percentile(timings, 95), 2),
+		bytes=size,
+	)
+
+
+def run_benchmarks(
+	data: dict[str, Any],
+	*,
+	iterations: int = 20,
+	only: set[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+	"""Request every endpoint and return measurements keyed by endpoint name."""
+
+	clients = {False: _client_for(data["student"]), True: _client_for(data["admin"])}
+	results: dict[str, dict[str, Any]] = {}
+	for endpoint in ENDPOINTS:
+		if only and endpoint.name not in only:
+			continue
+		kwargs = {"pk": data["pks"][endpoint.pk]} if endpoint.pk else {}
+		url = reverse(endpoint.url_name, kwargs=kwargs)
+		params = {key: value.format(**data.get("params", {})) for key, value in endpoint.params.items()}
+		results[endpoint.name] = asdict(measure(clients[endpoint.admin], url, params, iterations))
+	return results
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any]:
+	with open(path, encoding="utf-8") as handle:
+		return json.load(handle)
+
+
+def write_baseline(results: dict[str, dict[str, Any]], path: Path = BASELINE_PATH, *, scale: int = 1) -> None:
+	payload = {"scale": scale, "tolerances": DEFAULT_TOLERANCES, "endpoints": results}
+	path.parent.mkdir(parents=True, exist_ok=True)
+	with open(path, "w", encoding="utf-8") as handle:
+		json.dump(payload, handle, indent=2, sort_keys=True)
+		handle.write("\n")
+
+
+def compare(
+	results: dict[str, dict[str, Any]],
+	baseline: dict[str, Any],
+	*,
+	check_latency: bool = True,
+) -> list[str]:
+	"""Return a human readable line for every measurement outside tolerance."""
+
+	tolerances = {**DEFAULT_TOLERANCES, **baseline.get("tolerances", {})}
+	expected_rows = baseline.get("endpoints", {})
+	problems: list[str] = []
+	for name, current in results.items():
+		expected = expected_rows.get(name)
+		if expected is None:
+			problems.append(f"{name}: no baseline entry (run with --update-baseline)")
+			continue
+		if current["status"] != expected["status"]:
+			problems.append(f"{name}: status {current['status']} != baseline {expected['status']}")
+		if current["queries"] > expected["queries"] + tolerances["queries"]:
+			problems.append(f"{name}: {current['queries']} queries > baseline {expected['queries']}")
+		allowed_bytes = expected["bytes"] * (1 + tolerances["bytes_ratio"])
+		if current["bytes"] > allowed_bytes:
+			problems.append(f"{name}: {current['bytes']} bytes > baseline {expected['bytes']}")
+		if check_latency:
+			for key, ratio in (("p50_ms", tolerances["p50_ratio"]), ("p95_ms", tolerances["p95_ratio"])):
+				allowed = expected[key] * ratio + tolerances["latency_slack_ms"]
+				if current[key] > allowed:
+					problems.append(f"{name}: {key} {current[key]} > allowed {allowed:.2f}")
+	return problems
@@ -0,0 +1,145 @@
+"""Versioned per-user response caching shared across apps.
+
+Each user owns a data version per scope (``finance``, ...). Writes bump the
+version, which changes every derived cache key, so cached responses never need
+explicit invalidation or a short TTL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+GLOBAL = "all"
+
+
+def _version_key(scope: str, user_id: int | str | None) -> str:
+	return f"data-version:{scope}:{GLOBAL if user_id is None else user_id}"
+
+
+def _fresh_version() -> int:
+	# Seed from the clock so a version evicted from the cache never comes back
+	# with a value that older cached responses were stored under.
+	return time.time_ns()
+
+
+def get_data_version(user_id: int | str | None, scope: str = "finance") -> int:
+	"""Return the current data version for a user (or ``None`` for global data)."""
+
+	key = _version_key(scope, user_id)
+	version = cache.get(key)
+	if version is None:
+		version = _fresh_version()
+		if not cache.add(key, version, timeout=None):
+			version = cache.get(key, version)
+	return version
+
+
+def bump_data_version(user_id: int | str | None, scope: str = "finance") -> None:
+	"""Invalidate everything cached against a user's data in ``scope``."""
+
+	key = _version_key(scope, user_id)
+	try:
+		cache.incr(key)
+	except ValueError:
+		cache.set(key, _fresh_version(), timeout=None)
+
+
+def bump_data_version_on_commit(user_id: int | str | None, scope: str = "finance") -> None:
+	"""Bump once the current transaction commits (immediately outside one).
+
+	A bump that lands before the commit lets a concurrent reader cache the old
+	rows under the new version, where they would stay until the next write.
+	"""
+
+	transaction.on_commit(lambda: bump_data_version(user_id, scope))
+
+
+def _counter_key(name: str, outcome: str) -> str:
+	return f"response-cache:{outcome}:{name}"
+
+
+def _count(name: str, outcome: str) -> None:
+	key = _counter_key(name, outcome)
+	if not cache.add(key, 1, timeout=None):
+		try:
+			cache.incr(key)
+		except ValueError:
+			cache.set(key, 1, timeout=None)
+
+
+def cache_stats(names: list[str]) -> dict[str, dict[str, int]]:
+	"""Return hit/miss counters for the given cached endpoint names."""
+
+	keys = {
+		(name, outcome): _counter_key(name, outcome)
+		for name in names
+		for outcome in ("hits", "misses")
+	}
+	values = cache.get_many(list(keys.values()))
+	stats: dict[str, dict[str, int]] = {}
+	for (name, outcome), key in keys.items():
+		stats.setdefault(name, {})[outcome] = values.get(key, 0)
+	return stats
+
+
+def response_cache_key(request: Request, name: str, versions: list[int], *, shared: bool = False) -> str:
+	"""Build a cache key from the user, endpoint, query params and data versions.
+
+	``shared`` keys leave the user out, for payloads identical for every caller.
+	"""
+
+	params = sorted((key, sorted(request.query_params.getlist(key))) for key in request.query_params)
+	# Relative windows such as "current month" depend on the date.
+	fingerprint = repr((params, timezone.localdate().isoformat(), versions)).encode()
+	digest = hashlib.md5(fingerprint, usedforsecurity=False).hexdigest()
+	owner = GLOBAL if shared else request.user.pk
+	return f"response-cache:{name}:{owner}:{digest}"
+
+
+def cached_response(
+	name: str,
+	scopes: tuple[str, ...] = ("finance",),
+	global_scopes: tuple[str, ...] = (),
+	timeout: int | None = None,
+	shared: bool = False,
+) -> Callable:
+	"""Cache successful responses of a viewset action per user and data version.
+
+	``scopes`` are per-user data versions; ``global_scopes`` are versions shared by
+	every user (for example admin-managed reference data rendered in the payload).
+	``timeout`` (seconds, default ``RESPONSE_CACHE_TIMEOUT``) bounds staleness for
+	payloads that deliberately leave a frequently bumped scope out of the key.
+	``shared`` caches one copy for all users; use it only with no per-user
+	``scopes`` and for payloads that do not depend on the caller (permission
+	checks still run before the cache is consulted).
+	"""
+
+	def decorator(view_method: Callable[..., Response]) -> Callable[..., Response]:
+		@wraps(view_method)
+		def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> Response:
+			versions = [get_data_version(request.user.pk, scope) for scope in scopes]
+			versions += [get_data_version(None, scope) for scope in global_scopes]
+			key = response_cache_key(request, name, versions, shared=shared)
+			data = cache.get(key)
+			if data is not None:
+				_count(name, "hits")
+				return Response(data)
+			_count(name, "misses")
+			response = view_method(self, request, *args, **kwargs)
+			if response.status_code == 200:
+				cache.set(key, response.data, timeout=timeout or settings.RESPONSE_CACHE_TIMEOUT)
+			return response
+
+		return wrapper
+
+	return decorator
@@ -0,0 +1,96 @@
+"""Conditional GET support (``ETag``/``If-None-Match``) for read endpoints.
+
+The ETag is derived from the same data versions that key the response cache
+(see ``core.cache``), so it costs a few cache reads and no database queries.
+When the client's ``If-None-Match`` still matches, the request is answered with
+``304 Not Modified`` straight after authentication and permission checks,
+before the view's handler runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .cache import get_data_version
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+class _NotModified(APIException):
+	status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+	"""Add ETags to GET responses and short-circuit unchanged ones with 304.
+
+	Views declare ``etag_scopes`` (per-user data versions) and
+	``etag_global_scopes`` (versions shared by every user). Every write that can
+	change a response must bump one of them. Views where administrators see
+	every user's rows set ``etag_staff_sees_all`` so those requests use the
+	global version of each scope instead. Actions listed in
+	``etag_exempt_actions`` are served without ETags.
+	"""
+
+	etag_scopes: tuple[str, ...] = ()
+	etag_global_scopes: tuple[str, ...] = ()
+	etag_exempt_actions: tuple[str, ...] = ()
+	etag_staff_sees_all = False
+
+	def etag_versions(self, request: Request) -> list[int]:
+		"""Data versions the response depends on."""
+
+		user = request.user
+		staff = user.is_staff or user.is_superuser or getattr(user, "role", "") == "admin"
+		owner = None if self.etag_staff_sees_all and staff else user.pk
+		versions = [get_data_version(owner, scope) for scope in self.etag_scopes]
+		return versions + [get_data_version(None, scope) for scope in self.etag_global_scopes]
+
+	def compute_etag(self, request: Request) -> str | None:
+		if request.method not in SAFE_METHODS or getattr(self, "action", None) in self.etag_exempt_actions:
+			return None
+		params = sorted((key, sorted(request.query_params.getlist(key))) for key in request.query_params)
+		fingerprint = repr(
+			(
+				request.path,
+				params,
+				request.user.pk,
+				request.META.get("HTTP_ACCEPT", ""),
+				# Relative windows such as "current month" depend on the date.
+				timezone.localdate().isoformat(),
+				self.etag_versions(request),
+			)
+		).encode()
+		return f'W/"{hashlib.md5(fingerprint, usedforsecurity=False).hexdigest()}"'
+
+	def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+		super().initial(request, *args, **kwargs)
+		self._etag = self.compute_etag(request)
+		if self._etag and _matches(request.META.get("HTTP_IF_NONE_MATCH", ""), self._etag):
+			raise _NotModified()
+
+	def handle_exception(self, exc: Exception) -> Response:
+		if isinstance(exc, _NotModified):
+			return Response(status=status.HTTP_304_NOT_MODIFIED)
+		return super().handle_exception(exc)
+
+	def finalize_response(self, request: Request, response: Response, *args: Any, **kwargs: Any) -> Response:
+		response = super().finalize_response(request, response, *args, **kwargs)
+		etag = getattr(self, "_etag", None)
+		if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+			response["ETag"] = etag
+			# Let browsers keep the body but revalidate before every use.
+			response["Cache-Control"] = "private, no-cache"
+		return response
+
+
+def _matches(header: str, etag: str) -> bool:
+	candidates = [value.strip() for value in header.split(",") if value.strip()]
+	opaque = etag.removeprefix("W/")
+	return "*" in candidates or any(candidate.removeprefix("W/") == opaque for candidate in candidates)
@@ -0,0 +1,77 @@
+"""Run the API regression benchmarks against a throwaway test database."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core.benchmark import BASELINE_PATH, ENDPOINTS, compare, load_baseline, run_benchmarks, seed, write_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a test database, request every read-only API endpoint and compare query counts, "
+        "p50/p95 latency and response size with the checked-in baseline."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--iterations", type=int, default=20, help="Warm requests per endpoint.")
+        parser.add_argument("--scale", type=int, default=None, help="Dataset multiplier (defaults to the baseline's).")
+        parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON file.")
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write this run to the baseline (with --only, only those entries are replaced).",
+        )
+        parser.add_argument("--no-latency", action="store_true", help="Only compare query counts and payload size.")
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            choices=[endpoint.name for endpoint in ENDPOINTS],
+            help="Only benchmark this endpoint. May be repeated.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the raw measurements as JSON.")
+
+    def handle(self, *args, **options) -> None:
+        baseline_path = Path(options["baseline"])
+        baseline = load_baseline(baseline_path) if baseline_path.exists() else None
+        scale = options["scale"] or (baseline or {}).get("scale", 1)
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(DEBUG=False):
+                data = seed(scale)
+                results = run_benchmarks(data, iterations=options["iterations"], only=set(options["only"]) or None)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
+        else:
+            self.stdout.write(f"{'endpoint':<48}{'status':>7}{'queries':>9}{'p50 ms':>10}{'p95 ms':>10}{'bytes':>10}")
+            for name, row in results.items():
+                self.stdout.write(
+                    f"{name:<48}{row['status']:>7}{row['queries']:>9}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['bytes']:>10}"
+                )
+
+        if options["update_baseline"]:
+            if options["only"] and baseline is not None:
+                # Refresh just the selected endpoints and keep the other entries.
+                results = {**baseline.get("endpoints", {}), **results}
+            write_baseline(results, baseline_path, scale=scale)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}."))
+            return
+        if baseline is None:
+            raise CommandError(f"No baseline at {baseline_path}; run with --update-baseline first.")
+        problems = compare(results, baseline, check_latency=not options["no_latency"])
+        if problems:
+            for problem in problems:
+                self.stderr.write(problem)
+            raise CommandError(f"{len(problems)} benchmark regression(s) against {baseline_path}.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} endpoints within baseline tolerances."))
@@ -0,0 +1,200 @@
+"""Keyset (cursor) pagination shared by every list endpoint."""
+
+from __future__ import annotations
+
+import base64
+import datetime
+import json
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+	"""Paginate by seeking past the last row seen instead of using OFFSET.
+
+	Views declare ``keyset_ordering``: a tuple of non-null fields ending in a
+	unique column, e.g. ``("-date_spent", "-created_at", "-id")``. The cursor
+	stores the ordering values of the boundary row, so every page is a range scan
+	on the matching index no matter how deep the client has paged.
+
+	Clients that still expect the full, unpaginated list can opt in with
+	``?paginate=false``.
+	"""
+
+	page_size = api_settings.PAGE_SIZE or 50
+	max_page_size = 200
+	cursor_query_param = "cursor"
+	page_size_query_param = "page_size"
+	legacy_query_param = "paginate"
+	invalid_cursor_message = "Invalid cursor."
+
+	def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list[Model] | None:
+		if request.query_params.get(self.legacy_query_param, "").lower() in {"false", "0", "no"}:
+			return None
+
+		self.request = request
+		self.base_url = request.build_absolute_uri()
+		self.page_size = self.get_page_size(request)
+		self.ordering = self.get_ordering(request, queryset, view)
+		values, reverse = self.decode_cursor(request, queryset.model)
+
+		order_by = [_invert(field) for field in self.ordering] if reverse else list(self.ordering)
+		queryset = queryset.order_by(*order_by)
+		if values is not None:
+			queryset = queryset.filter(_seek(order_by, values))
+
+		rows = list(queryset[: self.page_size + 1])
+		has_more = len(rows) > self.page_size
+		rows = rows[: self.page_size]
+		if reverse:
+			rows.reverse()
+			self.has_previous, self.has_next = has_more, True
+		else:
+			self.has_previous, self.has_next = values is not None, has_more
+		self.page = rows
+		return rows
+
+	def get_page_size(self, request: Request) -> int:
+		try:
+			size = int(request.query_params[self.page_size_query_param])
+		except (KeyError, ValueError):
+			return self.page_size
+		return max(1, min(size, self.max_page_size))
+
+	def get_ordering(self, request: Request, queryset: QuerySet, view: Any) -> tuple[str, ...]:
+		ordering = tuple(getattr(view, "keyset_ordering", None) or ("-pk",))
+		ordering_filter = next(
+			(backend for backend in getattr(view, "filter_backends", ()) if issubclass(backend, OrderingFilter)),
+			None,
+		)
+		if ordering_filter is not None:
+			requested = ordering_filter().get_ordering(request, queryset, view)
+			param = getattr(ordering_filter, "ordering_param", "ordering")
+			if requested and request.query_params.get(param):
+				# Keep the requested ordering but make it unique with a primary key tie-breaker.
+				tie_breaker = "-pk" if requested[0].startswith("-") else "pk"
+				ordering = tuple(field for field in requested if field.lstrip("-") not in {"pk", "id"}) + (tie_breaker,)
+		return ordering
+
+	def decode_cursor(self, request: Request, model: type[Model]) -> tuple[list[Any] | None, bool]:
+		encoded = request.query_params.get(self.cursor_query_param)
+		if not encoded:
+			return None, False
+		try:
+			payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+			raw_values = payload["v"]
+			if len(raw_values) != len(self.ordering):
+				raise ValueError
+			values = [
+				_field(model, name).to_python(value)
+				for name, value in zip(self.ordering, raw_values)
+			]
+			return values, bool(payload.get("r"))
+		except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+			raise NotFound(self.invalid_cursor_message)
+
+	def encode_cursor(self, row: Model, reverse: bool) -> str:
+		values = [getattr(row, _field(type(row), name).attname) for name in self.ordering]
+		payload = json.dumps({"v": values, "r": reverse}, cls=_CursorEncoder, separators=(",", ":"))
+		cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+		return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+	def get_next_link(self) -> str | None:
+		if not self.has_next or not self.page:
+			return None
+		return self.encode_cursor(self.page[-1], reverse=False)
+
+	def get_previous_link(self) -> str | None:
+		if not self.has_previous:
+			return None
+		if not self.page:
+			return remove_query_param(self.base_url, self.cursor_query_param)
+		return self.encode_cursor(self.page[0], reverse=True)
+
+	def get_paginated_response(self, data: Any) -> Response:
+		return Response(
+			{
+				"next": self.get_next_link(),
+				"previous": self.get_previous_link(),
+				"results": data,
+			}
+		)
+
+	def get_paginated_response_schema(self, schema: dict) -> dict:
+		return {
+			"type": "object",
+			"required": ["results"],
+			"properties": {
+				"next": {"type": "string", "nullable": True, "format": "uri"},
+				"previous": {"type": "string", "nullable": True, "format": "uri"},
+				"results": schema,
+			},
+		}
+
+	def get_schema_operation_parameters(self, view: Any) -> list[dict]:
+		return [
+			{
+				"name": self.cursor_query_param,
+				"required": False,
+				"in": "query",
+				"description": "Opaque cursor taken from the next/previous links.",
+				"schema": {"type": "string"},
+			},
+			{
+				"name": self.page_size_query_param,
+				"required": False,
+				"in": "query",
+				"description": f"Number of results per page (max {self.max_page_size}).",
+				"schema": {"type": "integer"},
+			},
+			{
+				"name": self.legacy_query_param,
+				"required": False,
+				"in": "query",
+				"description": "Set to false to receive the full unpaginated list.",
+				"schema": {"type": "boolean"},
+			},
+		]
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+	"""JSON encoder that keeps full microsecond precision for datetimes."""
+
+	def default(self, o: Any) -> Any:
+		if isinstance(o, datetime.datetime):
+			return o.isoformat()
+		return super().default(o)
+
+
+def _field(model: type[Model], name: str):
+	name = name.lstrip("-")
+	if name == "pk":
+		return model._meta.pk
+	return model._meta.get_field(name)
+
+
+def _invert(field: str) -> str:
+	return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _seek(ordering: list[str], values: list[Any]) -> Q:
+	"""Build the lexicographic "comes after this row" filter for ``ordering``."""
+
+	condition = Q()
+	for index, field in enumerate(ordering):
+		name = field.lstrip("-")
+		lookup = "lt" if field.startswith("-") else "gt"
+		step = Q(**{f"{name}__{lookup}": values[index]})
+		for previous_field, previous_value in zip(ordering[:index], values[:index]):
+			step &= Q(**{previous_field.lstrip("-"): previous_value})
+		condition |= step
+	return condition
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+from importlib import import_module
+
 from django.test import TestCase
 
+from core.benchmark import ENDPOINTS, compare, load_baseline, run_benchmarks, seed
+
 
 class HealthCheckViewTests(TestCase):
 	"""Validate the health check endpoint returns expected payload."""
@@ -12,3 +16,23 @@ class HealthCheckViewTests(TestCase):
 		response = self.client.get("/api/health/")
 		self.assertEqual(response.status_code, 200)
 		self.assertEqual(response.json(), {"status": "ok"})
+
+
+class BenchmarkSuiteTests(TestCase):
+	"""Keep endpoint query counts and payload sizes at or below the baseline."""
+
+	def test_every_read_route_is_benchmarked(self) -> None:
+		covered = {endpoint.url_name.split(":")[-1] for endpoint in ENDPOINTS}
+		missing = []
+		for app in ("users", "finance", "loan", "scholarship", "notifications"):
+			for pattern in import_module(f"{app}.urls").router.urls:
+				actions = getattr(pattern.callback, "actions", {})
+				if "get" in actions and pattern.name not in covered and "(?P<format>" not in str(pattern.pattern):
+					missing.append(pattern.name)
+		self.assertEqual(missing, [])
+
+	def test_query_counts_match_baseline(self) -> None:
+		baseline = load_baseline()
+		data = seed(baseline["scale"])
+		results = run_benchmarks(data, iterations=1)
+		self.assertEqual(compare(results, baseline, check_latency=False), [])
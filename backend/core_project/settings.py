@@ -18,6 +18,7 @@ env = environ.Env(
     POSTGRES_HOST=(str, "db"),
     POSTGRES_PORT=(int, 5432),
     REDIS_URL=(str, "redis://redis:6379/0"),
+    CACHE_REDIS_URL=(str, ""),
     ENABLE_API_THROTTLING=(bool, False),
 )
 
@@ -103,6 +104,44 @@ DATABASES = {
     }
 }'''
 
+# Cache ---------------------------------------------------------------------
+# Local memory in development; point CACHE_REDIS_URL at Redis in production so
+# data versions and cached responses are shared by every worker.
+if env("CACHE_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("CACHE_REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "student-finance",
+        }
+    }
+
+# Finance analytics responses are keyed by a per-user data version, so this
+# timeout only bounds memory use rather than staleness.
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=60 * 60 * 24)
+
+# Admin department analytics aggregate user-id ranges of this size on a pool
+# of worker threads (ignored on SQLite, which is aggregated in one pass).
+INSTITUTION_ANALYTICS_CHUNK_USERS = env.int("INSTITUTION_ANALYTICS_CHUNK_USERS", default=2000)
+INSTITUTION_ANALYTICS_WORKERS = env.int("INSTITUTION_ANALYTICS_WORKERS", default=4)
+
+# Incomes and expenses older than this many days (rounded down to a month start)
+# are moved to the archive tables by ``manage.py archive_transactions``.
+FINANCE_ARCHIVE_AFTER_DAYS = env.int("FINANCE_ARCHIVE_AFTER_DAYS", default=730)
+
+# The change log behind /api/finance/changes/ is kept this long; older sync
+# tokens get 410 Gone and the client refetches everything.
+SYNC_CHANGE_RETENTION_DAYS = env.int("SYNC_CHANGE_RETENTION_DAYS", default=90)
+# Sync tokens only advance past change log entries at least this old, so an
+# entry whose insert commits late is not skipped.
+SYNC_CURSOR_LAG_SECONDS = env.int("SYNC_CURSOR_LAG_SECONDS", default=30)
+
 # Password validation ------------------------------------------------------
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -132,6 +171,8 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.OrderingFilter",
@@ -179,6 +220,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "notifications.tasks.send_repayment_reminders",
         "schedule": timedelta(hours=12),
     },
+    "materialize_recurring_transactions": {
+        "task": "finance.tasks.materialize_recurring_transactions",
+        "schedule": timedelta(hours=1),
+    },
+    "prune_sync_changes": {
+        "task": "finance.tasks.prune_sync_changes",
+        "schedule": timedelta(days=1),
+    },
 }
 
 # Email --------------------------------------------------------------------
@@ -4,7 +4,16 @@ from __future__ import annotations
 
 from django.contrib import admin
 
-from .models import Budget, Category, Expense, Income
+from .models import (
+	ArchiveRun,
+	Budget,
+	Category,
+	Expense,
+	Income,
+	MonthlyExpenseRollup,
+	MonthlyIncomeRollup,
+	RecurringTransaction,
+)
 
 
 @admin.register(Income)
@@ -36,3 +45,33 @@ class BudgetAdmin(admin.ModelAdmin):
 	list_filter = ("period_start",)
 	search_fields = ("user__email",)
 	autocomplete_fields = ("user",)
+
+
+@admin.register(MonthlyExpenseRollup)
+class MonthlyExpenseRollupAdmin(admin.ModelAdmin):
+	list_display = ("user", "month", "category", "total", "entry_count")
+	list_filter = ("month", "category")
+	search_fields = ("user__email",)
+	readonly_fields = ("user", "month", "category", "total", "entry_count")
+
+
+@admin.register(MonthlyIncomeRollup)
+class MonthlyIncomeRollupAdmin(admin.ModelAdmin):
+	list_display = ("user", "month", "source", "total", "entry_count")
+	list_filter = ("month",)
+	search_fields = ("user__email", "source")
+	readonly_fields = ("user", "month", "source", "total", "entry_count")
+
+
+@admin.register(ArchiveRun)
+class ArchiveRunAdmin(admin.ModelAdmin):
+	list_display = ("cutoff", "started_at", "finished_at", "incomes", "expenses")
+	readonly_fields = ("cutoff", "started_at", "finished_at", "incomes", "expenses")
+
+
+@admin.register(RecurringTransaction)
+class RecurringTransactionAdmin(admin.ModelAdmin):
+	list_display = ("user", "kind", "description", "amount", "frequency", "interval", "next_occurrence", "is_active")
+	list_filter = ("kind", "frequency", "is_active")
+	search_fields = ("description", "user__email")
+	autocomplete_fields = ("user", "category")
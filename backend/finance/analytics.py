@@ -0,0 +1,192 @@
+"""Vectorised spending analytics over a user's expense history.
+
+Expenses are loaded straight from the cursor into compact NumPy arrays
+(``int64`` cents, ``int64`` day ordinals, ``int64`` category codes) and every
+statistic is computed with array operations, so cost grows with the number of
+rows only through a handful of C loops.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from django.db import connections
+from django.db.models import BigIntegerField, F, Func, Value
+from django.db.models.functions import Cast, Coalesce, Round
+
+from .models import Expense
+
+ROLLING_WINDOWS = (7, 30)
+DEFAULT_SERIES_DAYS = 90
+MAX_SERIES_DAYS = 730
+DEFAULT_Z_THRESHOLD = 3.0
+MAX_OUTLIERS = 20
+UNCATEGORISED = -1
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+@dataclass(frozen=True)
+class ExpenseArrays:
+	"""Column arrays for one user's expenses (in no particular order)."""
+
+	ids: np.ndarray
+	days: np.ndarray
+	cents: np.ndarray
+	categories: np.ndarray
+
+	def __len__(self) -> int:
+		return len(self.ids)
+
+
+class EpochDay(Func):
+	"""Days since 1970-01-01 for a date column, computed by the database."""
+
+	output_field = BigIntegerField()
+
+	def as_sql(self, compiler, connection, **extra_context):
+		template = "(%(expressions)s - DATE '1970-01-01')" if connection.vendor == "postgresql" else "(TO_DAYS(%(expressions)s) - 719528)"
+		return super().as_sql(compiler, connection, template=template, **extra_context)
+
+	def as_sqlite(self, compiler, connection, **extra_context):
+		return super().as_sql(
+			compiler,
+			connection,
+			template="CAST(julianday(%(expressions)s) - 2440587.5 AS INTEGER)",
+			**extra_context,
+		)
+
+
+def load_expense_arrays(user) -> ExpenseArrays:
+	"""Fetch ``(id, day, category, cents)`` as plain integers straight from the cursor.
+
+	Day numbers, cents and category codes are computed in SQL so no per-row
+	date parsing, ``Decimal`` construction or model instantiation happens.
+	"""
+
+	queryset = (
+		Expense.objects.filter(user=user)
+		.annotate(
+			day=EpochDay("date_spent"),
+			category_code=Coalesce("category_id", Value(UNCATEGORISED)),
+			cents=Cast(Round(F("amount") * 100), BigIntegerField()),
+		)
+		.order_by()
+		.values_list("id", "day", "category_code", "cents")
+	)
+	sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+	with connections[queryset.db].cursor() as cursor:
+		cursor.execute(sql, params)
+		rows = cursor.fetchall()
+	table = np.array(rows, dtype=np.int64).reshape(-1, 4)
+	return ExpenseArrays(ids=table[:, 0], days=table[:, 1], categories=table[:, 2], cents=table[:, 3])
+
+
+def rolling_spend(arrays: ExpenseArrays, end: date, days: int, windows: tuple[int, ...] = ROLLING_WINDOWS) -> dict[str, object]:
+	"""Daily spend plus trailing-window totals for the ``days`` ending at ``end``."""
+
+	end_day = (np.datetime64(end, "D") - _EPOCH).astype(np.int64)
+	longest = max(windows)
+	first_day = end_day - days + 1 - (longest - 1)
+	in_range = (arrays.days >= first_day) & (arrays.days <= end_day)
+	span = int(end_day - first_day + 1)
+	daily = np.bincount(arrays.days[in_range] - first_day, weights=arrays.cents[in_range], minlength=span).astype(np.int64)
+	cumulative = np.concatenate(([0], np.cumsum(daily)))
+	visible = np.arange(span - days, span)
+	series: dict[str, object] = {
+		"dates": np.datetime_as_string(_EPOCH + first_day + visible).tolist(),
+		"daily": daily[visible],
+	}
+	for window in windows:
+		series[f"rolling_{window}"] = cumulative[visible + 1] - cumulative[visible + 1 - window]
+	return series
+
+
+def category_stats(arrays: ExpenseArrays) -> tuple[np.ndarray, ...]:
+	"""Return ``(codes, counts, totals, means, stds)`` per category plus the row inverse.
+
+	Standard deviations are population deviations computed in two passes for
+	numerical stability.
+	"""
+
+	codes, inverse = np.unique(arrays.categories, return_inverse=True)
+	counts = np.bincount(inverse)
+	totals = np.bincount(inverse, weights=arrays.cents)
+	means = totals / counts
+	deviations = arrays.cents - means[inverse]
+	stds = np.sqrt(np.bincount(inverse, weights=deviations * deviations) / counts)
+	return codes, counts, totals, means, stds, inverse
+
+
+def z_scores(arrays: ExpenseArrays, means: np.ndarray, stds: np.ndarray, inverse: np.ndarray) -> np.ndarray:
+	"""Z-score of every expense against its own category; zero where std is zero."""
+
+	row_std = stds[inverse]
+	scores = np.zeros(len(arrays), dtype=np.float64)
+	np.divide(arrays.cents - means[inverse], row_std, out=scores, where=row_std > 0)
+	return scores
+
+
+def spending_analytics(
+	user,
+	*,
+	end: date,
+	series_days: int = DEFAULT_SERIES_DAYS,
+	threshold: float = DEFAULT_Z_THRESHOLD,
+	category_names: dict[int, str] | None = None,
+) -> dict[str, object]:
+	"""Build the analytics payload served by ``/api/finance/summary/analytics/``."""
+
+	names = category_names or {}
+	arrays = load_expense_arrays(user)
+	series = rolling_spend(arrays, end, series_days)
+	columns = {"spend": series["daily"], **{f"rolling_{window}": series[f"rolling_{window}"] for window in ROLLING_WINDOWS}}
+	columns = {name: np.round(values / 100, 2).tolist() for name, values in columns.items()}
+	payload: dict[str, object] = {
+		"count": len(arrays),
+		"rolling": [
+			{"date": day, **{name: values[index] for name, values in columns.items()}}
+			for index, day in enumerate(series["dates"])
+		],
+		"categories": [],
+		"outliers": [],
+		"threshold": threshold,
+	}
+	if not len(arrays):
+		return payload
+
+	codes, counts, totals, means, stds, inverse = category_stats(arrays)
+	payload["categories"] = sorted(
+		(
+			{
+				"category_id": None if code == UNCATEGORISED else int(code),
+				"category": names.get(int(code), "Uncategorised"),
+				"count": int(count),
+				"total": _money(total),
+				"mean": _money(mean),
+				"std": _money(std),
+			}
+			for code, count, total, mean, std in zip(codes, counts, totals, means, stds)
+		),
+		key=lambda entry: (entry["category_id"] is not None, entry["category"]),
+	)
+
+	scores = z_scores(arrays, means, stds, inverse)
+	flagged = np.flatnonzero(np.abs(scores) >= threshold)
+	flagged = flagged[np.argsort(-np.abs(scores[flagged]), kind="stable")][:MAX_OUTLIERS]
+	payload["outliers"] = [
+		{
+			"id": int(arrays.ids[index]),
+			"date": str(_EPOCH + arrays.days[index]),
+			"amount": _money(arrays.cents[index]),
+			"category_id": None if arrays.categories[index] == UNCATEGORISED else int(arrays.categories[index]),
+			"z_score": round(float(scores[index]), 2),
+		}
+		for index in flagged
+	]
+	return payload
+
+
+def _money(cents: float | np.integer) -> float:
+	return round(float(cents) / 100, 2)
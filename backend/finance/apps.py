@@ -7,3 +7,10 @@ class FinanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "finance"
     verbose_name = "Finance"
+
+    def ready(self) -> None:  # pragma: no cover - signal registration only
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(signals.ensure_search_indexes, sender=self)
@@ -0,0 +1,164 @@
+"""Cold-storage archival of old incomes and expenses.
+
+Rows dated before a cutoff are copied into ``ArchivedIncome``/``ArchivedExpense``
+(keeping their ids) and removed from the live tables in fixed-size batches, one
+transaction per batch. The rollup receivers are muted while rows move, so the
+monthly rollups — and everything served from them, such as ``summary`` and
+``trends`` — keep counting archived months. Delta sync clients are told the
+moved rows were deleted, since the sync endpoint only serves live rows.
+
+Paths that read raw rows (custom dashboard ranges, weekly trends, exports) call
+``covers()`` and read the archive tables as well when the requested range
+reaches back before the latest cutoff.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Model
+from django.utils import timezone
+
+from core.cache import bump_data_version
+
+from . import signals, sync
+from .models import ArchivedExpense, ArchivedIncome, ArchiveRun, Expense, Income, SyncChange
+
+BATCH_SIZE = 1000
+DEFAULT_HORIZON_DAYS = 730
+_BOUNDARY_KEY = "finance-archive:boundary"
+
+
+@dataclass(frozen=True)
+class _Table:
+	model: type[Model]
+	archive: type[Model]
+	date_field: str
+	fields: tuple[str, ...]
+	sync_kind: str
+
+
+_TABLES = (
+	_Table(
+		Income,
+		ArchivedIncome,
+		"date_received",
+		("id", "user_id", "source", "amount", "date_received", "notes", "created_at"),
+		SyncChange.Kind.INCOME,
+	),
+	_Table(
+		Expense,
+		ArchivedExpense,
+		"date_spent",
+		("id", "user_id", "merchant", "amount", "date_spent", "notes", "created_at", "category_id"),
+		SyncChange.Kind.EXPENSE,
+	),
+)
+
+
+@dataclass
+class ArchiveReport:
+	"""Counters describing a finished (or dry) archive run."""
+
+	cutoff: date
+	incomes: int = 0
+	expenses: int = 0
+	batches: int = 0
+	seconds: float = 0.0
+
+
+def horizon_cutoff(today: date | None = None) -> date:
+	"""First day of the month ``FINANCE_ARCHIVE_AFTER_DAYS`` before ``today``."""
+
+	days = getattr(settings, "FINANCE_ARCHIVE_AFTER_DAYS", DEFAULT_HORIZON_DAYS)
+	return ((today or timezone.localdate()) - timedelta(days=days)).replace(day=1)
+
+
+def boundary() -> date | None:
+	"""Latest archive cutoff; no archived row is dated on or after it."""
+
+	value = cache.get(_BOUNDARY_KEY)
+	if value is None:
+		latest = ArchiveRun.objects.aggregate(cutoff=Max("cutoff"))["cutoff"]
+		value = latest.isoformat() if latest else ""
+		cache.set(_BOUNDARY_KEY, value, timeout=None)
+	return date.fromisoformat(value) if value else None
+
+
+def covers(start: date | None) -> bool:
+	"""Whether rows dated on or after ``start`` (``None``: any date) may be archived."""
+
+	edge = boundary()
+	return edge is not None and (start is None or start < edge)
+
+
+def archive_transactions(
+	cutoff: date,
+	*,
+	user_ids: Iterable[int] | None = None,
+	batch_size: int = BATCH_SIZE,
+	dry_run: bool = False,
+) -> ArchiveReport:
+	"""Move rows dated before ``cutoff`` (rounded down to a month start) to the archive."""
+
+	started = time.perf_counter()
+	report = ArchiveReport(cutoff=cutoff.replace(day=1))
+	user_ids = list(user_ids) if user_ids is not None else None
+	if dry_run:
+		for table in _TABLES:
+			count = _pending(table, report.cutoff, user_ids).count()
+			setattr(report, "incomes" if table.model is Income else "expenses", count)
+		report.seconds = time.perf_counter() - started
+		return report
+
+	# Record the cutoff first so readers consult the archive while rows move.
+	run = ArchiveRun.objects.create(cutoff=report.cutoff)
+	cache.delete(_BOUNDARY_KEY)
+	for table in _TABLES:
+		moved = _archive_table(table, report, user_ids, batch_size)
+		setattr(report, "incomes" if table.model is Income else "expenses", moved)
+	run.incomes = report.incomes
+	run.expenses = report.expenses
+	run.finished_at = timezone.now()
+	run.save(update_fields=["incomes", "expenses", "finished_at"])
+	report.seconds = time.perf_counter() - started
+	return report
+
+
+def _pending(table: _Table, cutoff: date, user_ids: list[int] | None):
+	queryset = table.model.objects.filter(**{f"{table.date_field}__lt": cutoff})
+	if user_ids is not None:
+		queryset = queryset.filter(user_id__in=user_ids)
+	return queryset
+
+
+def _archive_table(table: _Table, report: ArchiveReport, user_ids: list[int] | None, batch_size: int) -> int:
+	moved = 0
+	last_id = 0
+	while True:
+		with transaction.atomic(), signals.suspended():
+			rows = list(
+				_pending(table, report.cutoff, user_ids)
+				.filter(id__gt=last_id)
+				.order_by("id")
+				.values(*table.fields)[:batch_size]
+			)
+			if not rows:
+				return moved
+			ids = [row["id"] for row in rows]
+			table.archive.objects.bulk_create([table.archive(**row) for row in rows])
+			table.model.objects.filter(id__in=ids).delete()
+			# The muted receivers would have logged these deletions for delta sync.
+			sync.record_changes(table.sync_kind, ((row["user_id"], row["id"]) for row in rows), deleted=True)
+		last_id = ids[-1]
+		moved += len(rows)
+		report.batches += 1
+		for user_id in {row["user_id"] for row in rows}:
+			bump_data_version(user_id, "finance")
+		bump_data_version(None, "finance")
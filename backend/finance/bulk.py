@@ -0,0 +1,116 @@
+"""Bulk insertion of incomes and expenses.
+
+``bulk_create`` bypasses model signals, so these helpers also update the
+monthly rollups, log the rows for delta sync and bump the owners' (and the
+global) cached data versions.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from django.db import transaction
+from rest_framework import serializers
+
+from core.cache import bump_data_version_on_commit
+
+from . import rollups, sync
+from .catalog import catalog
+from .models import Expense, Income, SyncChange
+from .serializers import ExpenseBulkItemSerializer, IncomeSerializer
+
+MAX_BULK_ITEMS = 5000
+BATCH_SIZE = 500
+
+
+@dataclass
+class BulkOutcome:
+	"""Rows inserted by a bulk upload and the per-row validation errors."""
+
+	created: list[Any] = field(default_factory=list)
+	errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+@transaction.atomic
+def insert_incomes(incomes: list[Income], batch_size: int = BATCH_SIZE, *, record: bool = True) -> list[Income]:
+	"""Insert incomes in batches and fold them into the rollups.
+
+	With ``record=False`` the caller logs the rows for delta sync and bumps the
+	data versions itself, once for many calls (see ``finance.importer``).
+	"""
+
+	created = Income.objects.bulk_create(incomes, batch_size=batch_size)
+	rollups.record_incomes(created)
+	if record:
+		sync.record_changes(SyncChange.Kind.INCOME, ((income.user_id, income.pk) for income in created))
+		_bump_versions(income.user_id for income in created)
+	return created
+
+
+@transaction.atomic
+def insert_expenses(expenses: list[Expense], batch_size: int = BATCH_SIZE, *, record: bool = True) -> list[Expense]:
+	"""Insert expenses in batches and fold them into the rollups.
+
+	``record`` is as for ``insert_incomes``.
+	"""
+
+	created = Expense.objects.bulk_create(expenses, batch_size=batch_size)
+	rollups.record_expenses(created)
+	if record:
+		sync.record_changes(SyncChange.Kind.EXPENSE, ((expense.user_id, expense.pk) for expense in created))
+		_bump_versions(expense.user_id for expense in created)
+	return created
+
+
+def _bump_versions(user_ids: Iterable[int]) -> None:
+	for user_id in set(user_ids):
+		bump_data_version_on_commit(user_id, "finance")
+	bump_data_version_on_commit(None, "finance")
+
+
+def bulk_create_incomes(user, items: list[dict[str, Any]], *, partial: bool) -> BulkOutcome:
+	"""Validate and insert income rows for ``user``."""
+
+	outcome = BulkOutcome()
+	valid = _validate(IncomeSerializer(), items, outcome)
+	if outcome.errors and not partial:
+		return outcome
+	outcome.created = insert_incomes([Income(user=user, **attrs) for _, attrs in valid])
+	return outcome
+
+
+def bulk_create_expenses(user, items: list[dict[str, Any]], *, partial: bool) -> BulkOutcome:
+	"""Validate and insert expense rows for ``user`` resolving categories from the catalog."""
+
+	outcome = BulkOutcome()
+	valid = _validate(ExpenseBulkItemSerializer(), items, outcome)
+	known = catalog.names()
+	resolved = []
+	for index, attrs in valid:
+		category_id = attrs.pop("category")
+		if category_id not in known:
+			outcome.errors.append(
+				{"index": index, "errors": {"category": [f'Invalid pk "{category_id}" - object does not exist.']}}
+			)
+			continue
+		resolved.append(Expense(user=user, category_id=category_id, **attrs))
+	outcome.errors.sort(key=lambda error: error["index"])
+	if outcome.errors and not partial:
+		return outcome
+	outcome.created = insert_expenses(resolved)
+	return outcome
+
+
+def _validate(
+	serializer: serializers.Serializer,
+	items: list[dict[str, Any]],
+	outcome: BulkOutcome,
+) -> list[tuple[int, dict[str, Any]]]:
+	valid: list[tuple[int, dict[str, Any]]] = []
+	for index, item in enumerate(items):
+		try:
+			valid.append((index, dict(serializer.run_validation(item))))
+		except serializers.ValidationError as exc:
+			outcome.errors.append({"index": index, "errors": exc.detail})
+	return valid
@@ -0,0 +1,120 @@
+"""Process-local catalog of expense categories.
+
+Categories are admin-managed and rarely change, so each worker keeps an
+in-memory snapshot of the table. The snapshot is tagged with the shared
+``categories`` data version from ``core.cache``; saving or deleting a
+``Category`` bumps that version (see ``finance.signals``) and every worker
+reloads on its next lookup. Code that changes categories through
+``QuerySet.update``/``bulk_create`` must call ``invalidate()`` itself.
+
+Checking the version is a shared-cache read, so serializers take one snapshot
+per render with ``context_snapshot`` instead of one per row.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import router
+
+from core.cache import bump_data_version, get_data_version
+
+from .models import Category
+
+SCOPE = "categories"
+_CONTEXT_KEY = "_category_catalog"
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+	version: int
+	rows: tuple[dict[str, Any], ...]
+	by_id: dict[int, dict[str, Any]]
+	names: dict[int, str]
+	ids: dict[str, int]
+
+
+class CategoryCatalog:
+	"""Thread-safe id→name / name→id lookups reloaded when the version changes."""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._snapshot: _Snapshot | None = None
+
+	def snapshot(self) -> _Snapshot:
+		version = get_data_version(None, SCOPE)
+		snapshot = self._snapshot
+		if snapshot is not None and snapshot.version == version:
+			return snapshot
+		with self._lock:
+			snapshot = self._snapshot
+			if snapshot is None or snapshot.version != version:
+				snapshot = self._load(version)
+				self._snapshot = snapshot
+		return snapshot
+
+	def _load(self, version: int) -> _Snapshot:
+		rows = tuple(Category.objects.order_by("name").values("id", "name", "created_at", "updated_at"))
+		return _Snapshot(
+			version=version,
+			rows=rows,
+			by_id={row["id"]: row for row in rows},
+			names={row["id"]: row["name"] for row in rows},
+			ids={row["name"].casefold(): row["id"] for row in rows},
+		)
+
+	def rows(self) -> tuple[dict[str, Any], ...]:
+		"""All categories ordered by name, as ``values()`` dicts."""
+
+		return self.snapshot().rows
+
+	def name(self, category_id: int | None) -> str | None:
+		if category_id is None:
+			return None
+		return self.snapshot().names.get(category_id)
+
+	def names(self) -> dict[int, str]:
+		return self.snapshot().names
+
+	def id_for(self, name: str) -> int | None:
+		"""Resolve a category name case-insensitively."""
+
+		return self.snapshot().ids.get(name.strip().casefold())
+
+	def ids(self) -> dict[str, int]:
+		"""Map case-folded names to ids."""
+
+		return self.snapshot().ids
+
+	def get(self, category_id: int, snapshot: _Snapshot | None = None) -> Category | None:
+		"""Return a detached ``Category`` instance usable for FK assignment."""
+
+		row = (snapshot or self.snapshot()).by_id.get(category_id)
+		if row is None:
+			return None
+		return Category.from_db(router.db_for_read(Category), list(row), list(row.values()))
+
+	def clear(self) -> None:
+		with self._lock:
+			self._snapshot = None
+
+
+catalog = CategoryCatalog()
+
+
+def context_snapshot(context: dict[str, Any]) -> _Snapshot:
+	"""Snapshot shared by every field rendered with the same serializer context."""
+
+	snapshot = context.get(_CONTEXT_KEY)
+	if snapshot is None:
+		snapshot = context[_CONTEXT_KEY] = catalog.snapshot()
+	return snapshot
+
+
+def invalidate() -> None:
+	"""Force every worker to reload the catalog on its next lookup."""
+
+	bump_data_version(None, SCOPE)
+	catalog.clear()
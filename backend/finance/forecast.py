@@ -0,0 +1,196 @@
+"""Cash-flow forecasting over the monthly income/expense rollups.
+
+The monthly series come from one grouped query per rollup table. Income and
+expense are forecast together as the two columns of a NumPy array, either with
+Holt's linear exponential smoothing (parameters chosen by a vectorised grid
+search) or with an ordinary least-squares trend line.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from statistics import NormalDist
+
+import numpy as np
+from django.db.models import Sum
+
+from .models import MonthlyExpenseRollup, MonthlyIncomeRollup
+
+METHODS = ("holt", "linear")
+DEFAULT_HORIZON = 3
+MAX_HORIZON = 24
+DEFAULT_HISTORY = 12
+MAX_HISTORY = 120
+DEFAULT_CONFIDENCE = 0.8
+_GRID = np.round(np.arange(0.1, 1.0, 0.1), 1)
+
+
+@dataclass(frozen=True)
+class Forecast:
+	"""Expected values and band half-widths, shaped ``(horizon, 2)`` for income/expense."""
+
+	expected: np.ndarray
+	spread: np.ndarray
+
+
+def monthly_series(user, months: list[date]) -> tuple[np.ndarray, Decimal]:
+	"""Return ``(series, balance)``: income/expense per month and the all-time net balance.
+
+	``series`` has shape ``(len(months), 2)`` in cents. The balance covers every
+	month, including the current one.
+	"""
+
+	index = {month: position for position, month in enumerate(months)}
+	series = np.zeros((len(months), 2), dtype=np.float64)
+	balance = Decimal("0.00")
+	for column, (model, sign) in enumerate(((MonthlyIncomeRollup, 1), (MonthlyExpenseRollup, -1))):
+		rows = model.objects.filter(user=user).values("month").annotate(amount=Sum("total")).order_by()
+		for row in rows:
+			amount = row["amount"] or Decimal("0.00")
+			balance += sign * amount
+			position = index.get(row["month"])
+			if position is not None:
+				series[position, column] = float(amount * 100)
+	return series, balance
+
+
+def holt(series: np.ndarray, horizon: int) -> Forecast:
+	"""Holt's linear method with ``alpha``/``beta`` picked per column from a grid.
+
+	All grid combinations are smoothed at once: state arrays are shaped
+	``(len(grid), len(grid), columns)`` and only the time axis is iterated.
+	"""
+
+	alpha = _GRID[:, None, None]
+	beta = _GRID[None, :, None]
+	shape = (len(_GRID), len(_GRID), series.shape[1])
+	level = np.broadcast_to(series[0], shape).copy()
+	trend = np.broadcast_to(series[1] - series[0], shape).copy()
+	squared_error = np.zeros(shape)
+	for observed in series[1:]:
+		predicted = level + trend
+		squared_error += (observed - predicted) ** 2
+		previous_level = level
+		level = alpha * observed + (1 - alpha) * predicted
+		trend = beta * (level - previous_level) + (1 - beta) * trend
+
+	columns = np.arange(series.shape[1])
+	best = squared_error.reshape(-1, series.shape[1]).argmin(axis=0)
+	a_index, b_index = np.unravel_index(best, squared_error.shape[:2])
+	best_alpha = _GRID[a_index]
+	best_beta = _GRID[b_index]
+	final_level = level[a_index, b_index, columns]
+	final_trend = trend[a_index, b_index, columns]
+	sigma = np.sqrt(squared_error[a_index, b_index, columns] / max(len(series) - 1, 1))
+
+	steps = np.arange(1, horizon + 1)[:, None]
+	expected = final_level + steps * final_trend
+	# Var(h) = sigma^2 * (1 + sum_{j<h} (alpha + alpha*beta*j)^2)
+	multipliers = (best_alpha + best_alpha * best_beta * np.arange(horizon)[:, None]) ** 2
+	multipliers[0] = 0
+	variance = 1 + np.cumsum(multipliers, axis=0)
+	return Forecast(expected=expected, spread=sigma * np.sqrt(variance))
+
+
+def linear(series: np.ndarray, horizon: int) -> Forecast:
+	"""Least-squares trend line per column with prediction intervals."""
+
+	count = len(series)
+	x = np.arange(count, dtype=np.float64)
+	design = np.column_stack((np.ones(count), x))
+	coefficients, *_ = np.linalg.lstsq(design, series, rcond=None)
+	residuals = series - design @ coefficients
+	sigma = np.sqrt((residuals ** 2).sum(axis=0) / max(count - 2, 1))
+	future = np.arange(count, count + horizon, dtype=np.float64)[:, None]
+	expected = coefficients[0] + future * coefficients[1]
+	mean_x = x.mean()
+	spread_x = ((x - mean_x) ** 2).sum() or 1.0
+	leverage = 1 + 1 / count + (future - mean_x) ** 2 / spread_x
+	return Forecast(expected=expected, spread=sigma * np.sqrt(leverage))
+
+
+def flat(series: np.ndarray, horizon: int) -> Forecast:
+	"""Mean of the observed months; used when there is too little history for a trend."""
+
+	mean = series.mean(axis=0) if len(series) else np.zeros(series.shape[1])
+	sigma = series.std(axis=0) if len(series) else np.zeros(series.shape[1])
+	return Forecast(expected=np.tile(mean, (horizon, 1)), spread=np.tile(sigma, (horizon, 1)))
+
+
+def project(series: np.ndarray, horizon: int, method: str) -> Forecast:
+	"""Forecast ``horizon`` months ahead from the history, ignoring leading empty months."""
+
+	active = np.flatnonzero(series.any(axis=1))
+	history = series[active[0]:] if len(active) else series[:0]
+	if len(history) < 3:
+		return flat(history, horizon)
+	if method == "linear":
+		return linear(history, horizon)
+	return holt(history, horizon)
+
+
+def cash_flow_forecast(
+	user,
+	*,
+	current_month: date,
+	history_months: list[date],
+	future_months: list[date],
+	method: str = "holt",
+	confidence: float = DEFAULT_CONFIDENCE,
+) -> dict[str, object]:
+	"""Build the forecast payload served by ``/api/finance/summary/forecast/``."""
+
+	series, balance = monthly_series(user, history_months)
+	# Months between the end of the history and the first forecast month (such as
+	# the current, partial month) are projected too and then dropped.
+	lead = (future_months[0].year - history_months[-1].year) * 12 + future_months[0].month - history_months[-1].month
+	skipped = max(lead - 1, 0)
+	forecast = project(series, skipped + len(future_months), method)
+	forecast = Forecast(expected=forecast.expected[skipped:], spread=forecast.spread[skipped:])
+	z = NormalDist().inv_cdf((1 + confidence) / 2)
+	expected = np.maximum(forecast.expected, 0)
+	lower = np.maximum(forecast.expected - z * forecast.spread, 0)
+	upper = forecast.expected + z * forecast.spread
+
+	net = expected[:, 0] - expected[:, 1]
+	starting = float(balance) * 100
+	projected_balance = starting + np.cumsum(net)
+	# Treat monthly errors as independent: balance variance accumulates over months.
+	balance_spread = z * np.sqrt(np.cumsum((forecast.spread ** 2).sum(axis=1)))
+
+	results = []
+	for position, month in enumerate(future_months):
+		results.append(
+			{
+				"month": month.strftime("%b %Y"),
+				"period_start": month,
+				"income": _money(expected[position, 0]),
+				"income_lower": _money(lower[position, 0]),
+				"income_upper": _money(upper[position, 0]),
+				"expense": _money(expected[position, 1]),
+				"expense_lower": _money(lower[position, 1]),
+				"expense_upper": _money(upper[position, 1]),
+				"balance": _money(projected_balance[position]),
+				"balance_lower": _money(projected_balance[position] - balance_spread[position]),
+				"balance_upper": _money(projected_balance[position] + balance_spread[position]),
+			}
+		)
+	shortfall = next((entry["period_start"] for entry in results if entry["balance"] < 0), None)
+	return {
+		"method": method,
+		"confidence": confidence,
+		"as_of": current_month,
+		"starting_balance": balance,
+		"history": [
+			{"period_start": month, "income": _money(series[index, 0]), "expense": _money(series[index, 1])}
+			for index, month in enumerate(history_months)
+		],
+		"results": results,
+		"shortfall_month": shortfall,
+	}
+
+
+def _money(cents: float) -> float:
+	return round(float(cents) / 100, 2)
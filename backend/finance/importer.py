@@ -0,0 +1,237 @@
+"""Streaming import of bank-statement CSV files.
+
+Rows are parsed one at a time and inserted through ``bulk.insert_incomes`` /
+``bulk.insert_expenses`` in fixed-size batches, so memory use depends on the
+batch size rather than the file length. The batches share one transaction, so
+a file that turns out to be undecodable or malformed part-way through imports
+nothing. Only the id range of each kind is remembered: once the transaction
+commits, the range is logged for delta sync with one set-based insert and the
+data versions are bumped once, instead of per batch. (On SQLite the write lock
+is held for the whole import.)
+
+Expected columns (header names are case-insensitive):
+
+* ``date`` – transaction date, parsed with ``date_format`` (ISO by default).
+* ``description`` – stored as the expense merchant or the income source.
+* ``amount`` – signed amount; negative values are expenses, positive incomes.
+  Alternatively ``debit``/``credit`` columns holding unsigned amounts.
+* ``category`` – category name, required for expenses (rows without a known
+  category are skipped, as every expense needs one).
+* ``notes`` (optional).
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable, TextIO
+
+from django.db import transaction
+
+from core.cache import bump_data_version_on_commit
+
+from . import sync
+from .bulk import BATCH_SIZE, insert_expenses, insert_incomes
+from .catalog import catalog
+from .models import Expense, Income, SyncChange
+
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+MAX_REPORTED_ERRORS = 100
+_MAX_AMOUNT = Decimal("9999999999.99")
+_TEXT_LIMIT = Income._meta.get_field("source").max_length
+
+
+class StatementFormatError(ValueError):
+	"""Raised when a statement is missing the columns needed to import it."""
+
+
+@dataclass
+class ImportReport:
+	"""Counters describing a finished import."""
+
+	rows: int = 0
+	incomes: int = 0
+	expenses: int = 0
+	skipped: int = 0
+	unknown_categories: set[str] = field(default_factory=set)
+	errors: list[dict[str, Any]] = field(default_factory=list)
+	seconds: float = 0.0
+
+	@property
+	def rows_per_second(self) -> float:
+		return round(self.rows / self.seconds, 1) if self.seconds else float(self.rows)
+
+	def skip(self, line: int, message: str) -> None:
+		self.skipped += 1
+		if len(self.errors) < MAX_REPORTED_ERRORS:
+			self.errors.append({"line": line, "error": message})
+
+	def as_dict(self) -> dict[str, Any]:
+		return {
+			"rows": self.rows,
+			"incomes": self.incomes,
+			"expenses": self.expenses,
+			"skipped": self.skipped,
+			"unknown_categories": sorted(self.unknown_categories),
+			"errors": self.errors,
+			"seconds": round(self.seconds, 3),
+			"rows_per_second": self.rows_per_second,
+		}
+
+
+def parse_amount(raw: str) -> Decimal:
+	"""Parse bank formatted amounts such as ``-1,234.50``, ``(12.00)`` or ``₦500``."""
+
+	text = (raw or "").strip()
+	negative = text.startswith("(") and text.endswith(")")
+	cleaned = "".join(char for char in text if char.isdigit() or char in ".-")
+	if not cleaned:
+		raise ValueError("missing amount")
+	try:
+		value = Decimal(cleaned).quantize(Decimal("0.01"))
+	except InvalidOperation:
+		raise ValueError(f"invalid amount {raw!r}") from None
+	return -value if negative else value
+
+
+def import_statement(
+	user,
+	stream: Iterable[str] | TextIO,
+	*,
+	date_format: str = DEFAULT_DATE_FORMAT,
+	batch_size: int = BATCH_SIZE,
+) -> ImportReport:
+	"""Import a bank statement for ``user`` and return the throughput report."""
+
+	started = time.perf_counter()
+	reader = csv.DictReader(stream)
+	report = ImportReport()
+	try:
+		with transaction.atomic():
+			_import_rows(user, reader, report, date_format, batch_size)
+	except csv.Error as exc:
+		raise StatementFormatError(f"Malformed CSV near line {reader.line_num}: {exc}") from None
+	report.seconds = time.perf_counter() - started
+	return report
+
+
+def _import_rows(user, reader: csv.DictReader, report: ImportReport, date_format: str, batch_size: int) -> None:
+	columns = _column_map(reader.fieldnames or [])
+	categories = catalog.ids()
+	incomes: list[Income] = []
+	expenses: list[Expense] = []
+	income_ids = _IdRange()
+	expense_ids = _IdRange()
+
+	for row in reader:
+		report.rows += 1
+		line = reader.line_num
+		try:
+			entry = _build_entry(user, row, columns, categories, date_format, report)
+		except ValueError as exc:
+			report.skip(line, str(exc))
+			continue
+		if isinstance(entry, Income):
+			incomes.append(entry)
+			if len(incomes) >= batch_size:
+				report.incomes += income_ids.add(insert_incomes(incomes, batch_size, record=False))
+				incomes = []
+		else:
+			expenses.append(entry)
+			if len(expenses) >= batch_size:
+				report.expenses += expense_ids.add(insert_expenses(expenses, batch_size, record=False))
+				expenses = []
+
+	if incomes:
+		report.incomes += income_ids.add(insert_incomes(incomes, batch_size, record=False))
+	if expenses:
+		report.expenses += expense_ids.add(insert_expenses(expenses, batch_size, record=False))
+	if income_ids or expense_ids:
+		# The ranges may also cover rows the user created meanwhile; logging
+		# those again is harmless.
+		if income_ids:
+			sync.record_queryset(SyncChange.Kind.INCOME, Income.objects.filter(user=user, id__range=income_ids.bounds))
+		if expense_ids:
+			sync.record_queryset(SyncChange.Kind.EXPENSE, Expense.objects.filter(user=user, id__range=expense_ids.bounds))
+		bump_data_version_on_commit(user.pk, "finance")
+		bump_data_version_on_commit(None, "finance")
+
+
+@dataclass
+class _IdRange:
+	"""Lowest and highest primary key of the rows inserted so far."""
+
+	low: int | None = None
+	high: int | None = None
+
+	def __bool__(self) -> bool:
+		return self.low is not None
+
+	@property
+	def bounds(self) -> tuple[int, int]:
+		return self.low, self.high
+
+	def add(self, rows: list[Income] | list[Expense]) -> int:
+		if rows:
+			low = min(row.pk for row in rows)
+			high = max(row.pk for row in rows)
+			self.low = low if self.low is None else min(self.low, low)
+			self.high = high if self.high is None else max(self.high, high)
+		return len(rows)
+
+
+def _column_map(fieldnames: list[str]) -> dict[str, str]:
+	columns = {name.strip().lower(): name for name in fieldnames if name}
+	if "date" not in columns or "description" not in columns:
+		raise StatementFormatError("Statement must have 'date' and 'description' columns.")
+	if "amount" not in columns and not {"debit", "credit"} & columns.keys():
+		raise StatementFormatError("Statement must have an 'amount' column or 'debit'/'credit' columns.")
+	return columns
+
+
+def _cell(row: dict[str, str], columns: dict[str, str], name: str) -> str:
+	key = columns.get(name)
+	return (row.get(key) or "").strip() if key else ""
+
+
+def _build_entry(
+	user,
+	row: dict[str, str],
+	columns: dict[str, str],
+	categories: dict[str, int],
+	date_format: str,
+	report: ImportReport,
+) -> Income | Expense:
+	try:
+		when = datetime.strptime(_cell(row, columns, "date"), date_format).date()
+	except ValueError:
+		raise ValueError(f"invalid date {_cell(row, columns, 'date')!r}") from None
+	description = _cell(row, columns, "description")[:_TEXT_LIMIT]
+	if not description:
+		raise ValueError("missing description")
+
+	if "amount" in columns:
+		amount = parse_amount(_cell(row, columns, "amount"))
+	else:
+		debit = _cell(row, columns, "debit")
+		amount = -abs(parse_amount(debit)) if debit else abs(parse_amount(_cell(row, columns, "credit")))
+	if not amount:
+		raise ValueError("zero amount")
+	if abs(amount) > _MAX_AMOUNT:
+		raise ValueError("amount too large")
+
+	notes = _cell(row, columns, "notes")
+	if amount > 0:
+		return Income(user=user, source=description, amount=amount, date_received=when, notes=notes)
+
+	category_name = _cell(row, columns, "category")
+	if not category_name:
+		raise ValueError("missing category")
+	category_id = categories.get(category_name.casefold())
+	if category_id is None:
+		report.unknown_categories.add(category_name)
+		raise ValueError(f"unknown category {category_name!r}")
+	return Expense(user=user, merchant=description, amount=-amount, date_spent=when, category_id=category_id, notes=notes)
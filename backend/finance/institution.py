@@ -0,0 +1,188 @@
+"""Institution-wide income/expense totals by department, month and category.
+
+The cube is computed from the monthly rollup tables with grouped queries
+joined to ``users_user.department``. Large cohorts are split into user-id
+ranges that can be aggregated concurrently on a thread pool; each range
+produces partial sums that are merged in Python. Income has no category, so
+it is reported per department and month only while expenses are further
+broken down by category.
+
+Every income/expense write bumps the global ``finance`` data version, so a
+cache keyed on it would miss on a busy system. The caller instead keys the
+cube on the category and department versions and caches it for
+``CACHE_TIMEOUT`` seconds: institution-wide totals may lag writes by that long.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models import Max, Min, Sum
+
+from .models import MonthlyExpenseRollup, MonthlyIncomeRollup
+
+DEFAULT_CHUNK_USERS = 2000
+DEFAULT_WORKERS = 4
+SCOPE = "departments"
+CACHE_TIMEOUT = 5 * 60
+
+_Partial = tuple[dict[tuple[str, date], Decimal], dict[tuple[str, date, int | None], Decimal]]
+
+
+def user_id_ranges(chunk_size: int) -> list[tuple[int, int]]:
+	"""Split the user-id space into half-open ``[low, high)`` ranges."""
+
+	bounds = get_user_model().objects.aggregate(low=Min("id"), high=Max("id"))
+	if bounds["low"] is None:
+		return []
+	return [
+		(low, min(low + chunk_size, bounds["high"] + 1))
+		for low in range(bounds["low"], bounds["high"] + 1, chunk_size)
+	]
+
+
+def aggregate_range(id_range: tuple[int, int] | None, start: date, end: date, department: str | None = None) -> _Partial:
+	"""Grouped income and expense totals for users in ``id_range`` (all users if ``None``)."""
+
+	filters: dict[str, object] = {"month__gte": start, "month__lt": end}
+	if id_range is not None:
+		filters.update(user_id__gte=id_range[0], user_id__lt=id_range[1])
+	if department is not None:
+		filters["user__department"] = department
+
+	incomes: dict[tuple[str, date], Decimal] = {}
+	for row in (
+		MonthlyIncomeRollup.objects.filter(**filters)
+		.values("user__department", "month")
+		.annotate(amount=Sum("total"))
+		.order_by()
+	):
+		incomes[(row["user__department"], row["month"])] = row["amount"] or Decimal("0.00")
+
+	expenses: dict[tuple[str, date, int | None], Decimal] = {}
+	for row in (
+		MonthlyExpenseRollup.objects.filter(**filters)
+		.values("user__department", "month", "category_id")
+		.annotate(amount=Sum("total"))
+		.order_by()
+	):
+		expenses[(row["user__department"], row["month"], row["category_id"])] = row["amount"] or Decimal("0.00")
+	return incomes, expenses
+
+
+def _aggregate_in_thread(id_range: tuple[int, int], start: date, end: date, department: str | None) -> _Partial:
+	try:
+		return aggregate_range(id_range, start, end, department)
+	finally:
+		# Connections are per thread; close the pool thread's one when done.
+		connections.close_all()
+
+
+def department_totals(
+	*,
+	start: date,
+	end: date,
+	department: str | None = None,
+	chunk_size: int | None = None,
+	workers: int | None = None,
+) -> _Partial:
+	"""Merge the partial sums of every user-id range.
+
+	A single range (or a SQLite database, which serialises readers anyway) is
+	aggregated on the calling thread without any id filter.
+	"""
+
+	chunk_size = chunk_size or getattr(settings, "INSTITUTION_ANALYTICS_CHUNK_USERS", DEFAULT_CHUNK_USERS)
+	workers = workers or getattr(settings, "INSTITUTION_ANALYTICS_WORKERS", DEFAULT_WORKERS)
+	ranges = user_id_ranges(chunk_size)
+	if len(ranges) <= 1 or workers <= 1 or connection.vendor == "sqlite":
+		return aggregate_range(None, start, end, department) if ranges else ({}, {})
+
+	incomes: dict[tuple[str, date], Decimal] = defaultdict(Decimal)
+	expenses: dict[tuple[str, date, int | None], Decimal] = defaultdict(Decimal)
+	with ThreadPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+		partials = pool.map(lambda id_range: _aggregate_in_thread(id_range, start, end, department), ranges)
+		for partial_incomes, partial_expenses in partials:
+			for key, amount in partial_incomes.items():
+				incomes[key] += amount
+			for key, amount in partial_expenses.items():
+				expenses[key] += amount
+	return dict(incomes), dict(expenses)
+
+
+def department_cube(
+	*,
+	months: list[date],
+	department: str | None = None,
+	category_names: dict[int, str] | None = None,
+	chunk_size: int | None = None,
+	workers: int | None = None,
+) -> dict[str, object]:
+	"""Build the payload served by ``/api/finance/summary/departments/``.
+
+	``months`` are consecutive month starts; months without activity are
+	omitted from a department's rows.
+	"""
+
+	names = category_names or {}
+	end = date(months[-1].year + months[-1].month // 12, months[-1].month % 12 + 1, 1)
+	incomes, expenses = department_totals(
+		start=months[0], end=end, department=department, chunk_size=chunk_size, workers=workers
+	)
+
+	cells: dict[tuple[str, date], dict[str, object]] = {}
+
+	def cell(dept: str, month: date) -> dict[str, object]:
+		if (dept, month) not in cells:
+			cells[(dept, month)] = {
+				"department": dept,
+				"month": month.strftime("%b %Y"),
+				"period_start": month,
+				"income": Decimal("0.00"),
+				"expense": Decimal("0.00"),
+				"categories": [],
+			}
+		return cells[(dept, month)]
+
+	for (dept, month), amount in incomes.items():
+		cell(dept, month)["income"] = amount
+	for (dept, month, category_id), amount in expenses.items():
+		entry = cell(dept, month)
+		entry["expense"] += amount
+		entry["categories"].append(
+			{
+				"category_id": category_id,
+				"category": names.get(category_id, "Uncategorised") if category_id is not None else "Uncategorised",
+				"expense": amount,
+			}
+		)
+
+	totals: dict[str, dict[str, object]] = {}
+	results = []
+	for key in sorted(cells):
+		entry = cells[key]
+		entry["net"] = entry["income"] - entry["expense"]
+		entry["categories"].sort(key=lambda item: (item["category_id"] is not None, item["category"]))
+		results.append(entry)
+		total = totals.setdefault(
+			entry["department"],
+			{"department": entry["department"], "income": Decimal("0.00"), "expense": Decimal("0.00")},
+		)
+		total["income"] += entry["income"]
+		total["expense"] += entry["expense"]
+	for total in totals.values():
+		total["net"] = total["income"] - total["expense"]
+
+	return {
+		"start": months[0],
+		"end": months[-1],
+		"department": department,
+		"results": results,
+		"departments": list(totals.values()),
+	}
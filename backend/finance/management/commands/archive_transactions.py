@@ -0,0 +1,61 @@
+"""Move old incomes and expenses into the archive tables."""
+from __future__ import annotations
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from finance.archive import BATCH_SIZE, archive_transactions, horizon_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive incomes and expenses dated before a cutoff (default: FINANCE_ARCHIVE_AFTER_DAYS ago, "
+        "rounded down to a month start). Monthly rollups are left untouched."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--before", help="Archive rows dated before this day (YYYY-MM-DD).")
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="emails",
+            default=[],
+            help="Only archive rows of the user with this email. May be repeated.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows moved per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be archived.")
+
+    def handle(self, *args, **options) -> None:
+        try:
+            cutoff = date.fromisoformat(options["before"]) if options["before"] else horizon_cutoff()
+        except ValueError as exc:
+            raise CommandError(f"Invalid --before date: {exc}") from exc
+        if cutoff > timezone.localdate():
+            raise CommandError("--before cannot be in the future.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        user_ids = None
+        emails: list[str] = options["emails"]
+        if emails:
+            User = get_user_model()
+            user_ids = list(User.objects.filter(email__in=emails).values_list("id", flat=True))
+            if len(user_ids) != len(set(emails)):
+                raise CommandError("One or more users could not be found.")
+
+        report = archive_transactions(
+            cutoff,
+            user_ids=user_ids,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {report.incomes} incomes and {report.expenses} expenses dated before "
+                f"{report.cutoff} in {report.seconds:.2f}s ({report.batches} batches)."
+            )
+        )
@@ -0,0 +1,57 @@
+"""Import a bank-statement CSV file into a user's incomes and expenses."""
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.bulk import BATCH_SIZE
+from finance.importer import DEFAULT_DATE_FORMAT, StatementFormatError, import_statement
+
+
+class Command(BaseCommand):
+    help = "Stream a bank-statement CSV into Expense/Income rows using batched inserts."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", help="Path to the CSV file.")
+        parser.add_argument("--user", dest="email", required=True, help="Email of the user who owns the statement.")
+        parser.add_argument(
+            "--date-format",
+            default=DEFAULT_DATE_FORMAT,
+            help="strptime format of the date column (default: %(default)s).",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per insert batch.")
+
+    def handle(self, *args, **options) -> None:
+        User = get_user_model()
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['email']} does not exist.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as handle:
+                report = import_statement(
+                    user,
+                    handle,
+                    date_format=options["date_format"],
+                    batch_size=options["batch_size"],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except StatementFormatError as exc:
+            raise CommandError(str(exc))
+        except UnicodeDecodeError:
+            raise CommandError("File must be UTF-8 encoded CSV.")
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        if report.unknown_categories:
+            self.stderr.write(f"Rows skipped for unknown categories: {', '.join(sorted(report.unknown_categories))}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.incomes} incomes and {report.expenses} expenses from {report.rows} rows "
+                f"({report.skipped} skipped) in {report.seconds:.2f}s ({report.rows_per_second} rows/sec)."
+            )
+        )
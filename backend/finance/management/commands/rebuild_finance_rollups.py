@@ -0,0 +1,31 @@
+"""Recompute the monthly income/expense rollups from raw rows."""
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair the monthly income and expense rollup tables."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="emails",
+            default=[],
+            help="Only rebuild rollups for the user with this email. May be repeated.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        user_ids = None
+        emails: list[str] = options["emails"]
+        if emails:
+            User = get_user_model()
+            user_ids = list(User.objects.filter(email__in=emails).values_list("id", flat=True))
+            if len(user_ids) != len(set(emails)):
+                raise CommandError("One or more users could not be found.")
+        incomes, expenses = rebuild_rollups(user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {incomes} income and {expenses} expense rollup rows."))
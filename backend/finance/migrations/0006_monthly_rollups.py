@@ -0,0 +1,81 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:35
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Income = apps.get_model('finance', 'Income')
+    Expense = apps.get_model('finance', 'Expense')
+    MonthlyIncomeRollup = apps.get_model('finance', 'MonthlyIncomeRollup')
+    MonthlyExpenseRollup = apps.get_model('finance', 'MonthlyExpenseRollup')
+    incomes = (
+        Income.objects.order_by()
+        .annotate(month=TruncMonth('date_received'))
+        .values('user_id', 'month', 'source')
+        .annotate(total=Sum('amount'), entry_count=Count('id'))
+    )
+    expenses = (
+        Expense.objects.order_by()
+        .annotate(month=TruncMonth('date_spent'))
+        .values('user_id', 'month', 'category_id')
+        .annotate(total=Sum('amount'), entry_count=Count('id'))
+    )
+    MonthlyIncomeRollup.objects.bulk_create((MonthlyIncomeRollup(**row) for row in incomes), batch_size=1000)
+    MonthlyExpenseRollup.objects.bulk_create((MonthlyExpenseRollup(**row) for row in expenses), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_alter_category_created_at_alter_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyExpenseRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the totals cover.')),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('entry_count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='finance.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expense_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyIncomeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the totals cover.')),
+                ('source', models.CharField(max_length=255)),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('entry_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='income_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyexpenserollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('user', 'month', 'category'), name='uniq_expense_rollup_category'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyexpenserollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'month'), name='uniq_expense_rollup_uncategorised'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyincomerollup',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'source'), name='uniq_income_rollup_source'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
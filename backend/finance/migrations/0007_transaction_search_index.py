@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install_search_indexes(apps, schema_editor):
+    from finance.search import install_search_indexes as install
+
+    install(schema_editor.connection)
+
+
+def drop_search_indexes(apps, schema_editor):
+    from finance.search import drop_search_indexes as drop
+
+    drop(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_monthly_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.14 on 2026-10-17 05:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0010_sync_changes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('incomes', 'Income'), ('expenses', 'Expense'), ('budgets', 'Budget')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RemoveField(
+            model_name='tombstone',
+            name='user',
+        ),
+        migrations.RemoveIndex(
+            model_name='budget',
+            name='finance_bud_user_id_0a6522_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='finance_exp_user_id_0ddfc0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='income',
+            name='finance_inc_user_id_e6afb5_idx',
+        ),
+        migrations.AddField(
+            model_name='syncchange',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.DeleteModel(
+            name='Tombstone',
+        ),
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['user', 'id'], name='finance_syn_user_id_21fc23_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['changed_at'], name='finance_syn_changed_7158aa_idx'),
+        ),
+    ]
@@ -8,6 +8,8 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import ExpressionWrapper, F, FilteredRelation, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
@@ -35,10 +37,24 @@ class Income(models.Model):
 	date_received = models.DateField()
 	notes = models.TextField(blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
+	recurrence = models.ForeignKey(
+		"RecurringTransaction",
+		on_delete=models.SET_NULL,
+		related_name="incomes",
+		null=True,
+		blank=True,
+	)
+	occurrence_date = models.DateField(null=True, blank=True)
+	updated_at = models.DateTimeField(auto_now=True)
 
 	class Meta:
 		ordering = ["-date_received", "-created_at"]
-		indexes = [models.Index(fields=["user", "date_received"])]
+		indexes = [
+			models.Index(fields=["user", "date_received"]),
+		]
+		constraints = [
+			models.UniqueConstraint(fields=["recurrence", "occurrence_date"], name="uniq_income_occurrence"),
+		]
 
 	def __str__(self) -> str:
 		return f"Income {self.amount} from {self.source}"
@@ -60,15 +76,97 @@ class Expense(models.Model):
 		null=True,
 		blank=True,
 	)
+	recurrence = models.ForeignKey(
+		"RecurringTransaction",
+		on_delete=models.SET_NULL,
+		related_name="expenses",
+		null=True,
+		blank=True,
+	)
+	occurrence_date = models.DateField(null=True, blank=True)
+	updated_at = models.DateTimeField(auto_now=True)
 
 	class Meta:
 		ordering = ["-date_spent", "-created_at"]
-		indexes = [models.Index(fields=["user", "date_spent"])]
+		indexes = [
+			models.Index(fields=["user", "date_spent"]),
+		]
+		constraints = [
+			models.UniqueConstraint(fields=["recurrence", "occurrence_date"], name="uniq_expense_occurrence"),
+		]
 
 	def __str__(self) -> str:
 		return f"Expense {self.amount} at {self.merchant or 'Unknown merchant'}"
 
 
+class RecurringTransaction(models.Model):
+	"""Income or expense that repeats on a schedule and is materialized by a Celery task.
+
+	Occurrences fall on ``start_date`` plus whole multiples of ``interval``
+	weeks/months/years; monthly and yearly rules keep the start day, clamped to
+	shorter months. ``next_occurrence`` is the first date not yet materialized.
+	"""
+
+	class Kind(models.TextChoices):
+		INCOME = "income", "Income"
+		EXPENSE = "expense", "Expense"
+
+	class Frequency(models.TextChoices):
+		WEEKLY = "weekly", "Weekly"
+		MONTHLY = "monthly", "Monthly"
+		YEARLY = "yearly", "Yearly"
+
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="recurring_transactions")
+	kind = models.CharField(max_length=10, choices=Kind.choices)
+	description = models.CharField(max_length=255, help_text="Income source or expense merchant.")
+	amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(Decimal("0.01"))])
+	category = models.ForeignKey(
+		Category,
+		on_delete=models.PROTECT,
+		related_name="recurring_transactions",
+		null=True,
+		blank=True,
+	)
+	notes = models.TextField(blank=True)
+	frequency = models.CharField(max_length=10, choices=Frequency.choices, default=Frequency.MONTHLY)
+	interval = models.PositiveSmallIntegerField(default=1)
+	start_date = models.DateField()
+	end_date = models.DateField(null=True, blank=True)
+	next_occurrence = models.DateField()
+	is_active = models.BooleanField(default=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ["next_occurrence", "id"]
+		indexes = [models.Index(fields=["is_active", "next_occurrence"])]
+
+	def __str__(self) -> str:
+		return f"{self.get_kind_display()} {self.amount} {self.get_frequency_display().lower()} ({self.description})"
+
+
+class BudgetQuerySet(models.QuerySet):
+	def with_utilization(self) -> "BudgetQuerySet":
+		"""Annotate ``spent`` and ``remaining`` using one range join against expenses.
+
+		The join condition carries the budget period, so each budget only meets the
+		owner's expenses inside its own window via the ``(user, date_spent)`` index.
+		"""
+
+		period_expenses = FilteredRelation(
+			"user__expenses",
+			condition=Q(
+				user__expenses__date_spent__gte=F("period_start"),
+				user__expenses__date_spent__lte=F("period_end"),
+			),
+		)
+		money = models.DecimalField(max_digits=14, decimal_places=2)
+		return (
+			self.annotate(period_expenses=period_expenses)
+			.annotate(spent=Coalesce(Sum("period_expenses__amount"), Value(Decimal("0.00")), output_field=money))
+			.annotate(remaining=ExpressionWrapper(F("allocated_amount") - F("spent"), output_field=money))
+		)
+
+
 class Budget(models.Model):
 	"""Budget for a given period."""
 
@@ -76,6 +174,9 @@ class Budget(models.Model):
 	period_start = models.DateField()
 	period_end = models.DateField()
 	allocated_amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(Decimal("0.01"))])
+	updated_at = models.DateTimeField(auto_now=True)
+
+	objects = BudgetQuerySet.as_manager()
 
 	class Meta:
 		unique_together = ("user", "period_start", "period_end")
@@ -87,3 +188,148 @@ class Budget(models.Model):
 	def clean(self) -> None:
 		if self.period_end <= self.period_start:
 			raise ValidationError("Budget end date must be after the start date.")
+
+
+class MonthlyExpenseRollup(models.Model):
+	"""Materialized per-user monthly expense totals grouped by category."""
+
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="expense_rollups")
+	month = models.DateField(help_text="First day of the month the totals cover.")
+	category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="rollups", null=True, blank=True)
+	total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+	entry_count = models.IntegerField(default=0)
+
+	class Meta:
+		ordering = ["-month"]
+		constraints = [
+			models.UniqueConstraint(
+				fields=["user", "month", "category"],
+				condition=models.Q(category__isnull=False),
+				name="uniq_expense_rollup_category",
+			),
+			models.UniqueConstraint(
+				fields=["user", "month"],
+				condition=models.Q(category__isnull=True),
+				name="uniq_expense_rollup_uncategorised",
+			),
+		]
+
+	def __str__(self) -> str:
+		return f"Expenses {self.total} ({self.month:%Y-%m})"
+
+
+class MonthlyIncomeRollup(models.Model):
+	"""Materialized per-user monthly income totals grouped by source."""
+
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="income_rollups")
+	month = models.DateField(help_text="First day of the month the totals cover.")
+	source = models.CharField(max_length=255)
+	total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+	entry_count = models.IntegerField(default=0)
+
+	class Meta:
+		ordering = ["-month"]
+		constraints = [
+			models.UniqueConstraint(fields=["user", "month", "source"], name="uniq_income_rollup_source"),
+		]
+
+	def __str__(self) -> str:
+		return f"Income {self.total} ({self.month:%Y-%m})"
+
+
+class ArchivedIncome(models.Model):
+	"""Income moved out of the live table by ``archive_transactions``; keeps its original id."""
+
+	id = models.BigIntegerField(primary_key=True)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_incomes")
+	source = models.CharField(max_length=255)
+	amount = models.DecimalField(max_digits=12, decimal_places=2)
+	date_received = models.DateField()
+	notes = models.TextField(blank=True)
+	created_at = models.DateTimeField()
+
+	class Meta:
+		ordering = ["-date_received", "-created_at"]
+		indexes = [models.Index(fields=["user", "date_received"])]
+
+	def __str__(self) -> str:
+		return f"Archived income {self.amount} from {self.source}"
+
+
+class ArchivedExpense(models.Model):
+	"""Expense moved out of the live table by ``archive_transactions``; keeps its original id."""
+
+	id = models.BigIntegerField(primary_key=True)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_expenses")
+	merchant = models.CharField(max_length=255)
+	amount = models.DecimalField(max_digits=12, decimal_places=2)
+	date_spent = models.DateField()
+	notes = models.TextField(blank=True)
+	created_at = models.DateTimeField()
+	category = models.ForeignKey(
+		Category,
+		on_delete=models.PROTECT,
+		related_name="archived_expenses",
+		null=True,
+		blank=True,
+	)
+
+	class Meta:
+		ordering = ["-date_spent", "-created_at"]
+		indexes = [models.Index(fields=["user", "date_spent"])]
+
+	def __str__(self) -> str:
+		return f"Archived expense {self.amount} at {self.merchant or 'Unknown merchant'}"
+
+
+class ArchiveRun(models.Model):
+	"""One pass of the archiver; the latest ``cutoff`` bounds which dates may be archived."""
+
+	cutoff = models.DateField(help_text="Rows dated before this day were archived.")
+	started_at = models.DateTimeField(default=timezone.now)
+	finished_at = models.DateTimeField(null=True, blank=True)
+	incomes = models.IntegerField(default=0)
+	expenses = models.IntegerField(default=0)
+
+	class Meta:
+		ordering = ["-started_at"]
+
+	def __str__(self) -> str:
+		return f"Archive run before {self.cutoff}"
+
+
+class SyncChange(models.Model):
+	"""One change to a user's income, expense or budget, for delta sync clients.
+
+	The auto-increment ``id`` orders the log; sync tokens carry the last id a
+	client has seen. ``user`` has no database constraint so entries outlive the
+	rows (and users) they describe until ``finance.sync.prune_changes`` removes
+	them.
+	"""
+
+	class Kind(models.TextChoices):
+		INCOME = "incomes", "Income"
+		EXPENSE = "expenses", "Expense"
+		BUDGET = "budgets", "Budget"
+
+	user = models.ForeignKey(
+		settings.AUTH_USER_MODEL,
+		on_delete=models.DO_NOTHING,
+		db_constraint=False,
+		related_name="+",
+	)
+	kind = models.CharField(max_length=10, choices=Kind.choices)
+	object_id = models.BigIntegerField()
+	deleted = models.BooleanField(default=False)
+	changed_at = models.DateTimeField(default=timezone.now)
+
+	class Meta:
+		ordering = ["id"]
+		indexes = [
+			models.Index(fields=["user", "id"]),
+			models.Index(fields=["changed_at"]),
+		]
+
+	def __str__(self) -> str:
+		action = "Deleted" if self.deleted else "Changed"
+		return f"{action} {self.get_kind_display().lower()} {self.object_id}"
@@ -0,0 +1,159 @@
+"""Materialization of recurring incomes and expenses.
+
+``materialize_due`` walks the due rules in id-ordered chunks. Each chunk is
+handled in one transaction: the rules are locked (``SKIP LOCKED`` where the
+database supports it, so overlapping runs split the work instead of waiting),
+every missing occurrence up to today is computed for the whole chunk, the rows
+are inserted through ``bulk.insert_incomes``/``insert_expenses`` and the rules'
+``next_occurrence`` is advanced. Each row carries ``(recurrence,
+occurrence_date)``, which is unique, and occurrences already present are
+skipped, so retries never duplicate a transaction.
+"""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+
+from core.cache import bump_data_version_on_commit
+
+from .bulk import insert_expenses, insert_incomes
+from .models import Expense, Income, RecurringTransaction
+
+CHUNK_SIZE = 500
+# Upper bound on occurrences created for one rule in one run (catch-up after downtime).
+MAX_CATCH_UP = 366
+
+
+def occurrence(rule: RecurringTransaction, index: int) -> date:
+	"""Date of the ``index``-th occurrence (0 is ``start_date``)."""
+
+	start = rule.start_date
+	if rule.frequency == RecurringTransaction.Frequency.WEEKLY:
+		return start + timedelta(weeks=index * rule.interval)
+	months = index * rule.interval * (12 if rule.frequency == RecurringTransaction.Frequency.YEARLY else 1)
+	month = start.month - 1 + months
+	year, month = start.year + month // 12, month % 12 + 1
+	return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_index(rule: RecurringTransaction, day: date) -> int:
+	"""Index of the first occurrence on or after ``day``."""
+
+	start = rule.start_date
+	if day <= start:
+		return 0
+	if rule.frequency == RecurringTransaction.Frequency.WEEKLY:
+		step = 7 * rule.interval
+		return -(-(day - start).days // step)
+	unit = rule.interval * (12 if rule.frequency == RecurringTransaction.Frequency.YEARLY else 1)
+	index = max(((day.year - start.year) * 12 + day.month - start.month) // unit, 0)
+	while occurrence(rule, index) < day:
+		index += 1
+	return index
+
+
+def realign(rule: RecurringTransaction, *, not_before: date | None = None) -> date:
+	"""First occurrence of the (possibly edited) schedule not before the old ``next_occurrence``.
+
+	``not_before`` moves that floor later, e.g. to today when a paused rule resumes.
+	"""
+
+	floor = max(rule.start_date, rule.next_occurrence)
+	if not_before is not None:
+		floor = max(floor, not_before)
+	return occurrence(rule, occurrence_index(rule, floor))
+
+
+def due_dates(rule: RecurringTransaction, through: date) -> list[date]:
+	"""Occurrences from ``next_occurrence`` up to ``through`` and the rule's end date."""
+
+	last = min(through, rule.end_date) if rule.end_date else through
+	index = occurrence_index(rule, rule.next_occurrence)
+	dates = []
+	while len(dates) < MAX_CATCH_UP:
+		day = occurrence(rule, index)
+		if day > last:
+			break
+		dates.append(day)
+		index += 1
+	return dates
+
+
+def materialize_due(today: date, *, chunk_size: int = CHUNK_SIZE) -> int:
+	"""Create every due occurrence of every active rule; return the rows created."""
+
+	created = 0
+	last_id = 0
+	lock_options = {"skip_locked": True} if connection.features.has_select_for_update_skip_locked else {}
+	while True:
+		with transaction.atomic():
+			rules = list(
+				RecurringTransaction.objects.select_for_update(**lock_options)
+				.filter(is_active=True, next_occurrence__lte=today, id__gt=last_id)
+				.order_by("id")[:chunk_size]
+			)
+			if not rules:
+				return created
+			last_id = rules[-1].id
+			created += _materialize_chunk(rules, today)
+
+
+def _materialize_chunk(rules: list[RecurringTransaction], today: date) -> int:
+	plan = {rule.id: due_dates(rule, today) for rule in rules}
+	existing = set(
+		Income.objects.filter(recurrence__in=rules, occurrence_date__lte=today).values_list("recurrence_id", "occurrence_date")
+	)
+	existing.update(
+		Expense.objects.filter(recurrence__in=rules, occurrence_date__lte=today).values_list("recurrence_id", "occurrence_date")
+	)
+
+	incomes: list[Income] = []
+	expenses: list[Expense] = []
+	for rule in rules:
+		for day in plan[rule.id]:
+			if (rule.id, day) in existing:
+				continue
+			if rule.kind == RecurringTransaction.Kind.INCOME:
+				incomes.append(
+					Income(
+						user_id=rule.user_id,
+						source=rule.description,
+						amount=rule.amount,
+						date_received=day,
+						notes=rule.notes,
+						recurrence=rule,
+						occurrence_date=day,
+					)
+				)
+			else:
+				expenses.append(
+					Expense(
+						user_id=rule.user_id,
+						merchant=rule.description,
+						amount=rule.amount,
+						date_spent=day,
+						notes=rule.notes,
+						category_id=rule.category_id,
+						recurrence=rule,
+						occurrence_date=day,
+					)
+				)
+		if plan[rule.id]:
+			rule.next_occurrence = occurrence(rule, occurrence_index(rule, plan[rule.id][-1]) + 1)
+		else:
+			rule.next_occurrence = occurrence(rule, occurrence_index(rule, rule.next_occurrence))
+		if rule.end_date and rule.next_occurrence > rule.end_date:
+			rule.is_active = False
+
+	if incomes:
+		insert_incomes(incomes)
+	if expenses:
+		insert_expenses(expenses)
+	RecurringTransaction.objects.bulk_update(rules, ["next_occurrence", "is_active"])
+	# ``bulk_update`` skips the signals that bump the owners' data versions.
+	for user_id in {rule.user_id for rule in rules}:
+		bump_data_version_on_commit(user_id, "finance")
+	return len(incomes) + len(expenses)
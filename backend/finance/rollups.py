@@ -0,0 +1,182 @@
+"""Maintenance of the monthly income/expense rollup tables.
+
+Rollups are adjusted incrementally by the model signals in ``finance.signals``.
+Code paths that bypass signals (``bulk_create``, ``QuerySet.update``) must call
+``record_incomes``/``record_expenses`` or ``rebuild_rollups`` themselves.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Model, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import ArchivedExpense, ArchivedIncome, Expense, Income, MonthlyExpenseRollup, MonthlyIncomeRollup
+
+# (user_id, month, category_id | source) identifies a single rollup row.
+RollupKey = tuple[int, date, object]
+
+
+def month_start(value: date | str) -> date:
+	"""Return the first day of the month containing ``value``."""
+
+	if isinstance(value, str):
+		value = date.fromisoformat(value)
+	return value.replace(day=1)
+
+
+def income_key(user_id: int, date_received: date | str, source: str) -> RollupKey:
+	return (user_id, month_start(date_received), source)
+
+
+def expense_key(user_id: int, date_spent: date | str, category_id: int | None) -> RollupKey:
+	return (user_id, month_start(date_spent), category_id)
+
+
+def _lookup(model: type[Model], key: RollupKey) -> dict[str, object]:
+	user_id, month, group = key
+	if model is MonthlyIncomeRollup:
+		return {"user_id": user_id, "month": month, "source": group}
+	return {"user_id": user_id, "month": month, "category_id": group}
+
+
+def _apply_delta(model: type[Model], key: RollupKey, amount: Decimal, count: int) -> None:
+	"""Add ``amount``/``count`` to a rollup row, creating or pruning it as needed."""
+
+	if not amount and not count:
+		return
+	lookup = _lookup(model, key)
+	with transaction.atomic():
+		updated = model.objects.filter(**lookup).update(
+			total=F("total") + amount,
+			entry_count=F("entry_count") + count,
+		)
+		if not updated:
+			try:
+				with transaction.atomic():
+					model.objects.create(total=amount, entry_count=count, **lookup)
+			except IntegrityError:
+				# A concurrent writer created the row first; fold our delta into it.
+				model.objects.filter(**lookup).update(
+					total=F("total") + amount,
+					entry_count=F("entry_count") + count,
+				)
+		if count < 0:
+			model.objects.filter(entry_count__lte=0, **lookup).delete()
+
+
+def apply_income_change(previous: RollupKey | None, current: RollupKey | None, old_amount: Decimal, new_amount: Decimal) -> None:
+	"""Move an income entry's contribution from ``previous`` to ``current``."""
+
+	_apply_change(MonthlyIncomeRollup, previous, current, old_amount, new_amount)
+
+
+def apply_expense_change(previous: RollupKey | None, current: RollupKey | None, old_amount: Decimal, new_amount: Decimal) -> None:
+	"""Move an expense entry's contribution from ``previous`` to ``current``."""
+
+	_apply_change(MonthlyExpenseRollup, previous, current, old_amount, new_amount)
+
+
+def _apply_change(
+	model: type[Model],
+	previous: RollupKey | None,
+	current: RollupKey | None,
+	old_amount: Decimal,
+	new_amount: Decimal,
+) -> None:
+	old_amount = Decimal(str(old_amount))
+	new_amount = Decimal(str(new_amount))
+	if previous is not None and previous == current:
+		_apply_delta(model, current, new_amount - old_amount, 0)
+		return
+	if previous is not None:
+		_apply_delta(model, previous, -old_amount, -1)
+	if current is not None:
+		_apply_delta(model, current, new_amount, 1)
+
+
+def record_incomes(incomes: Iterable[Income]) -> None:
+	"""Add freshly bulk-inserted incomes to the rollups."""
+
+	_record(MonthlyIncomeRollup, (
+		(income_key(income.user_id, income.date_received, income.source), income.amount)
+		for income in incomes
+	))
+
+
+def record_expenses(expenses: Iterable[Expense]) -> None:
+	"""Add freshly bulk-inserted expenses to the rollups."""
+
+	_record(MonthlyExpenseRollup, (
+		(expense_key(expense.user_id, expense.date_spent, expense.category_id), expense.amount)
+		for expense in expenses
+	))
+
+
+def _record(model: type[Model], entries: Iterable[tuple[RollupKey, Decimal]]) -> None:
+	totals: dict[RollupKey, list] = defaultdict(lambda: [Decimal("0.00"), 0])
+	for key, amount in entries:
+		bucket = totals[key]
+		bucket[0] += Decimal(str(amount))
+		bucket[1] += 1
+	for key, (amount, count) in totals.items():
+		_apply_delta(model, key, amount, count)
+
+
+@transaction.atomic
+def rebuild_rollups(user_ids: Iterable[int] | None = None) -> tuple[int, int]:
+	"""Recompute rollups from raw rows (live and archived) for ``user_ids`` (or everyone).
+
+	Returns the number of income and expense rollup rows written.
+	"""
+
+	income_tables = [Income.objects.all(), ArchivedIncome.objects.all()]
+	expense_tables = [Expense.objects.all(), ArchivedExpense.objects.all()]
+	income_rollups = MonthlyIncomeRollup.objects.all()
+	expense_rollups = MonthlyExpenseRollup.objects.all()
+	if user_ids is not None:
+		user_ids = list(user_ids)
+		income_tables = [rows.filter(user_id__in=user_ids) for rows in income_tables]
+		expense_tables = [rows.filter(user_id__in=user_ids) for rows in expense_tables]
+		income_rollups = income_rollups.filter(user_id__in=user_ids)
+		expense_rollups = expense_rollups.filter(user_id__in=user_ids)
+
+	income_rollups.delete()
+	expense_rollups.delete()
+
+	incomes = _grouped_rows(income_tables, "date_received", "source")
+	expenses = _grouped_rows(expense_tables, "date_spent", "category_id")
+	created_incomes = MonthlyIncomeRollup.objects.bulk_create(
+		(MonthlyIncomeRollup(user_id=user_id, month=month, source=source, total=total, entry_count=count)
+		for (user_id, month, source), (total, count) in incomes.items()),
+		batch_size=1000,
+	)
+	created_expenses = MonthlyExpenseRollup.objects.bulk_create(
+		(MonthlyExpenseRollup(user_id=user_id, month=month, category_id=category_id, total=total, entry_count=count)
+		for (user_id, month, category_id), (total, count) in expenses.items()),
+		batch_size=1000,
+	)
+	return len(created_incomes), len(created_expenses)
+
+
+def _grouped_rows(querysets: list, date_field: str, group_field: str) -> dict[RollupKey, list]:
+	"""Month totals per rollup key, summed across the live and archive tables."""
+
+	totals: dict[RollupKey, list] = defaultdict(lambda: [Decimal("0.00"), 0])
+	for queryset in querysets:
+		rows = (
+			queryset.order_by()
+			.annotate(month=TruncMonth(date_field))
+			.values("user_id", "month", group_field)
+			.annotate(total=Sum("amount"), entry_count=Count("id"))
+		)
+		for row in rows.iterator():
+			bucket = totals[(row["user_id"], row["month"], row[group_field])]
+			bucket[0] += row["total"]
+			bucket[1] += row["entry_count"]
+	return totals
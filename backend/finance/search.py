@@ -0,0 +1,160 @@
+"""Full-text search over income and expense descriptions.
+
+SQLite uses an external-content FTS5 table per model kept in sync by triggers;
+PostgreSQL uses a GIN index over a ``to_tsvector`` expression. Both are
+maintained by the database itself, so ``bulk_create`` and ``QuerySet.update``
+stay in sync without extra application code. Other backends fall back to
+``icontains`` filtering.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from django.db import connection as default_connection
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+	"""Describes the searchable text columns of a finance table."""
+
+	table: str
+	columns: tuple[str, ...]
+
+	@property
+	def fts_table(self) -> str:
+		return f"{self.table}_fts"
+
+	@property
+	def pg_index(self) -> str:
+		return f"{self.table}_search_idx"
+
+	@property
+	def pg_vector(self) -> str:
+		text = " || ' ' || ".join(f'coalesce("{self.table}"."{column}", \'\')' for column in self.columns)
+		return f"to_tsvector('simple', {text})"
+
+
+INCOME_SEARCH = SearchSpec(table="finance_income", columns=("source", "notes"))
+EXPENSE_SEARCH = SearchSpec(table="finance_expense", columns=("merchant", "notes"))
+SEARCH_SPECS = (INCOME_SEARCH, EXPENSE_SEARCH)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_tokens(term: str) -> list[str]:
+	"""Split a user supplied search term into safe lowercase tokens."""
+
+	return [token.lower() for token in _TOKEN_RE.findall(term or "")]
+
+
+def search_queryset(queryset: QuerySet, spec: SearchSpec, term: str, *, ranked: bool = False) -> QuerySet:
+	"""Restrict ``queryset`` to rows matching every token of ``term`` as a prefix.
+
+	With ``ranked=True`` a ``search_rank`` annotation (higher is better) is added.
+	"""
+
+	tokens = search_tokens(term)
+	if not tokens:
+		return queryset.none()
+	vendor = connections[queryset.db].vendor
+	if vendor == "sqlite":
+		match = " ".join(f'"{token}"*' for token in tokens)
+		queryset = queryset.filter(
+			id__in=RawSQL(f"SELECT rowid FROM {spec.fts_table} WHERE {spec.fts_table} MATCH %s", [match])
+		)
+		if ranked:
+			queryset = queryset.annotate(
+				search_rank=RawSQL(
+					f"SELECT -bm25({spec.fts_table}) FROM {spec.fts_table} "
+					f"WHERE {spec.fts_table} MATCH %s AND rowid = \"{spec.table}\".\"id\"",
+					[match],
+					output_field=FloatField(),
+				)
+			)
+		return queryset
+	if vendor == "postgresql":
+		tsquery = " & ".join(f"{token}:*" for token in tokens)
+		queryset = queryset.filter(
+			RawSQL(f"{spec.pg_vector} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+		)
+		if ranked:
+			queryset = queryset.annotate(
+				search_rank=RawSQL(
+					f"ts_rank({spec.pg_vector}, to_tsquery('simple', %s))",
+					[tsquery],
+					output_field=FloatField(),
+				)
+			)
+		return queryset
+	condition = Q()
+	for token in tokens:
+		token_match = Q()
+		for column in spec.columns:
+			token_match |= Q(**{f"{column}__icontains": token})
+		condition &= token_match
+	return queryset.filter(condition)
+
+
+def install_search_indexes(connection=default_connection, *, repair_only: bool = False) -> None:
+	"""Create the search index objects for the active backend if they are missing.
+
+	With ``repair_only`` nothing new is created; SQLite triggers are restored only
+	for search tables that already exist.
+	"""
+
+	with connection.cursor() as cursor:
+		existing = set(connection.introspection.table_names(cursor))
+		for spec in SEARCH_SPECS:
+			if spec.table not in existing:
+				continue
+			if connection.vendor == "sqlite":
+				if repair_only and spec.fts_table not in existing:
+					continue
+				_install_sqlite(cursor, spec, connection)
+			elif connection.vendor == "postgresql" and not repair_only:
+				cursor.execute(f"CREATE INDEX IF NOT EXISTS {spec.pg_index} ON {spec.table} USING GIN ({spec.pg_vector})")
+
+
+def drop_search_indexes(connection=default_connection) -> None:
+	with connection.cursor() as cursor:
+		for spec in SEARCH_SPECS:
+			if connection.vendor == "sqlite":
+				for suffix in ("ai", "ad", "au"):
+					cursor.execute(f"DROP TRIGGER IF EXISTS {spec.fts_table}_{suffix}")
+				cursor.execute(f"DROP TABLE IF EXISTS {spec.fts_table}")
+			elif connection.vendor == "postgresql":
+				cursor.execute(f"DROP INDEX IF EXISTS {spec.pg_index}")
+
+
+def _install_sqlite(cursor, spec: SearchSpec, connection) -> None:
+	columns = ", ".join(spec.columns)
+	new_values = ", ".join(f"new.{column}" for column in spec.columns)
+	old_values = ", ".join(f"old.{column}" for column in spec.columns)
+	created = spec.fts_table not in set(connection.introspection.table_names(cursor))
+	cursor.execute(
+		f"CREATE VIRTUAL TABLE IF NOT EXISTS {spec.fts_table} USING fts5("
+		f"{columns}, content='{spec.table}', content_rowid='id', "
+		"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+	)
+	# Django rebuilds SQLite tables on most schema changes, which drops these
+	# triggers; they are recreated after every migrate run.
+	cursor.execute(
+		f"CREATE TRIGGER IF NOT EXISTS {spec.fts_table}_ai AFTER INSERT ON {spec.table} BEGIN "
+		f"INSERT INTO {spec.fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+	)
+	cursor.execute(
+		f"CREATE TRIGGER IF NOT EXISTS {spec.fts_table}_ad AFTER DELETE ON {spec.table} BEGIN "
+		f"INSERT INTO {spec.fts_table}({spec.fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+	)
+	cursor.execute(
+		f"CREATE TRIGGER IF NOT EXISTS {spec.fts_table}_au AFTER UPDATE ON {spec.table} BEGIN "
+		f"INSERT INTO {spec.fts_table}({spec.fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+		f"INSERT INTO {spec.fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+	)
+	if created:
+		cursor.execute(f"INSERT INTO {spec.fts_table}({spec.fts_table}) VALUES ('rebuild')")
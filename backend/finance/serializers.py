@@ -7,7 +7,8 @@ from decimal import Decimal
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from .models import Budget, Category, Expense, Income
+from .catalog import catalog, context_snapshot
+from .models import Budget, Category, Expense, Income, RecurringTransaction
 
 User = get_user_model()
 
@@ -41,10 +42,34 @@ class CategorySerializer(serializers.ModelSerializer[Category]):
         read_only_fields = ("id", "created_at", "updated_at")
 
 
+class CatalogCategoryField(serializers.PrimaryKeyRelatedField):
+    """Category primary key field validated against the in-process catalog."""
+
+    def to_internal_value(self, data: object) -> Category:
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            category = catalog.get(int(data), context_snapshot(self.context))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if category is None:
+            self.fail("does_not_exist", pk_value=data)
+        return category
+
+
+class CategoryNameField(serializers.CharField):
+    """Render a category id as its name from the catalog."""
+
+    def to_representation(self, value: int) -> str | None:
+        if value is None:
+            return None
+        return context_snapshot(self.context).names.get(value)
+
+
 class ExpenseSerializer(serializers.ModelSerializer[Expense]):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
-    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False)
-    category_name = serializers.CharField(source="category.name", read_only=True)
+    category = CatalogCategoryField(queryset=Category.objects.all(), allow_null=True, required=False)
+    category_name = CategoryNameField(source="category_id", read_only=True)
 
     class Meta:
         model = Expense
@@ -75,6 +100,29 @@ class ExpenseSerializer(serializers.ModelSerializer[Expense]):
         return super().validate(attrs)
 
 
+class ExpenseBulkItemSerializer(ExpenseSerializer):
+    """Validate one row of a bulk expense upload.
+
+    ``category`` is accepted as a bare id here and checked against the category
+    catalog by the bulk endpoint.
+    """
+
+    category = serializers.IntegerField(allow_null=True, required=False, min_value=1)
+
+
+class BulkCreateRequestSerializer(serializers.Serializer):
+    """Envelope for bulk create uploads."""
+
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    partial = serializers.BooleanField(default=False)
+
+    def validate_items(self, value: list[dict]) -> list[dict]:
+        limit = self.context.get("max_items")
+        if limit and len(value) > limit:
+            raise serializers.ValidationError(f"A bulk upload may contain at most {limit} items.")
+        return value
+
+
 class BudgetSerializer(serializers.ModelSerializer[Budget]):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -94,6 +142,74 @@ class BudgetSerializer(serializers.ModelSerializer[Budget]):
         return attrs
 
 
+class RecurringTransactionSerializer(serializers.ModelSerializer[RecurringTransaction]):
+    user = serializers.PrimaryKeyRelatedField(read_only=True)
+    category = CatalogCategoryField(queryset=Category.objects.all(), allow_null=True, required=False)
+    # Explicit default so form posts without the checkbox do not pause the rule.
+    is_active = serializers.BooleanField(default=True)
+
+    class Meta:
+        model = RecurringTransaction
+        fields = (
+            "id",
+            "user",
+            "kind",
+            "description",
+            "amount",
+            "category",
+            "notes",
+            "frequency",
+            "interval",
+            "start_date",
+            "end_date",
+            "next_occurrence",
+            "is_active",
+            "created_at",
+        )
+        read_only_fields = ("id", "user", "next_occurrence", "created_at")
+
+    def validate_amount(self, value: Decimal) -> Decimal:
+        if value <= 0:
+            raise serializers.ValidationError("Amount must be positive.")
+        return value
+
+    def validate_interval(self, value: int) -> int:
+        if value < 1:
+            raise serializers.ValidationError("Interval must be at least 1.")
+        return value
+
+    def validate(self, attrs: dict[str, object]) -> dict[str, object]:
+        def current(name: str) -> object:
+            return attrs[name] if name in attrs else getattr(self.instance, name, None)
+
+        start = current("start_date")
+        end = current("end_date")
+        if start and end and end < start:
+            raise serializers.ValidationError({"end_date": "End date must not be before the start date."})
+        kind = current("kind")
+        if kind == RecurringTransaction.Kind.INCOME and current("category") is not None:
+            raise serializers.ValidationError({"category": "Only expenses have a category."})
+        if kind == RecurringTransaction.Kind.EXPENSE and current("category") is None:
+            raise serializers.ValidationError({"category": "Select a category for this expense."})
+        return attrs
+
+
+class BudgetUtilizationSerializer(BudgetSerializer):
+    """Budget with ``spent`` and ``remaining`` annotations from ``with_utilization``."""
+
+    spent = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    remaining = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    percent_used = serializers.SerializerMethodField()
+
+    class Meta(BudgetSerializer.Meta):
+        fields = BudgetSerializer.Meta.fields + ("spent", "remaining", "percent_used")
+        read_only_fields = fields
+
+    def get_percent_used(self, budget: Budget) -> str:
+        percent = budget.spent * Decimal("100") / budget.allocated_amount
+        return str(percent.quantize(Decimal("0.01")))
+
+
 class FinanceSummarySerializer(serializers.Serializer):
     total_income = serializers.DecimalField(max_digits=14, decimal_places=2)
     total_expense = serializers.DecimalField(max_digits=14, decimal_places=2)
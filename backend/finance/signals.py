@@ -0,0 +1,221 @@
+"""Signals keeping finance rollups and cache versions in step with writes."""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.cache import bump_data_version_on_commit
+
+from . import catalog, institution, rollups, sync
+from .search import install_search_indexes
+from .models import Budget, Category, Expense, Income, RecurringTransaction, SyncChange
+
+_muted = threading.local()
+
+
+@contextmanager
+def suspended() -> Iterator[None]:
+    """Mute the rollup and per-row cache-version receivers on this thread.
+
+    For bulk moves that leave the monthly totals unchanged (archival). The caller
+    bumps the affected data versions itself.
+    """
+
+    previous = getattr(_muted, "active", False)
+    _muted.active = True
+    try:
+        yield
+    finally:
+        _muted.active = previous
+
+
+def _is_suspended() -> bool:
+    return getattr(_muted, "active", False)
+
+
+@receiver(pre_save, sender=Income)
+def remember_previous_income(sender, instance: Income, **_: object) -> None:
+    """Capture the stored state of an income before it is overwritten."""
+
+    instance._rollup_previous = None
+    if instance.pk:
+        instance._rollup_previous = (
+            Income.objects.filter(pk=instance.pk).values("user_id", "date_received", "source", "amount").first()
+        )
+
+
+@receiver(post_save, sender=Income)
+def update_income_rollup(sender, instance: Income, raw: bool = False, **_: object) -> None:
+    """Shift the income's contribution between monthly rollup rows."""
+
+    if raw or _is_suspended():
+        return
+    previous = getattr(instance, "_rollup_previous", None)
+    rollups.apply_income_change(
+        rollups.income_key(previous["user_id"], previous["date_received"], previous["source"]) if previous else None,
+        rollups.income_key(instance.user_id, instance.date_received, instance.source),
+        previous["amount"] if previous else 0,
+        instance.amount,
+    )
+
+
+@receiver(post_delete, sender=Income)
+def remove_income_from_rollup(sender, instance: Income, **_: object) -> None:
+    if _is_suspended():
+        return
+    rollups.apply_income_change(
+        rollups.income_key(instance.user_id, instance.date_received, instance.source),
+        None,
+        instance.amount,
+        0,
+    )
+
+
+@receiver(pre_save, sender=Expense)
+def remember_previous_expense(sender, instance: Expense, **_: object) -> None:
+    """Capture the stored state of an expense before it is overwritten."""
+
+    instance._rollup_previous = None
+    if instance.pk:
+        instance._rollup_previous = (
+            Expense.objects.filter(pk=instance.pk).values("user_id", "date_spent", "category_id", "amount").first()
+        )
+
+
+@receiver(post_save, sender=Expense)
+def update_expense_rollup(sender, instance: Expense, raw: bool = False, **_: object) -> None:
+    """Shift the expense's contribution between monthly rollup rows."""
+
+    if raw or _is_suspended():
+        return
+    previous = getattr(instance, "_rollup_previous", None)
+    rollups.apply_expense_change(
+        rollups.expense_key(previous["user_id"], previous["date_spent"], previous["category_id"]) if previous else None,
+        rollups.expense_key(instance.user_id, instance.date_spent, instance.category_id),
+        previous["amount"] if previous else 0,
+        instance.amount,
+    )
+
+
+@receiver(post_delete, sender=Expense)
+def remove_expense_from_rollup(sender, instance: Expense, **_: object) -> None:
+    if _is_suspended():
+        return
+    rollups.apply_expense_change(
+        rollups.expense_key(instance.user_id, instance.date_spent, instance.category_id),
+        None,
+        instance.amount,
+        0,
+    )
+
+
+@receiver(post_save, sender=Income)
+@receiver(post_delete, sender=Income)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=RecurringTransaction)
+@receiver(post_delete, sender=RecurringTransaction)
+def bump_finance_version(sender, instance: Income | Expense | Budget | RecurringTransaction, **_: object) -> None:
+    """Invalidate the owner's cached finance analytics and the institution-wide ones."""
+
+    if _is_suspended():
+        return
+    bump_data_version_on_commit(instance.user_id, "finance")
+    bump_data_version_on_commit(None, "finance")
+
+
+_SYNC_KINDS = {Income: SyncChange.Kind.INCOME, Expense: SyncChange.Kind.EXPENSE, Budget: SyncChange.Kind.BUDGET}
+
+
+@receiver(post_save, sender=Income)
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Budget)
+def record_sync_change(sender, instance: Income | Expense | Budget, raw: bool = False, **_: object) -> None:
+    """Log the write so delta sync clients pick the row up."""
+
+    if raw or _is_suspended():
+        return
+    sync.record_changes(_SYNC_KINDS[sender], [(instance.user_id, instance.pk)])
+
+
+@receiver(post_delete, sender=Income)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Budget)
+def record_sync_deletion(sender, instance: Income | Expense | Budget, **_: object) -> None:
+    """Log the deletion so delta sync clients drop the row."""
+
+    if _is_suspended():
+        return
+    sync.record_changes(_SYNC_KINDS[sender], [(instance.user_id, instance.pk)], deleted=True)
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_previous_department(sender, instance, update_fields=None, **_: object) -> None:
+    """Capture the stored department of a user whose department may be written."""
+
+    instance._previous_department = None
+    if instance.pk and (update_fields is None or "department" in update_fields):
+        instance._previous_department = sender.objects.filter(pk=instance.pk).values_list("department", flat=True).first()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_department_version(sender, instance, created: bool, raw: bool = False, **_: object) -> None:
+    """Invalidate department analytics when a user moves to another department.
+
+    New users have no rollups yet, so creating one leaves the totals unchanged.
+    """
+
+    previous = getattr(instance, "_previous_department", None)
+    if raw or created or previous is None or previous == instance.department:
+        return
+    bump_data_version_on_commit(None, institution.SCOPE)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def bump_department_version_on_delete(sender, instance, **_: object) -> None:
+    """Invalidate department analytics once a user's rollups are gone."""
+
+    bump_data_version_on_commit(None, institution.SCOPE)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_version(sender, instance: Category, **_: object) -> None:
+    """Invalidate the category catalog and cached payloads that render category names."""
+
+    catalog.invalidate()
+    # Bump again once committed so workers that reloaded mid-transaction refresh.
+    transaction.on_commit(catalog.invalidate)
+
+
+@receiver(pre_save, sender=Category)
+def remember_previous_category_name(sender, instance: Category, **_: object) -> None:
+    instance._previous_name = None
+    if instance.pk:
+        instance._previous_name = Category.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+def record_category_rename(sender, instance: Category, created: bool, raw: bool = False, **_: object) -> None:
+    """Log the category's expenses on rename: their sync payload carries the name."""
+
+    previous = getattr(instance, "_previous_name", None)
+    if raw or created or previous is None or previous == instance.name:
+        return
+    sync.record_category_change(instance.pk)
+
+
+def ensure_search_indexes(sender, using: str = "default", **_: object) -> None:
+    """Recreate search triggers dropped by SQLite table rebuilds during migrate."""
+
+    from django.db import connections
+
+    install_search_indexes(connections[using], repair_only=True)
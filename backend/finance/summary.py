@@ -0,0 +1,197 @@
+"""Aggregation helpers backing the finance dashboard summaries."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import F, Q, QuerySet, Sum
+from django.db.models.functions import TruncQuarter, TruncWeek
+
+from . import archive
+from .models import ArchivedExpense, ArchivedIncome, Expense, Income, MonthlyExpenseRollup, MonthlyIncomeRollup
+
+ZERO = Decimal("0.00")
+
+GRANULARITIES = ("week", "month", "quarter")
+# Upper bound on the number of buckets a single trends request may span.
+MAX_BUCKETS = {"week": 260, "month": 120, "quarter": 40}
+
+# Half-open [start, end) date windows keyed by the name of the resulting total.
+Window = tuple[date | None, date | None]
+
+
+@dataclass(frozen=True)
+class DashboardTotals:
+	"""Income and expense totals for the windows shown on the dashboard."""
+
+	total_income: Decimal
+	total_expense: Decimal
+	current_income: Decimal
+	current_expense: Decimal
+	previous_income: Decimal
+	previous_expense: Decimal
+
+
+def window_totals(
+	queryset: QuerySet,
+	date_field: str,
+	windows: dict[str, Window],
+	amount_field: str = "amount",
+) -> dict[str, Decimal]:
+	"""Sum ``amount_field`` over several date windows with a single conditional aggregate."""
+
+	aggregates = {}
+	for name, (start, end) in windows.items():
+		condition = Q()
+		if start is not None:
+			condition &= Q(**{f"{date_field}__gte": start})
+		if end is not None:
+			condition &= Q(**{f"{date_field}__lt": end})
+		aggregates[name] = Sum(amount_field, filter=condition) if condition else Sum(amount_field)
+	raw = queryset.aggregate(**aggregates)
+	return {name: raw[name] or ZERO for name in windows}
+
+
+def dashboard_totals(
+	user,
+	*,
+	current_month_start: date,
+	previous_month_start: date,
+	next_month_start: date,
+	start_date: date | None = None,
+	end_date: date | None = None,
+) -> DashboardTotals:
+	"""Compute dashboard totals from the monthly rollups.
+
+	Whole months are read from the rollup tables. Only the partial months at the
+	edges of a custom ``start``/``end`` range fall back to the raw rows, including
+	the archive tables when the range reaches back into archived months.
+	"""
+
+	range_end = end_date + timedelta(days=1) if end_date else None
+	rollup_range, edge_ranges = split_month_range(start_date, range_end)
+	windows: dict[str, Window] = {
+		"current": (current_month_start, next_month_start),
+		"previous": (previous_month_start, current_month_start),
+	}
+	if rollup_range is not None:
+		windows["total"] = rollup_range
+	incomes = window_totals(MonthlyIncomeRollup.objects.filter(user=user), "month", windows, "total")
+	expenses = window_totals(MonthlyExpenseRollup.objects.filter(user=user), "month", windows, "total")
+	total_income = incomes.get("total", ZERO)
+	total_expense = expenses.get("total", ZERO)
+	if edge_ranges:
+		total_income += _edge_total(Income.objects.filter(user=user), "date_received", edge_ranges)
+		total_expense += _edge_total(Expense.objects.filter(user=user), "date_spent", edge_ranges)
+		if archive.covers(edge_ranges[0][0]):
+			total_income += _edge_total(ArchivedIncome.objects.filter(user=user), "date_received", edge_ranges)
+			total_expense += _edge_total(ArchivedExpense.objects.filter(user=user), "date_spent", edge_ranges)
+	return DashboardTotals(
+		total_income=total_income,
+		total_expense=total_expense,
+		current_income=incomes["current"],
+		current_expense=expenses["current"],
+		previous_income=incomes["previous"],
+		previous_expense=expenses["previous"],
+	)
+
+
+def split_month_range(start: date | None, end: date | None) -> tuple[Window | None, list[Window]]:
+	"""Split the half-open range [start, end) into whole months and partial edges."""
+
+	rollup_start = start
+	if start is not None and start.day != 1:
+		rollup_start = _next_month(start)
+	rollup_end = end.replace(day=1) if end is not None else None
+	if rollup_start is not None and rollup_end is not None and rollup_start >= rollup_end:
+		return None, [(start, end)]
+	edges: list[Window] = []
+	if start is not None and start != rollup_start:
+		edges.append((start, rollup_start))
+	if end is not None and end != rollup_end:
+		edges.append((rollup_end, end))
+	return (rollup_start, rollup_end), edges
+
+
+def _edge_total(queryset: QuerySet, date_field: str, edges: list[Window]) -> Decimal:
+	condition = Q()
+	for start, end in edges:
+		condition |= Q(**{f"{date_field}__gte": start, f"{date_field}__lt": end})
+	return queryset.filter(condition).aggregate(total=Sum("amount"))["total"] or ZERO
+
+
+def _next_month(value: date) -> date:
+	return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def bucket_start(value: date, granularity: str) -> date:
+	"""Return the first day of the week/month/quarter containing ``value``."""
+
+	if granularity == "week":
+		return value - timedelta(days=value.weekday())
+	if granularity == "quarter":
+		return date(value.year, (value.month - 1) // 3 * 3 + 1, 1)
+	return value.replace(day=1)
+
+
+def shift_bucket(start: date, granularity: str, offset: int) -> date:
+	"""Return the bucket start ``offset`` buckets away from ``start``."""
+
+	if granularity == "week":
+		return start + timedelta(weeks=offset)
+	months = offset * 3 if granularity == "quarter" else offset
+	month = start.month - 1 + months
+	return date(start.year + month // 12, month % 12 + 1, 1)
+
+
+def bucket_label(start: date, granularity: str) -> str:
+	if granularity == "week":
+		iso_year, iso_week, _ = start.isocalendar()
+		return f"{iso_year}-W{iso_week:02d}"
+	if granularity == "quarter":
+		return f"Q{(start.month - 1) // 3 + 1} {start.year}"
+	return start.strftime("%b %Y")
+
+
+def bucket_totals(user, granularity: str, start: date, end: date) -> tuple[dict[date, Decimal], dict[date, Decimal]]:
+	"""Group income and expense totals into buckets over [start, end).
+
+	Month and quarter buckets are folded from the monthly rollups; weeks do not
+	align with months and are grouped from the raw rows instead (plus the archive
+	tables for ranges that start before the archive cutoff). Either way each
+	table is read with a single grouped query.
+	"""
+
+	if granularity == "week":
+		tables = [(Income, Expense)]
+		if archive.covers(start):
+			tables.append((ArchivedIncome, ArchivedExpense))
+		income_totals: dict[date, Decimal] = {}
+		expense_totals: dict[date, Decimal] = {}
+		for income_model, expense_model in tables:
+			incomes = income_model.objects.filter(user=user, date_received__gte=start, date_received__lt=end)
+			expenses = expense_model.objects.filter(user=user, date_spent__gte=start, date_spent__lt=end)
+			_merge(income_totals, _grouped(incomes.annotate(bucket=TruncWeek("date_received")), "amount"))
+			_merge(expense_totals, _grouped(expenses.annotate(bucket=TruncWeek("date_spent")), "amount"))
+		return income_totals, expense_totals
+	incomes = MonthlyIncomeRollup.objects.filter(user=user, month__gte=start, month__lt=end)
+	expenses = MonthlyExpenseRollup.objects.filter(user=user, month__gte=start, month__lt=end)
+	if granularity == "quarter":
+		incomes = incomes.annotate(bucket=TruncQuarter("month"))
+		expenses = expenses.annotate(bucket=TruncQuarter("month"))
+	else:
+		incomes = incomes.annotate(bucket=F("month"))
+		expenses = expenses.annotate(bucket=F("month"))
+	return _grouped(incomes, "total"), _grouped(expenses, "total")
+
+
+def _grouped(queryset: QuerySet, amount_field: str) -> dict[date, Decimal]:
+	rows = queryset.order_by().values("bucket").annotate(amount=Sum(amount_field))
+	return {row["bucket"]: row["amount"] or ZERO for row in rows}
+
+
+def _merge(totals: dict[date, Decimal], extra: dict[date, Decimal]) -> None:
+	for bucket, amount in extra.items():
+		totals[bucket] = totals.get(bucket, ZERO) + amount
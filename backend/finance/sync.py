@@ -0,0 +1,193 @@
+"""Delta sync of a user's incomes, expenses and budgets.
+
+Every save or delete of an income, expense or budget appends a ``SyncChange``
+row, and a sync token carries the id of the last row a client has seen. Given a
+token, ``changes_since`` reads the user's log entries after that id (a range
+scan on the ``(user, id)`` index) and returns the current state of the rows
+they name plus the ids of deleted rows, so the cost follows the number of
+changes rather than the history.
+
+Entries are inserted once the writing transaction has committed, in short
+statements of their own. Ids still need not become visible in id order: on
+PostgreSQL a sequence value taken by one insert can commit after a higher one.
+A token therefore only advances past entries older than the cursor lag
+(``SYNC_CURSOR_LAG_SECONDS``); newer ones are returned but sent again on the
+next sync, which clients absorb as upserts. The lag must exceed the time a log
+insert takes to commit.
+
+Code paths that bypass model signals (``bulk_create``, ``QuerySet.update``)
+must call ``record_changes`` or ``record_queryset`` themselves.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import BooleanField, CharField, DateTimeField, QuerySet, Value
+from django.utils import timezone
+
+from .models import Budget, Expense, Income, SyncChange
+from .serializers import BudgetSerializer, ExpenseSerializer, IncomeSerializer
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_CURSOR_LAG_SECONDS = 30
+_TOKEN_VERSION = "2"
+# Tokens issued before the change log existed encode a timestamp only.
+_LEGACY_TOKEN_VERSIONS = {"1"}
+_BATCH_SIZE = 1000
+
+SYNC_MODELS = {
+	SyncChange.Kind.INCOME: (Income, IncomeSerializer),
+	SyncChange.Kind.EXPENSE: (Expense, ExpenseSerializer),
+	SyncChange.Kind.BUDGET: (Budget, BudgetSerializer),
+}
+
+
+class SyncTokenExpired(Exception):
+	"""Raised when a token predates the change log retention window."""
+
+
+class SyncToken(NamedTuple):
+	"""Last change log id a client has applied and when the token was issued."""
+
+	change_id: int
+	issued_at: datetime
+
+
+def retention() -> timedelta:
+	return timedelta(days=getattr(settings, "SYNC_CHANGE_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+
+
+def issue_token(change_id: int, moment: datetime | None = None) -> str:
+	"""Encode ``change_id`` as an opaque, URL-safe sync token."""
+
+	micros = int((moment or timezone.now()).timestamp() * 1_000_000)
+	raw = f"{_TOKEN_VERSION}:{change_id}:{micros}"
+	return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def parse_token(token: str) -> SyncToken:
+	"""Decode a token from ``issue_token``.
+
+	Raises ``ValueError`` when malformed and ``SyncTokenExpired`` for tokens of
+	an older format.
+	"""
+
+	try:
+		raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+		version, _, rest = raw.partition(":")
+		if version in _LEGACY_TOKEN_VERSIONS:
+			raise SyncTokenExpired
+		if version != _TOKEN_VERSION:
+			raise ValueError
+		change_id, micros = rest.split(":")
+		return SyncToken(int(change_id), datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc))
+	except (ValueError, UnicodeDecodeError, OverflowError, OSError):
+		raise ValueError("Invalid sync token.") from None
+
+
+def cursor_lag() -> timedelta:
+	return timedelta(seconds=getattr(settings, "SYNC_CURSOR_LAG_SECONDS", DEFAULT_CURSOR_LAG_SECONDS))
+
+
+def latest_change_id(before: datetime | None = None) -> int:
+	"""Highest log id, optionally among entries written no later than ``before``."""
+
+	entries = SyncChange.objects.order_by("-id")
+	if before is not None:
+		entries = entries.filter(changed_at__lte=before)
+	return entries.values_list("id", flat=True).first() or 0
+
+
+def record_changes(kind: str, rows: Iterable[tuple[int, int]], *, deleted: bool = False) -> None:
+	"""Log ``(user_id, object_id)`` pairs of ``kind`` once the transaction commits."""
+
+	rows = list(rows)
+	if not rows:
+		return
+
+	def write() -> None:
+		SyncChange.objects.bulk_create(
+			(SyncChange(user_id=user_id, kind=kind, object_id=object_id, deleted=deleted) for user_id, object_id in rows),
+			batch_size=_BATCH_SIZE,
+		)
+
+	transaction.on_commit(write)
+
+
+def record_queryset(kind: str, queryset: QuerySet, *, deleted: bool = False) -> None:
+	"""Log every row of ``queryset`` once the transaction commits.
+
+	The rows are copied with one ``INSERT ... SELECT``, so nothing is loaded
+	into Python however many rows match.
+	"""
+
+	def write() -> None:
+		rows = queryset.order_by().annotate(
+			sync_kind=Value(kind, output_field=CharField()),
+			sync_deleted=Value(deleted, output_field=BooleanField()),
+			sync_changed_at=Value(timezone.now(), output_field=DateTimeField()),
+		).values_list("user_id", "id", "sync_kind", "sync_deleted", "sync_changed_at")
+		using = router.db_for_write(SyncChange)
+		connection = connections[using]
+		select, params = rows.query.get_compiler(using=using).as_sql()
+		columns = ", ".join(
+			connection.ops.quote_name(SyncChange._meta.get_field(name).column)
+			for name in ("user", "object_id", "kind", "deleted", "changed_at")
+		)
+		with connection.cursor() as cursor:
+			cursor.execute(f"INSERT INTO {connection.ops.quote_name(SyncChange._meta.db_table)} ({columns}) {select}", params)
+
+	transaction.on_commit(write)
+
+
+def record_category_change(category_id: int) -> None:
+	"""Log every expense in a category, whose payload renders the category name."""
+
+	record_queryset(SyncChange.Kind.EXPENSE, Expense.objects.filter(category_id=category_id))
+
+
+def changes_since(user, since: SyncToken | None) -> dict[str, object]:
+	"""Rows changed and ids deleted since ``since`` (everything when ``None``)."""
+
+	now = timezone.now()
+	if since is not None and since.issued_at < now - retention():
+		raise SyncTokenExpired
+	settled = now - cursor_lag()
+	deleted: dict[str, list[int]] = {kind: [] for kind in SYNC_MODELS}
+	if since is None:
+		# Read the cursor first: a change logged meanwhile is sent again next time.
+		cursor = latest_change_id(before=settled)
+		payload: dict[str, object] = {"full": True}
+		for kind, (model, serializer_class) in SYNC_MODELS.items():
+			payload[kind] = serializer_class(model.objects.filter(user=user).order_by("id"), many=True).data
+	else:
+		cursor = since.change_id
+		latest: dict[tuple[str, int], bool] = {}
+		entries = SyncChange.objects.filter(user=user, id__gt=since.change_id).order_by("id")
+		for change_id, kind, object_id, was_deleted, changed_at in entries.values_list(
+			"id", "kind", "object_id", "deleted", "changed_at"
+		):
+			latest[kind, object_id] = was_deleted
+			if changed_at <= settled:
+				cursor = max(cursor, change_id)
+		payload = {"full": False}
+		for kind, (model, serializer_class) in SYNC_MODELS.items():
+			changed = sorted(object_id for (entry_kind, object_id), gone in latest.items() if entry_kind == kind and not gone)
+			deleted[kind] = sorted(object_id for (entry_kind, object_id), gone in latest.items() if entry_kind == kind and gone)
+			rows = model.objects.filter(user=user, id__in=changed).order_by("id") if changed else model.objects.none()
+			payload[kind] = serializer_class(rows, many=True).data
+	payload["deleted"] = deleted
+	payload["token"] = issue_token(cursor)
+	return payload
+
+
+def prune_changes(now: datetime | None = None) -> int:
+	"""Delete log entries older than the retention window; return how many."""
+
+	deleted, _ = SyncChange.objects.filter(changed_at__lt=(now or timezone.now()) - retention()).delete()
+	return deleted
@@ -0,0 +1,22 @@
+"""Celery tasks for finance."""
+from __future__ import annotations
+
+from celery import shared_task
+from django.utils import timezone
+
+from .recurring import materialize_due
+from .sync import prune_changes
+
+
+@shared_task
+def materialize_recurring_transactions() -> int:
+    """Create the incomes and expenses of every recurring rule due up to today."""
+
+    return materialize_due(timezone.localdate())
+
+
+@shared_task
+def prune_sync_changes() -> int:
+    """Drop change log entries older than the delta sync retention window."""
+
+    return prune_changes()
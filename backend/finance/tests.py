@@ -2,24 +2,55 @@
 
 from __future__ import annotations
 
-from datetime import date
+import base64
+import csv
+import json
+import os
+import tempfile
+from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from django.contrib.auth import get_user_model
 
-from .models import Category, Expense, Income
+from core.cache import get_data_version
+
+from .bulk import BATCH_SIZE
+from .catalog import catalog
+from .models import (
+	ArchivedExpense,
+	ArchivedIncome,
+	Budget,
+	Category,
+	Expense,
+	Income,
+	MonthlyExpenseRollup,
+	MonthlyIncomeRollup,
+	RecurringTransaction,
+	SyncChange,
+)
+from .sync import issue_token
 
 User = get_user_model()
 
 
-class FinanceAPITests(APITestCase):
-	"""Validate finance APIs."""
+class FinanceTestCase(APITestCase):
+	"""Authenticates a student with a bearer token before each test."""
 
 	def setUp(self) -> None:
+		cache.clear()
 		self.user = User.objects.create_user(
 			email="student@example.com",
 			password="password123",
@@ -32,6 +63,10 @@ class FinanceAPITests(APITestCase):
 		self.access_token = response.json()["access"]
 		self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
 
+
+class FinanceAPITests(FinanceTestCase):
+	"""Validate finance APIs."""
+
 	def test_create_income(self) -> None:
 		url = reverse("income-list")
 		payload = {
@@ -86,3 +121,917 @@ class FinanceAPITests(APITestCase):
 		self.assertIsNone(body["income_change"])
 		self.assertIsNone(body["expense_change"])
 		self.assertIsNone(body["balance_change"])
+
+
+class SummaryWindowTests(FinanceTestCase):
+	"""Dashboard summary windows and date ranges."""
+
+	def test_finance_summary_uses_single_query_per_table(self) -> None:
+		today = date.today()
+		previous_month = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+		for day in (today, previous_month):
+			Income.objects.create(user=self.user, source="Stipend", amount=Decimal("100.00"), date_received=day)
+			Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("40.00"), date_spent=day)
+		url = reverse("finance-summary-list")
+		# One query authenticates the bearer token, then one aggregate per table.
+		with self.assertNumQueries(3):
+			response = self.client.get(url)
+		body = response.json()
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(body["total_income"], "200.00")
+		self.assertEqual(body["income_this_month"], "100.00")
+		self.assertEqual(body["expense_change"], "0.00")
+
+	def test_finance_summary_respects_date_range(self) -> None:
+		Income.objects.create(user=self.user, source="Grant", amount=Decimal("80.00"), date_received=date(2024, 1, 10))
+		Income.objects.create(user=self.user, source="Grant", amount=Decimal("20.00"), date_received=date(2024, 2, 1))
+		Expense.objects.create(user=self.user, merchant="Books", amount=Decimal("30.00"), date_spent=date(2024, 1, 31))
+		url = reverse("finance-summary-list")
+		response = self.client.get(url, {"start": "2024-01-01", "end": "2024-01-31"})
+		body = response.json()
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(body["total_income"], "80.00")
+		self.assertEqual(body["total_expense"], "30.00")
+		self.assertEqual(body["net_balance"], "50.00")
+
+		partial = self.client.get(url, {"start": "2024-01-15", "end": "2024-02-01"}).json()
+		self.assertEqual(partial["total_income"], "20.00")
+		self.assertEqual(partial["total_expense"], "30.00")
+
+
+class TrendBucketTests(FinanceTestCase):
+	"""Trend buckets by week, month and quarter."""
+
+	def test_trends_query_count_is_independent_of_window(self) -> None:
+		today = date.today()
+		Income.objects.create(user=self.user, source="Stipend", amount=Decimal("300.00"), date_received=today)
+		Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("25.00"), date_spent=today)
+		url = reverse("finance-summary-trends")
+		with self.assertNumQueries(3):
+			response = self.client.get(url, {"window": "10y"})
+		results = response.json()["results"]
+		self.assertEqual(len(results), 120)
+		self.assertEqual(results[-1]["month"], today.strftime("%b %Y"))
+		self.assertEqual(results[-1]["income"], 300.0)
+		self.assertEqual(results[0]["income"], 0.0)
+
+	def test_trends_supports_week_and_quarter_granularity(self) -> None:
+		today = date.today()
+		Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("25.00"), date_spent=today)
+		url = reverse("finance-summary-trends")
+
+		weekly = self.client.get(url, {"granularity": "week", "window": "4w"}).json()
+		self.assertEqual(len(weekly["results"]), 4)
+		monday = today - timedelta(days=today.weekday())
+		self.assertEqual(weekly["results"][-1]["period_start"], monday.isoformat())
+		self.assertEqual(weekly["results"][-1]["expense"], 25.0)
+
+		quarterly = self.client.get(url, {"granularity": "quarter", "window": "1y"}).json()
+		self.assertEqual(len(quarterly["results"]), 4)
+		self.assertEqual(quarterly["results"][-1]["period"], f"Q{(today.month - 1) // 3 + 1} {today.year}")
+		self.assertEqual(quarterly["results"][-1]["expense"], 25.0)
+
+		invalid = self.client.get(url, {"granularity": "day"})
+		self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CategoryBreakdownTests(FinanceTestCase):
+	"""Range mode of the expense category breakdown."""
+
+	def test_category_breakdown_range_mode_uses_one_query(self) -> None:
+		books = Category.objects.create(name="Books")
+		food = Category.objects.create(name="Food")
+		Expense.objects.create(user=self.user, merchant="Shop", amount=Decimal("10.00"), date_spent=date(2024, 1, 3), category=books)
+		Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("4.00"), date_spent=date(2024, 3, 8), category=food)
+		Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("6.00"), date_spent=date(2024, 3, 9), category=books)
+		url = reverse("finance-summary-expenses-category-breakdown")
+		catalog.rows()
+		with self.assertNumQueries(2):
+			response = self.client.get(url, {"mode": "range", "start": "2024-01", "end": "2024-03"})
+		body = response.json()
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(body["mode"], "range")
+		self.assertEqual([entry["month_key"] for entry in body["series"]], ["2024-01", "2024-02", "2024-03"])
+		self.assertEqual(body["series"][1]["categories"], [])
+		self.assertEqual([item["category"] for item in body["series"][2]["categories"]], ["Books", "Food"])
+		self.assertEqual(body["series"][2]["total"], 10.0)
+
+		reversed_range = self.client.get(url, {"mode": "range", "start": "2024-03", "end": "2024-01"})
+		self.assertEqual(reversed_range.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ResponseCacheTests(FinanceTestCase):
+	"""Versioned response caching of summary actions."""
+
+	def test_summary_responses_are_cached_until_data_changes(self) -> None:
+		url = reverse("finance-summary-list")
+		Income.objects.create(user=self.user, source="Grant", amount=Decimal("200.00"), date_received=date.today())
+		self.assertEqual(self.client.get(url).json()["total_income"], "200.00")
+
+		# Only the bearer token lookup reaches the database on a cache hit.
+		with self.assertNumQueries(1):
+			cached = self.client.get(url)
+		self.assertEqual(cached.json()["total_income"], "200.00")
+
+		with self.captureOnCommitCallbacks(execute=True):
+			Income.objects.create(user=self.user, source="Job", amount=Decimal("50.00"), date_received=date.today())
+			# The version only moves once the write commits.
+			self.assertEqual(self.client.get(url).json()["total_income"], "200.00")
+		self.assertEqual(self.client.get(url).json()["total_income"], "250.00")
+
+		admin = User.objects.create_user(email="staff@example.com", password="password123", is_staff=True)
+		self.client.force_authenticate(admin)
+		stats = self.client.get(reverse("finance-summary-response-cache-stats")).json()["results"]
+		self.assertEqual(stats["summary"], {"hits": 2, "misses": 2})
+
+
+class KeysetPaginationTests(FinanceTestCase):
+	"""Cursor pagination of list endpoints."""
+
+	def test_expense_list_keyset_pagination(self) -> None:
+		category = Category.objects.create(name="Food")
+		same_day = date(2024, 6, 1)
+		for index in range(5):
+			Expense.objects.create(
+				user=self.user, merchant=f"Shop {index}", amount=Decimal("1.00"), date_spent=same_day, category=category
+			)
+		Expense.objects.create(
+			user=self.user, merchant="Latest", amount=Decimal("1.00"), date_spent=date(2024, 6, 2), category=category
+		)
+		url = reverse("expense-list")
+
+		seen: list[str] = []
+		page = self.client.get(url, {"page_size": 2}).json()
+		self.assertIsNone(page["previous"])
+		pages = [page]
+		while page["next"]:
+			page = self.client.get(page["next"]).json()
+			pages.append(page)
+		for entry in pages:
+			seen.extend(item["merchant"] for item in entry["results"])
+		self.assertEqual(seen, ["Latest", "Shop 4", "Shop 3", "Shop 2", "Shop 1", "Shop 0"])
+
+		previous = self.client.get(pages[-1]["previous"]).json()
+		self.assertEqual([item["merchant"] for item in previous["results"]], ["Shop 3", "Shop 2"])
+
+		legacy = self.client.get(url, {"paginate": "false"}).json()
+		self.assertEqual(len(legacy), 6)
+
+		invalid = self.client.get(url, {"cursor": "not-a-cursor"})
+		self.assertEqual(invalid.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TransactionSearchTests(FinanceTestCase):
+	"""Full-text search over incomes and expenses."""
+
+	def test_expense_search_uses_prefix_index_and_stays_in_sync(self) -> None:
+		category = Category.objects.create(name="Food")
+		coffee = Expense.objects.create(
+			user=self.user, merchant="Campus Coffee", amount=Decimal("3.00"), date_spent=date(2024, 2, 1), category=category
+		)
+		Expense.objects.create(
+			user=self.user, merchant="Bookshop", amount=Decimal("9.00"), date_spent=date(2024, 2, 2), notes="coffee table book",
+			category=category,
+		)
+		Expense.objects.bulk_create([
+			Expense(user=self.user, merchant="Coffee Cart", amount=Decimal("2.00"), date_spent=date(2024, 2, 3), category=category)
+		])
+		url = reverse("expense-list")
+
+		merchants = [item["merchant"] for item in self.client.get(url, {"search": "cof"}).json()["results"]]
+		self.assertEqual(merchants, ["Coffee Cart", "Bookshop", "Campus Coffee"])
+
+		ranked = self.client.get(reverse("expense-search"), {"q": "coffee campus"}).json()["results"]
+		self.assertEqual([item["merchant"] for item in ranked], ["Campus Coffee"])
+
+		coffee.merchant = "Campus Tea"
+		coffee.save()
+		merchants = [item["merchant"] for item in self.client.get(url, {"search": "coffee"}).json()["results"]]
+		self.assertEqual(merchants, ["Coffee Cart", "Bookshop"])
+		self.assertEqual(len(self.client.get(url, {"search": "tea"}).json()["results"]), 1)
+
+		coffee.delete()
+		self.assertEqual(self.client.get(url, {"search": "tea"}).json()["results"], [])
+		self.assertEqual(self.client.get(reverse("expense-search")).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkUploadTests(FinanceTestCase):
+	"""Bulk income/expense creation."""
+
+	def test_bulk_expense_upload_resolves_categories_in_one_query(self) -> None:
+		food = Category.objects.create(name="Food")
+		rent = Category.objects.create(name="Rent")
+		rows = [
+			{
+				"merchant": f"Shop {index}",
+				"amount": "5.00",
+				"date_spent": f"2024-03-{index % 28 + 1:02d}",
+				"category": food.id if index % 2 else rent.id,
+			}
+			for index in range(40)
+		]
+		url = reverse("expense-bulk")
+		# Token lookup, one category lookup and one INSERT for all 40 rows; the rest
+		# are savepoints and the upserts of the two (month, category) rollup rows.
+		with self.assertNumQueries(17):
+			response = self.client.post(url, rows, format="json")
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(response.json()["created"], 40)
+		self.assertEqual(Expense.objects.filter(user=self.user).count(), 40)
+		self.assertEqual(
+			MonthlyExpenseRollup.objects.get(user=self.user, category=rent).total,
+			Decimal("100.00"),
+		)
+
+	def test_bulk_upload_partial_mode_keeps_valid_rows(self) -> None:
+		food = Category.objects.create(name="Food")
+		rows = [
+			{"merchant": "Cafe", "amount": "4.00", "date_spent": "2024-03-01", "category": food.id},
+			{"merchant": "Cafe", "amount": "-1.00", "date_spent": "2024-03-01", "category": food.id},
+			{"merchant": "Ghost", "amount": "4.00", "date_spent": "2024-03-01", "category": 9999},
+		]
+		url = reverse("expense-bulk")
+
+		rejected = self.client.post(url, {"items": rows}, format="json")
+		self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertEqual([error["index"] for error in rejected.json()["errors"]], [1, 2])
+		self.assertEqual(Expense.objects.count(), 0)
+
+		accepted = self.client.post(url, {"items": rows, "partial": True}, format="json")
+		self.assertEqual(accepted.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(accepted.json()["created"], 1)
+		self.assertEqual(len(accepted.json()["errors"]), 2)
+
+		incomes = self.client.post(
+			reverse("income-bulk"),
+			[{"source": "Job", "amount": "10.00", "date_received": "2024-03-02"}],
+			format="json",
+		)
+		self.assertEqual(incomes.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(self.client.get(reverse("finance-summary-list"), {"start": "2024-03-01"}).json()["total_income"], "10.00")
+
+
+class TransactionExportTests(FinanceTestCase):
+	"""Streaming CSV/NDJSON export."""
+
+	def test_export_streams_csv_and_ndjson_in_date_order(self) -> None:
+		food = Category.objects.create(name="Food")
+		Income.objects.create(user=self.user, source="Job", amount="50.00", date_received=date(2024, 3, 2))
+		Expense.objects.create(user=self.user, merchant="Cafe, Inc", amount="4.50", date_spent=date(2024, 3, 1), category=food)
+		Expense.objects.create(user=self.user, merchant="Old", amount="1.00", date_spent=date(2023, 1, 1))
+		url = reverse("finance-export")
+
+		response = self.client.get(url, {"format": "csv", "start": "2024-01-01"})
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertTrue(response.streaming)
+		self.assertTrue(response["Content-Type"].startswith("text/csv"))
+		lines = b"".join(response.streaming_content).decode().splitlines()
+		self.assertEqual(lines[0], "type,id,date,amount,counterparty,category,notes")
+		self.assertEqual(len(lines), 3)
+		self.assertTrue(lines[1].startswith("expense,") and '"Cafe, Inc",Food' in lines[1])
+		self.assertTrue(lines[2].startswith("income,"))
+
+		response = self.client.get(url, {"format": "ndjson"})
+		rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+		self.assertEqual([row["date"] for row in rows], ["2023-01-01", "2024-03-01", "2024-03-02"])
+		self.assertEqual(rows[1]["amount"], "4.50")
+
+		self.assertEqual(self.client.get(url, {"format": "xml"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatementImportTests(FinanceTestCase):
+	"""Bank statement CSV import."""
+
+	def test_bank_statement_import_batches_rows_and_reports_throughput(self) -> None:
+		Category.objects.create(name="Food")
+		statement = (
+			"Date,Description,Amount,Category\n"
+			"2024-03-01,Cafe,-4.50,food\n"
+			"2024-03-02,Salary,\"1,000.00\",\n"
+			"2024-03-03,Mystery,(2.00),Gadgets\n"
+			"2024-03-04,Kiosk,-3.00,\n"
+			"not-a-date,Broken,-1.00,\n"
+		)
+		upload = SimpleUploadedFile("statement.csv", statement.encode(), content_type="text/csv")
+
+		response = self.client.post(reverse("finance-import"), {"file": upload}, format="multipart")
+
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		report = response.json()
+		self.assertEqual((report["rows"], report["incomes"], report["expenses"], report["skipped"]), (5, 1, 1, 3))
+		self.assertEqual(report["unknown_categories"], ["Gadgets"])
+		# Every expense needs a category, as in the API and bulk uploads.
+		self.assertEqual(
+			[error["error"] for error in report["errors"]],
+			["unknown category 'Gadgets'", "missing category", "invalid date 'not-a-date'"],
+		)
+		self.assertIn("rows_per_second", report)
+		self.assertEqual(Expense.objects.get().category.name, "Food")
+		self.assertEqual(Income.objects.get().amount, Decimal("1000.00"))
+		self.assertEqual(MonthlyExpenseRollup.objects.filter(user=self.user).count(), 1)
+
+	def test_failed_import_rolls_back_earlier_batches(self) -> None:
+		rows = "".join(f"2024-03-01,Job {index},10.00\n" for index in range(BATCH_SIZE + 100))
+		undecodable = f"date,description,amount\n{rows}".encode() + b"2024-03-02,Caf\xe9,-4.50\n"
+		upload = SimpleUploadedFile("statement.csv", undecodable, content_type="text/csv")
+		response = self.client.post(reverse("finance-import"), {"file": upload}, format="multipart")
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertFalse(Income.objects.exists())
+
+		oversized = f"date,description,amount\n{rows}2024-03-02,{'x' * (csv.field_size_limit() + 1)},-4.50\n"
+		upload = SimpleUploadedFile("statement.csv", oversized.encode(), content_type="text/csv")
+		response = self.client.post(reverse("finance-import"), {"file": upload}, format="multipart")
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertIn("Malformed CSV", response.json()["detail"])
+		self.assertFalse(Income.objects.exists())
+		self.assertFalse(MonthlyIncomeRollup.objects.exists())
+
+	def test_import_registers_a_fixed_number_of_commit_callbacks(self) -> None:
+		from .importer import import_statement
+
+		def import_rows(count: int) -> int:
+			rows = "".join(f"2024-03-01,Job {index},10.00\n" for index in range(count))
+			with self.captureOnCommitCallbacks(execute=True) as callbacks:
+				import_statement(self.user, StringIO(f"date,description,amount\n{rows}"), batch_size=2)
+			return len(callbacks)
+
+		self.assertEqual(import_rows(4), import_rows(40))
+		with override_settings(SYNC_CURSOR_LAG_SECONDS=0):
+			token = self.client.get(reverse("finance-changes")).json()["token"]
+			import_rows(3)
+			body = self.client.get(reverse("finance-changes"), {"since": token}).json()
+		self.assertEqual(len(body["incomes"]), 3)
+
+	def test_import_bank_statement_command(self) -> None:
+		Category.objects.create(name="Food")
+		with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+			handle.write("date,description,debit,credit,category\n01/03/2024,Cafe,4.50,,Food\n02/03/2024,Job,,20.00,\n")
+		self.addCleanup(os.remove, handle.name)
+		out = StringIO()
+
+		call_command(
+			"import_bank_statement",
+			handle.name,
+			email="student@example.com",
+			date_format="%d/%m/%Y",
+			batch_size=1,
+			stdout=out,
+		)
+
+		self.assertIn("rows/sec", out.getvalue())
+		self.assertEqual(Expense.objects.get().date_spent, date(2024, 3, 1))
+		self.assertEqual(Income.objects.get().amount, Decimal("20.00"))
+
+
+class BudgetUtilizationTests(FinanceTestCase):
+	"""Budget utilization action."""
+
+	def test_budget_utilization_uses_one_range_join(self) -> None:
+		march = Budget.objects.create(user=self.user, period_start=date(2024, 3, 1), period_end=date(2024, 3, 31), allocated_amount="100.00")
+		quarter = Budget.objects.create(user=self.user, period_start=date(2024, 3, 15), period_end=date(2024, 6, 30), allocated_amount="50.00")
+		empty = Budget.objects.create(user=self.user, period_start=date(2025, 1, 1), period_end=date(2025, 1, 31), allocated_amount="10.00")
+		Expense.objects.create(user=self.user, merchant="Cafe", amount="20.00", date_spent=date(2024, 3, 10))
+		Expense.objects.create(user=self.user, merchant="Books", amount="40.00", date_spent=date(2024, 3, 20))
+		Expense.objects.create(user=self.user, merchant="Rent", amount="25.00", date_spent=date(2024, 4, 2))
+
+		with self.assertNumQueries(2):
+			response = self.client.get(reverse("budget-utilization"))
+
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		results = {row["id"]: row for row in response.json()["results"]}
+		self.assertEqual((results[march.id]["spent"], results[march.id]["remaining"], results[march.id]["percent_used"]), ("60.00", "40.00", "60.00"))
+		self.assertEqual((results[quarter.id]["spent"], results[quarter.id]["remaining"], results[quarter.id]["percent_used"]), ("65.00", "-15.00", "130.00"))
+		self.assertEqual(results[empty.id]["spent"], "0.00")
+
+
+class CategoryCatalogTests(FinanceTestCase):
+	"""In-process category catalog."""
+
+	def test_category_catalog_serves_expense_writes_and_reloads_on_change(self) -> None:
+		books = Category.objects.create(name="Books")
+		food = Category.objects.create(name="Food")
+		catalog.rows()
+		payload = {"amount": "5.00", "date_spent": "2024-03-01", "merchant": "Store", "category": books.id}
+
+		with self.assertNumQueries(0):
+			self.assertEqual(catalog.id_for(" FOOD "), food.id)
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.post(reverse("expense-list"), payload, format="json")
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(response.json()["category_name"], "Books")
+		self.assertFalse(any('FROM "finance_category"' in query["sql"] for query in queries.captured_queries))
+
+		with self.assertNumQueries(1):
+			listing = self.client.get(reverse("category-list"))
+		self.assertEqual([row["name"] for row in listing.json()["results"]], ["Books", "Food"])
+
+		books.name = "Textbooks"
+		books.save()
+		self.assertEqual(catalog.name(books.id), "Textbooks")
+		rejected = self.client.post(reverse("expense-list"), {**payload, "category": 9999}, format="json")
+		self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+
+	def test_category_list_honours_search_and_ordering(self) -> None:
+		for name in ("Books", "Food", "Fees"):
+			Category.objects.create(name=name)
+		url = reverse("category-list")
+		searched = self.client.get(url, {"search": "fo"}).json()["results"]
+		self.assertEqual([row["name"] for row in searched], ["Food"])
+		ordered = self.client.get(url, {"ordering": "-name", "paginate": "false"}).json()
+		self.assertEqual([row["name"] for row in ordered], ["Food", "Fees", "Books"])
+
+	def test_expense_list_reads_catalog_version_once(self) -> None:
+		category = Category.objects.create(name="Food")
+		for day in range(1, 6):
+			Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("1.00"), date_spent=date(2024, 3, day), category=category)
+		catalog.rows()
+		with mock.patch("finance.catalog.get_data_version", wraps=get_data_version) as version_reads:
+			rows = self.client.get(reverse("expense-list")).json()["results"]
+		self.assertEqual({row["category_name"] for row in rows}, {"Food"})
+		self.assertEqual(len(rows), 5)
+		self.assertEqual(version_reads.call_count, 1)
+
+
+class SpendingAnalyticsTests(FinanceTestCase):
+	"""Rolling spending analytics."""
+
+	def test_spending_analytics_rolling_windows_and_outliers(self) -> None:
+		food = Category.objects.create(name="Food")
+		today = timezone.localdate()
+		for offset in range(20):
+			Expense.objects.create(user=self.user, merchant="Cafe", amount="10.00", date_spent=today - timedelta(days=offset), category=food)
+		spike = Expense.objects.create(user=self.user, merchant="Banquet", amount="500.00", date_spent=today, category=food)
+		Expense.objects.create(user=self.user, merchant="Misc", amount="3.25", date_spent=today - timedelta(days=40))
+
+		with self.assertNumQueries(3):
+			response = self.client.get(reverse("finance-summary-analytics"), {"days": "30"})
+
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		body = response.json()
+		self.assertEqual(body["count"], 22)
+		self.assertEqual(len(body["rolling"]), 30)
+		latest = body["rolling"][-1]
+		self.assertEqual(latest["date"], today.isoformat())
+		self.assertEqual((latest["spend"], latest["rolling_7"], latest["rolling_30"]), (510.0, 570.0, 700.0))
+		food_stats = next(entry for entry in body["categories"] if entry["category"] == "Food")
+		self.assertEqual((food_stats["count"], food_stats["total"]), (21, 700.0))
+		self.assertEqual(body["categories"][0]["category"], "Uncategorised")
+		self.assertEqual([outlier["id"] for outlier in body["outliers"]], [spike.id])
+		self.assertGreater(body["outliers"][0]["z_score"], 3)
+
+		invalid = self.client.get(reverse("finance-summary-analytics"), {"threshold": "-1"})
+		self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CashFlowForecastTests(FinanceTestCase):
+	"""Cash-flow forecast action."""
+
+	def test_cash_flow_forecast_projects_trend_and_shortfall(self) -> None:
+		current_month = timezone.localdate().replace(day=1)
+		for offset in range(1, 7):
+			month = (current_month - timedelta(days=1)).replace(day=1)
+			for _ in range(offset - 1):
+				month = (month - timedelta(days=1)).replace(day=1)
+			Income.objects.create(user=self.user, source="Allowance", amount="1000.00", date_received=month)
+			Expense.objects.create(user=self.user, merchant="Rent", amount=Decimal(400 + 100 * (6 - offset)), date_spent=month)
+		url = reverse("finance-summary-forecast")
+
+		with self.assertNumQueries(3):
+			response = self.client.get(url, {"method": "linear", "months": "12"})
+
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		body = response.json()
+		self.assertEqual(body["starting_balance"], 2100.0)
+		first = body["results"][0]
+		self.assertEqual((first["income"], first["expense"], first["balance"]), (1000.0, 1100.0, 2000.0))
+		self.assertEqual(first["expense_lower"], first["expense_upper"])
+		self.assertEqual(body["shortfall_month"], body["results"][6]["period_start"])
+
+		smoothed = self.client.get(url, {"months": "3", "confidence": "0.95"}).json()
+		self.assertEqual(smoothed["method"], "holt")
+		for entry in smoothed["results"]:
+			self.assertLessEqual(entry["balance_lower"], entry["balance"])
+			self.assertLessEqual(entry["balance"], entry["balance_upper"])
+		self.assertEqual(self.client.get(url, {"method": "magic"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DepartmentAnalyticsTests(FinanceTestCase):
+	"""Admin department analytics."""
+
+	def test_department_analytics_cube_for_admins(self) -> None:
+		food = Category.objects.create(name="Food")
+		self.user.department = "Physics"
+		self.user.save(update_fields=["department"])
+		other = User.objects.create_user(email="chem@example.com", password="password123", username="chem", department="Chemistry")
+		today = timezone.localdate()
+		Income.objects.create(user=self.user, source="Allowance", amount=Decimal("300.00"), date_received=today)
+		Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("40.00"), date_spent=today, category=food)
+		Expense.objects.create(user=self.user, merchant="Misc", amount=Decimal("10.00"), date_spent=today)
+		Expense.objects.create(user=other, merchant="Cafe", amount=Decimal("25.00"), date_spent=today, category=food)
+		url = reverse("finance-summary-departments")
+
+		self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+		admin = User.objects.create_user(email="staff@example.com", password="password123", is_staff=True)
+		self.client.force_authenticate(admin)
+		catalog.rows()
+		with self.assertNumQueries(3):
+			response = self.client.get(url, {"window": "3m"})
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		rows = {row["department"]: row for row in response.json()["results"]}
+		self.assertEqual(set(rows), {"Physics", "Chemistry"})
+		physics = rows["Physics"]
+		self.assertEqual((physics["income"], physics["expense"], physics["net"]), (300.0, 50.0, 250.0))
+		self.assertEqual(
+			[(entry["category"], entry["expense"]) for entry in physics["categories"]],
+			[("Uncategorised", 10.0), ("Food", 40.0)],
+		)
+		with self.assertNumQueries(0):
+			self.client.get(url, {"window": "3m"})
+
+		with self.captureOnCommitCallbacks(execute=True):
+			Expense.objects.create(user=other, merchant="Lab", amount=Decimal("5.00"), date_spent=today, category=food)
+		# Writes do not invalidate the cube; it expires after CACHE_TIMEOUT instead.
+		with self.assertNumQueries(0):
+			self.client.get(url, {"window": "3m"})
+		# The institution-wide cube is shared by every admin.
+		colleague = User.objects.create_user(email="staff2@example.com", password="password123", is_staff=True)
+		self.client.force_authenticate(colleague)
+		with self.assertNumQueries(0):
+			self.assertEqual(self.client.get(url, {"window": "3m"}).json(), response.json())
+		filtered = self.client.get(url, {"window": "3m", "department": "Chemistry"}).json()
+		self.assertEqual([row["expense"] for row in filtered["results"]], [30.0])
+		self.assertEqual(filtered["departments"], [{"department": "Chemistry", "income": 0.0, "expense": 30.0, "net": -30.0}])
+
+	def test_department_version_bumps_only_on_committed_department_changes(self) -> None:
+		from .institution import SCOPE
+
+		version = get_data_version(None, SCOPE)
+		self.user.first_name = "Ada"
+		with self.captureOnCommitCallbacks(execute=True):
+			self.user.save()
+		self.assertEqual(get_data_version(None, SCOPE), version)
+
+		self.user.department = "Physics"
+		with self.captureOnCommitCallbacks(execute=False) as callbacks:
+			self.user.save()
+		self.assertEqual(get_data_version(None, SCOPE), version)
+		for callback in callbacks:
+			callback()
+		self.assertNotEqual(get_data_version(None, SCOPE), version)
+
+	def test_department_totals_merge_user_id_ranges(self) -> None:
+		from .institution import aggregate_range, user_id_ranges
+
+		for index in range(3):
+			member = User.objects.create_user(
+				email=f"member{index}@example.com", password="password123", username=f"member{index}", department="Maths"
+			)
+			Expense.objects.create(user=member, merchant="Books", amount=Decimal("12.50"), date_spent=date(2024, 3, 9))
+		start, end = date(2024, 3, 1), date(2024, 4, 1)
+
+		ranges = user_id_ranges(1)
+		self.assertEqual(len(ranges), User.objects.count())
+		merged = Decimal("0.00")
+		for id_range in ranges:
+			merged += sum(aggregate_range(id_range, start, end)[1].values(), Decimal("0.00"))
+		self.assertEqual(merged, Decimal("37.50"))
+		self.assertEqual(aggregate_range(None, start, end)[1], {("Maths", date(2024, 3, 1), None): Decimal("37.50")})
+
+
+class DepartmentTotalsThreadPoolTests(TransactionTestCase):
+	"""Department totals aggregated on worker threads, each with its own connection."""
+
+	def test_thread_pool_partials_match_single_pass(self) -> None:
+		from . import institution
+
+		food = Category.objects.create(name="Food")
+		for index in range(5):
+			member = User.objects.create_user(
+				email=f"member{index}@example.com",
+				password="password123",
+				username=f"member{index}",
+				department="Maths" if index % 2 else "Physics",
+			)
+			Income.objects.create(user=member, source="Grant", amount=Decimal("100.00"), date_received=date(2024, 3, 2))
+			Expense.objects.create(user=member, merchant="Cafe", amount=Decimal("12.50"), date_spent=date(2024, 3, 9), category=food)
+			Expense.objects.create(user=member, merchant="Bus", amount=Decimal("2.00"), date_spent=date(2024, 4, 9))
+		start, end = date(2024, 3, 1), date(2024, 5, 1)
+		single_pass = institution.department_totals(start=start, end=end)
+
+		# SQLite is aggregated on the calling thread; pretend otherwise to use the pool.
+		with mock.patch.object(institution, "connection", mock.Mock(vendor="postgresql")), mock.patch.object(
+			institution, "ThreadPoolExecutor", wraps=institution.ThreadPoolExecutor
+		) as pool:
+			pooled = institution.department_totals(start=start, end=end, chunk_size=2, workers=2)
+
+		pool.assert_called_once_with(max_workers=2)
+		self.assertEqual(pooled, single_pass)
+		self.assertEqual(pooled[0][("Maths", date(2024, 3, 1))], Decimal("200.00"))
+		self.assertEqual(pooled[1][("Physics", date(2024, 3, 1), food.pk)], Decimal("37.50"))
+
+
+class ArchiveTests(FinanceTestCase):
+	"""Cold-storage archival of old transactions."""
+
+	def test_archive_moves_old_rows_and_keeps_summaries(self) -> None:
+		food = Category.objects.create(name="Food")
+		Income.objects.create(user=self.user, source="Grant", amount=Decimal("500.00"), date_received=date(2022, 3, 10))
+		Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("20.00"), date_spent=date(2022, 3, 12), category=food)
+		Expense.objects.create(user=self.user, merchant="Books", amount=Decimal("30.00"), date_spent=date(2022, 4, 2))
+		recent = Expense.objects.create(user=self.user, merchant="Bus", amount=Decimal("5.00"), date_spent=date(2024, 5, 1))
+		summary_url = reverse("finance-summary-list")
+		custom_range = {"start": "2022-03-11", "end": "2024-05-31"}
+		before = self.client.get(summary_url, custom_range).json()
+		rollups_before = sorted(MonthlyExpenseRollup.objects.values_list("month", "category_id", "total", "entry_count"))
+
+		out = StringIO()
+		call_command("archive_transactions", before="2022-04-15", batch_size=1, stdout=out)
+
+		self.assertIn("Archived 1 incomes and 1 expenses dated before 2022-04-01", out.getvalue())
+		self.assertEqual(list(Expense.objects.values_list("merchant", flat=True).order_by("date_spent")), ["Books", "Bus"])
+		self.assertEqual(ArchivedIncome.objects.get().amount, Decimal("500.00"))
+		self.assertEqual(ArchivedExpense.objects.get().category, food)
+		self.assertEqual(sorted(MonthlyExpenseRollup.objects.values_list("month", "category_id", "total", "entry_count")), rollups_before)
+		self.assertEqual(self.client.get(summary_url, custom_range).json(), before)
+		self.assertEqual(before["total_expense"], "55.00")
+
+		weekly = self.client.get(reverse("finance-summary-trends"), {"granularity": "week", "window": "260"}).json()
+		self.assertIn(20.0, [float(entry["expense"]) for entry in weekly["results"]])
+		exported = self.client.get(reverse("finance-export"), {"format": "ndjson"})
+		rows = [json.loads(line) for line in b"".join(exported.streaming_content).decode().splitlines()]
+		self.assertEqual([row["counterparty"] for row in rows], ["Grant", "Cafe", "Books", "Bus"])
+
+		call_command("rebuild_finance_rollups", stdout=StringIO())
+		self.assertEqual(sorted(MonthlyExpenseRollup.objects.values_list("month", "category_id", "total", "entry_count")), rollups_before)
+		recent.delete()
+		self.assertEqual(Expense.objects.count(), 1)
+
+	@override_settings(SYNC_CURSOR_LAG_SECONDS=0)
+	def test_archived_rows_are_reported_deleted_to_sync_clients(self) -> None:
+		with self.captureOnCommitCallbacks(execute=True):
+			grant = Income.objects.create(user=self.user, source="Grant", amount=Decimal("500.00"), date_received=date(2022, 3, 10))
+			cafe = Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("20.00"), date_spent=date(2022, 3, 12))
+			Expense.objects.create(user=self.user, merchant="Bus", amount=Decimal("5.00"), date_spent=date(2024, 5, 1))
+		url = reverse("finance-changes")
+		token = self.client.get(url).json()["token"]
+
+		with self.captureOnCommitCallbacks(execute=True):
+			call_command("archive_transactions", before="2022-04-15", batch_size=1, stdout=StringIO())
+
+		body = self.client.get(url, {"since": token}).json()
+		self.assertEqual(body["deleted"], {"incomes": [grant.pk], "expenses": [cafe.pk], "budgets": []})
+		self.assertEqual((body["incomes"], body["expenses"]), ([], []))
+
+
+class RecurringTransactionTests(FinanceTestCase):
+	"""Recurring income/expense rules."""
+
+	def test_recurring_transactions_materialize_idempotently(self) -> None:
+		from .recurring import materialize_due
+
+		rent = Category.objects.create(name="Rent")
+		url = reverse("recurring-transaction-list")
+		response = self.client.post(
+			url,
+			{
+				"kind": "expense",
+				"description": "Landlord",
+				"amount": "300.00",
+				"category": rent.pk,
+				"frequency": "monthly",
+				"start_date": "2024-01-31",
+				"end_date": "2024-04-30",
+			},
+		)
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(response.json()["next_occurrence"], "2024-01-31")
+		stipend = {"kind": "income", "description": "Stipend", "amount": "50.00", "frequency": "weekly", "interval": 2, "start_date": "2024-03-04"}
+		self.assertEqual(self.client.post(url, {**stipend, "category": rent.pk}).status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertEqual(self.client.post(url, stipend).status_code, status.HTTP_201_CREATED)
+
+		self.assertEqual(materialize_due(date(2024, 3, 20)), 4)
+		self.assertEqual(materialize_due(date(2024, 3, 20)), 0)
+		# A rule rewound by an overlapping or retried run still cannot duplicate rows.
+		RecurringTransaction.objects.update(next_occurrence=date(2024, 1, 1))
+		self.assertEqual(materialize_due(date(2024, 3, 20)), 0)
+		self.assertEqual(materialize_due(date(2024, 6, 1)), 2 + 5)
+
+		landlord = RecurringTransaction.objects.get(description="Landlord")
+		self.assertFalse(landlord.is_active)
+		self.assertEqual(
+			list(landlord.expenses.order_by("date_spent").values_list("date_spent", flat=True)),
+			[date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+		)
+		self.assertEqual(Income.objects.filter(source="Stipend").count(), 7)
+		self.assertEqual(
+			MonthlyExpenseRollup.objects.get(user=self.user, month=date(2024, 2, 1), category=rent).total,
+			Decimal("300.00"),
+		)
+
+	def test_expense_rule_requires_a_category(self) -> None:
+		url = reverse("recurring-transaction-list")
+		payload = {"kind": "expense", "description": "Gym", "amount": "20.00", "frequency": "monthly", "start_date": "2024-01-01"}
+		response = self.client.post(url, payload)
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertIn("category", response.json())
+
+	def test_resuming_a_paused_rule_does_not_backfill(self) -> None:
+		from .recurring import materialize_due
+
+		today = timezone.localdate()
+		rule = RecurringTransaction.objects.create(
+			user=self.user,
+			kind=RecurringTransaction.Kind.INCOME,
+			description="Allowance",
+			amount=Decimal("10.00"),
+			frequency=RecurringTransaction.Frequency.WEEKLY,
+			start_date=today - timedelta(weeks=20),
+			next_occurrence=today - timedelta(weeks=20),
+			is_active=False,
+		)
+		url = reverse("recurring-transaction-detail", args=[rule.pk])
+		response = self.client.patch(url, {"is_active": True})
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(response.json()["next_occurrence"], today.isoformat())
+		self.assertEqual(materialize_due(today), 1)
+
+
+@override_settings(SYNC_CURSOR_LAG_SECONDS=0)
+class DeltaSyncTests(FinanceTestCase):
+	"""Delta sync endpoint."""
+
+	def test_delta_sync_returns_only_changes_and_deletions(self) -> None:
+		with self.captureOnCommitCallbacks(execute=True):
+			old = Income.objects.create(user=self.user, source="Job", amount=Decimal("10.00"), date_received=date(2024, 1, 1))
+			kept = Income.objects.create(user=self.user, source="Gift", amount=Decimal("5.00"), date_received=date(2024, 1, 2))
+			doomed = Budget.objects.create(
+				user=self.user, period_start=date(2024, 1, 1), period_end=date(2024, 1, 31), allocated_amount=Decimal("100.00")
+			)
+		url = reverse("finance-changes")
+		full = self.client.get(url).json()
+		self.assertTrue(full["full"])
+		self.assertEqual({row["id"] for row in full["incomes"]}, {old.pk, kept.pk})
+		self.assertEqual(len(full["budgets"]), 1)
+
+		with self.captureOnCommitCallbacks(execute=True):
+			kept.amount = Decimal("7.50")
+			kept.save()
+			doomed_id = doomed.pk
+			doomed.delete()
+			expense = Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("3.00"), date_spent=date(2024, 1, 3))
+
+		with self.assertNumQueries(4):
+			delta = self.client.get(url, {"since": full["token"]})
+		body = delta.json()
+		self.assertFalse(body["full"])
+		self.assertEqual([(row["id"], row["amount"]) for row in body["incomes"]], [(kept.pk, "7.50")])
+		self.assertEqual([row["id"] for row in body["expenses"]], [expense.pk])
+		self.assertEqual(body["budgets"], [])
+		self.assertEqual(body["deleted"], {"incomes": [], "expenses": [], "budgets": [doomed_id]})
+
+		# Nothing changed since: only the log is read and the cursor stays put.
+		with self.assertNumQueries(2):
+			again = self.client.get(url, {"since": body["token"]}).json()
+		self.assertEqual((again["incomes"], again["expenses"], again["budgets"]), ([], [], []))
+
+		self.assertEqual(self.client.get(url, {"since": "not-a-token"}).status_code, status.HTTP_400_BAD_REQUEST)
+		expired = issue_token(0, timezone.now() - timedelta(days=365))
+		self.assertEqual(self.client.get(url, {"since": expired}).status_code, status.HTTP_410_GONE)
+		legacy = base64.urlsafe_b64encode(b"1:1700000000000000").decode().rstrip("=")
+		self.assertEqual(self.client.get(url, {"since": legacy}).status_code, status.HTTP_410_GONE)
+
+	@override_settings(SYNC_CURSOR_LAG_SECONDS=30)
+	def test_token_does_not_pass_recent_changes(self) -> None:
+		url = reverse("finance-changes")
+		token = self.client.get(url).json()["token"]
+		with self.captureOnCommitCallbacks(execute=True):
+			income = Income.objects.create(user=self.user, source="Job", amount=Decimal("10.00"), date_received=date(2024, 1, 1))
+		first = self.client.get(url, {"since": token}).json()
+		self.assertEqual([row["id"] for row in first["incomes"]], [income.pk])
+		# Entries younger than the lag are sent again rather than skipped over.
+		self.assertEqual([row["id"] for row in self.client.get(url, {"since": first["token"]}).json()["incomes"]], [income.pk])
+
+		SyncChange.objects.update(changed_at=timezone.now() - timedelta(minutes=1))
+		settled = self.client.get(url, {"since": first["token"]}).json()
+		self.assertEqual(self.client.get(url, {"since": settled["token"]}).json()["incomes"], [])
+
+	def test_uncommitted_writes_are_not_logged(self) -> None:
+		url = reverse("finance-changes")
+		token = self.client.get(url).json()["token"]
+		with self.captureOnCommitCallbacks(execute=False):
+			Income.objects.create(user=self.user, source="Job", amount=Decimal("10.00"), date_received=date(2024, 1, 1))
+		self.assertEqual(self.client.get(url, {"since": token}).json()["incomes"], [])
+
+	def test_category_rename_resends_its_expenses(self) -> None:
+		food = Category.objects.create(name="Food")
+		with self.captureOnCommitCallbacks(execute=True):
+			lunch = Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("3.00"), date_spent=date(2024, 1, 3), category=food)
+			Expense.objects.create(user=self.user, merchant="Bus", amount=Decimal("1.00"), date_spent=date(2024, 1, 3))
+		url = reverse("finance-changes")
+		token = self.client.get(url).json()["token"]
+
+		with self.captureOnCommitCallbacks(execute=True):
+			food.save()
+		self.assertEqual(self.client.get(url, {"since": token}).json()["expenses"], [])
+
+		with self.captureOnCommitCallbacks(execute=True):
+			food.name = "Groceries"
+			food.save()
+		body = self.client.get(url, {"since": token}).json()
+		self.assertEqual([(row["id"], row["category_name"]) for row in body["expenses"]], [(lunch.pk, "Groceries")])
+
+	def test_bulk_inserts_are_logged(self) -> None:
+		url = reverse("finance-changes")
+		token = self.client.get(url).json()["token"]
+		with self.captureOnCommitCallbacks(execute=True):
+			response = self.client.post(
+				reverse("income-bulk"),
+				[{"source": "Job", "amount": "10.00", "date_received": "2024-01-01"}] * 3,
+				format="json",
+			)
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(len(self.client.get(url, {"since": token}).json()["incomes"]), 3)
+
+
+class ConditionalGetTests(FinanceTestCase):
+	"""ETag revalidation of finance reads."""
+
+	def test_conditional_get_returns_304_until_data_changes(self) -> None:
+		Income.objects.create(user=self.user, source="Job", amount=Decimal("10.00"), date_received=date.today())
+		summary_url = reverse("finance-summary-list")
+		income_url = reverse("income-list")
+		summary_etag = self.client.get(summary_url)["ETag"]
+		income_etag = self.client.get(income_url)["ETag"]
+
+		with self.assertNumQueries(1):
+			response = self.client.get(summary_url, HTTP_IF_NONE_MATCH=summary_etag)
+		self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+		self.assertEqual(response["ETag"], summary_etag)
+		self.assertEqual(self.client.get(income_url, HTTP_IF_NONE_MATCH=f'"other", {income_etag}').status_code, 304)
+		self.assertEqual(self.client.get(income_url, {"page_size": 1}, HTTP_IF_NONE_MATCH=income_etag).status_code, 200)
+
+		with self.captureOnCommitCallbacks(execute=True):
+			Expense.objects.create(user=self.user, merchant="Cafe", amount=Decimal("2.00"), date_spent=date.today())
+		self.assertEqual(self.client.get(summary_url, HTTP_IF_NONE_MATCH=summary_etag).status_code, status.HTTP_200_OK)
+		self.assertEqual(self.client.get(income_url, HTTP_IF_NONE_MATCH=income_etag).status_code, status.HTTP_200_OK)
+
+
+class MonthlyRollupTests(TestCase):
+	"""Ensure rollups follow income and expense writes."""
+
+	def setUp(self) -> None:
+		self.user = User.objects.create_user(email="rollup@example.com", password="password123", username="rollup")
+		self.food = Category.objects.create(name="Food")
+		self.rent = Category.objects.create(name="Rent")
+
+	def _expense_totals(self) -> dict[tuple[date, int | None], tuple[Decimal, int]]:
+		return {
+			(row.month, row.category_id): (row.total, row.entry_count)
+			for row in MonthlyExpenseRollup.objects.filter(user=self.user)
+		}
+
+	def test_expense_changes_move_between_months_and_categories(self) -> None:
+		expense = Expense.objects.create(
+			user=self.user, merchant="Market", amount=Decimal("12.50"), date_spent=date(2024, 3, 5), category=self.food
+		)
+		Expense.objects.create(
+			user=self.user, merchant="Cafe", amount=Decimal("7.50"), date_spent=date(2024, 3, 9), category=self.food
+		)
+		self.assertEqual(self._expense_totals(), {(date(2024, 3, 1), self.food.id): (Decimal("20.00"), 2)})
+
+		expense.amount = Decimal("15.00")
+		expense.date_spent = date(2024, 4, 2)
+		expense.category = self.rent
+		expense.save()
+		self.assertEqual(
+			self._expense_totals(),
+			{
+				(date(2024, 3, 1), self.food.id): (Decimal("7.50"), 1),
+				(date(2024, 4, 1), self.rent.id): (Decimal("15.00"), 1),
+			},
+		)
+
+		expense.delete()
+		self.assertEqual(self._expense_totals(), {(date(2024, 3, 1), self.food.id): (Decimal("7.50"), 1)})
+
+	def test_income_source_change_updates_rollup(self) -> None:
+		income = Income.objects.create(user=self.user, source="Job", amount=Decimal("100.00"), date_received=date(2024, 5, 1))
+		income.source = "Stipend"
+		income.save()
+		rows = list(MonthlyIncomeRollup.objects.filter(user=self.user).values_list("source", "total", "entry_count"))
+		self.assertEqual(rows, [("Stipend", Decimal("100.00"), 1)])
+
+	def test_rebuild_command_repairs_drift(self) -> None:
+		Income.objects.create(user=self.user, source="Job", amount=Decimal("40.00"), date_received=date(2024, 5, 3))
+		Expense.objects.create(
+			user=self.user, merchant="Cafe", amount=Decimal("9.00"), date_spent=date(2024, 5, 4), category=self.food
+		)
+		MonthlyIncomeRollup.objects.update(total=Decimal("1.00"))
+		MonthlyExpenseRollup.objects.all().delete()
+
+		call_command("rebuild_finance_rollups", user=[self.user.email], stdout=StringIO())
+
+		income_row = MonthlyIncomeRollup.objects.get(user=self.user)
+		self.assertEqual(income_row.total, Decimal("40.00"))
+		self.assertEqual(self._expense_totals(), {(date(2024, 5, 1), self.food.id): (Decimal("9.00"), 1)})
@@ -4,7 +4,17 @@ from __future__ import annotations
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import BudgetViewSet, CategoryViewSet, ExpenseViewSet, FinanceSummaryViewSet, IncomeViewSet
+from .views import (
+    BudgetViewSet,
+    CategoryViewSet,
+    ExpenseViewSet,
+    FinanceSummaryViewSet,
+    IncomeViewSet,
+    RecurringTransactionViewSet,
+    SyncChangesView,
+    TransactionExportView,
+    TransactionImportView,
+)
 
 router = DefaultRouter()
 router.register(r"incomes", IncomeViewSet, basename="income")
@@ -12,7 +22,11 @@ router.register(r"expenses", ExpenseViewSet, basename="expense")
 router.register(r"budgets", BudgetViewSet, basename="budget")
 router.register(r"summary", FinanceSummaryViewSet, basename="finance-summary")
 router.register(r"categories", CategoryViewSet, basename="category")
+router.register(r"recurring", RecurringTransactionViewSet, basename="recurring-transaction")
 
 urlpatterns = [
+    path("export/", TransactionExportView.as_view(), name="finance-export"),
+    path("import/", TransactionImportView.as_view(), name="finance-import"),
+    path("changes/", SyncChangesView.as_view(), name="finance-changes"),
     path("", include(router.urls)),
 ]
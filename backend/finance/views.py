@@ -2,34 +2,74 @@
 
 from __future__ import annotations
 
+import io
+import math
 from datetime import date
 from decimal import Decimal
+from fractions import Fraction
 from typing import cast
 
-from django.db.models import Q, QuerySet, Sum
+from django.db.models import QuerySet, Sum
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status, viewsets
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.decorators import action
-
-from .models import Budget, Category, Expense, Income
+from rest_framework.views import APIView
+
+from core.cache import cache_stats, cached_response
+from core.conditional import ConditionalGetMixin
+
+from .analytics import DEFAULT_SERIES_DAYS, DEFAULT_Z_THRESHOLD, MAX_SERIES_DAYS, spending_analytics
+from .bulk import MAX_BULK_ITEMS, bulk_create_expenses, bulk_create_incomes
+from .catalog import catalog
+from .export import EXPORT_FORMATS, stream_export, transaction_rows
+from .forecast import (
+	DEFAULT_CONFIDENCE,
+	DEFAULT_HISTORY,
+	DEFAULT_HORIZON,
+	MAX_HISTORY,
+	MAX_HORIZON,
+	METHODS as FORECAST_METHODS,
+	cash_flow_forecast,
+)
+from .importer import DEFAULT_DATE_FORMAT, StatementFormatError, import_statement
+from .institution import CACHE_TIMEOUT as DEPARTMENT_CACHE_TIMEOUT, SCOPE as DEPARTMENT_SCOPE, department_cube
+from .models import Budget, Category, Expense, Income, MonthlyExpenseRollup, MonthlyIncomeRollup, RecurringTransaction
+from .recurring import realign
 from .serializers import (
 	BudgetSerializer,
+	BudgetUtilizationSerializer,
+	BulkCreateRequestSerializer,
 	CategorySerializer,
 	ExpenseSerializer,
 	FinanceDashboardSummarySerializer,
 	FinanceSummarySerializer,
 	IncomeSerializer,
+	RecurringTransactionSerializer,
 )
+from .search import EXPENSE_SEARCH, INCOME_SEARCH, SearchSpec, search_queryset
+from .summary import GRANULARITIES, MAX_BUCKETS, bucket_label, bucket_start, bucket_totals, dashboard_totals, shift_bucket
+from .sync import SyncTokenExpired, changes_since, parse_token
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
 
 
-class IncomeViewSet(viewsets.ModelViewSet[Income]):
+class IncomeViewSet(ConditionalGetMixin, viewsets.ModelViewSet[Income]):
 	"""Manage income records for authenticated users."""
 
 	serializer_class = IncomeSerializer
 	permission_classes = [IsAuthenticated]
+	etag_scopes = ("finance",)
+	etag_staff_sees_all = True
+	keyset_ordering = ("-date_received", "-created_at", "-id")
 
 	def _is_admin(self) -> bool:
 		user = self.request.user
@@ -48,18 +88,34 @@ class IncomeViewSet(viewsets.ModelViewSet[Income]):
 		if end_date:
 			queryset = queryset.filter(date_received__lte=end_date)
 		if search_term:
-			queryset = queryset.filter(Q(source__icontains=search_term) | Q(notes__icontains=search_term))
-		return queryset.order_by("-date_received", "-created_at")
+			queryset = search_queryset(queryset, INCOME_SEARCH, search_term)
+		return queryset.order_by(*self.keyset_ordering)
 
 	def perform_create(self, serializer: IncomeSerializer) -> None:
 		serializer.save(user=self.request.user)
 
+	@action(detail=False, methods=["get"], url_path="search")
+	def search(self, request: Request) -> Response:
+		"""Return incomes ranked by relevance to the ``q`` prefix search."""
+
+		return _ranked_search(self, INCOME_SEARCH, request)
+
+	@action(detail=False, methods=["post"], url_path="bulk")
+	def bulk(self, request: Request) -> Response:
+		"""Create many incomes in one transaction."""
 
-class ExpenseViewSet(viewsets.ModelViewSet[Expense]):
+		return _bulk_response(request, bulk_create_incomes)
+
+
+class ExpenseViewSet(ConditionalGetMixin, viewsets.ModelViewSet[Expense]):
 	"""Manage expense records for authenticated users."""
 
 	serializer_class = ExpenseSerializer
 	permission_classes = [IsAuthenticated]
+	etag_scopes = ("finance",)
+	etag_global_scopes = ("categories",)
+	etag_staff_sees_all = True
+	keyset_ordering = ("-date_spent", "-created_at", "-id")
 
 	def _is_admin(self) -> bool:
 		user = self.request.user
@@ -78,18 +134,33 @@ class ExpenseViewSet(viewsets.ModelViewSet[Expense]):
 		if end_date:
 			queryset = queryset.filter(date_spent__lte=end_date)
 		if search_term:
-			queryset = queryset.filter(Q(merchant__icontains=search_term) | Q(notes__icontains=search_term))
-		return queryset.order_by("-date_spent", "-created_at")
+			queryset = search_queryset(queryset, EXPENSE_SEARCH, search_term)
+		return queryset.order_by(*self.keyset_ordering)
 
 	def perform_create(self, serializer: ExpenseSerializer) -> None:
 		serializer.save(user=self.request.user)
 
+	@action(detail=False, methods=["get"], url_path="search")
+	def search(self, request: Request) -> Response:
+		"""Return expenses ranked by relevance to the ``q`` prefix search."""
+
+		return _ranked_search(self, EXPENSE_SEARCH, request)
+
+	@action(detail=False, methods=["post"], url_path="bulk")
+	def bulk(self, request: Request) -> Response:
+		"""Create many expenses in one transaction."""
 
-class BudgetViewSet(viewsets.ModelViewSet[Budget]):
+		return _bulk_response(request, bulk_create_expenses)
+
+
+class BudgetViewSet(ConditionalGetMixin, viewsets.ModelViewSet[Budget]):
 	"""Manage budgets for authenticated students."""
 
 	serializer_class = BudgetSerializer
 	permission_classes = [IsAuthenticated]
+	etag_scopes = ("finance",)
+	etag_staff_sees_all = True
+	keyset_ordering = ("-period_start", "-id")
 
 	def _is_admin(self) -> bool:
 		user = self.request.user
@@ -103,12 +174,58 @@ class BudgetViewSet(viewsets.ModelViewSet[Budget]):
 	def perform_create(self, serializer: BudgetSerializer) -> None:
 		serializer.save(user=self.request.user)
 
+	@action(detail=False, methods=["get"], url_path="utilization")
+	def utilization(self, request: Request) -> Response:
+		"""Return spent, remaining and percent used for every budget in one query."""
+
+		queryset = self.filter_queryset(self.get_queryset()).with_utilization()
+		page = self.paginate_queryset(queryset)
+		if page is not None:
+			return self.get_paginated_response(BudgetUtilizationSerializer(page, many=True).data)
+		return Response(BudgetUtilizationSerializer(queryset, many=True).data)
+
 
-class CategoryViewSet(viewsets.ModelViewSet[Category]):
+class RecurringTransactionViewSet(ConditionalGetMixin, viewsets.ModelViewSet[RecurringTransaction]):
+	"""Manage the user's recurring incomes and expenses.
+
+	Occurrences are created by ``finance.tasks.materialize_recurring_transactions``.
+	"""
+
+	serializer_class = RecurringTransactionSerializer
+	permission_classes = [IsAuthenticated]
+	etag_scopes = ("finance",)
+	keyset_ordering = ("next_occurrence", "id")
+	schedule_fields = ("frequency", "interval", "start_date")
+
+	def get_queryset(self) -> QuerySet[RecurringTransaction]:
+		return RecurringTransaction.objects.filter(user=self.request.user)
+
+	def perform_create(self, serializer: RecurringTransactionSerializer) -> None:
+		serializer.save(user=self.request.user, next_occurrence=serializer.validated_data["start_date"])
+
+	def perform_update(self, serializer: RecurringTransactionSerializer) -> None:
+		previous = {name: getattr(serializer.instance, name) for name in self.schedule_fields}
+		was_active = serializer.instance.is_active
+		rule = serializer.save()
+		if rule.is_active and not was_active:
+			# Resuming a paused rule starts from today: occurrences missed while
+			# it was paused are not back-filled.
+			rule.next_occurrence = realign(rule, not_before=timezone.localdate())
+			rule.save(update_fields=["next_occurrence"])
+		elif any(getattr(rule, name) != value for name, value in previous.items()):
+			# Re-anchor on the new schedule without back-filling dates already past.
+			rule.next_occurrence = realign(rule)
+			rule.save(update_fields=["next_occurrence"])
+
+
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet[Category]):
 	"""Manage expense categories."""
 
 	serializer_class = CategorySerializer
 	permission_classes = [IsAuthenticated]
+	etag_global_scopes = ("categories",)
+	keyset_ordering = ("name",)
+	search_fields = ("name",)
 
 	def get_permissions(self):
 		if self.action in {"create", "update", "partial_update", "destroy"}:
@@ -118,12 +235,49 @@ class CategoryViewSet(viewsets.ModelViewSet[Category]):
 	def get_queryset(self) -> QuerySet[Category]:
 		return Category.objects.all()
 
+	def list(self, request: Request, *args: object, **kwargs: object) -> Response:
+		"""Serve the first page straight from the category catalog when it fits.
+
+		Searches and custom orderings go through the regular filter backends.
+		"""
+
+		paginator = self.paginator
+		params = request.query_params
+		if any(params.get(param) for param in (api_settings.SEARCH_PARAM, api_settings.ORDERING_PARAM)):
+			return super().list(request, *args, **kwargs)
+		rows = catalog.rows()
+		legacy = params.get(paginator.legacy_query_param, "").lower() in {"false", "0", "no"}
+		default_page = not any(
+			param in params
+			for param in (paginator.cursor_query_param, paginator.page_size_query_param)
+		)
+		if legacy or (default_page and len(rows) <= paginator.page_size):
+			data = CategorySerializer(rows, many=True).data
+			if legacy:
+				return Response(data)
+			return Response({"next": None, "previous": None, "results": data})
+		return super().list(request, *args, **kwargs)
 
-class FinanceSummaryViewSet(viewsets.ViewSet):
+
+class FinanceSummaryViewSet(ConditionalGetMixin, viewsets.ViewSet):
 	"""Provides a summary endpoint for incomes and expenses."""
 
 	permission_classes = [IsAuthenticated]
-
+	etag_scopes = ("finance",)
+	etag_global_scopes = ("categories",)
+	etag_exempt_actions = ("departments", "response_cache_stats")
+	cached_endpoints = (
+		"summary",
+		"trends",
+		"forecast",
+		"analytics",
+		"expenses-by-category",
+		"expenses-category-breakdown",
+		"incomes-by-category",
+		"departments",
+	)
+
+	@cached_response("summary")
 	def list(self, request: Request) -> Response:
 		today = timezone.now().date()
 		current_month_start = today.replace(day=1)
@@ -144,47 +298,22 @@ class FinanceSummaryViewSet(viewsets.ViewSet):
 				status=status.HTTP_400_BAD_REQUEST,
 			)
 
-		income_qs = Income.objects.filter(user=request.user)
-		expense_qs = Expense.objects.filter(user=request.user)
-		if start_date:
-			income_qs = income_qs.filter(date_received__gte=start_date)
-			expense_qs = expense_qs.filter(date_spent__gte=start_date)
-		if end_date:
-			income_qs = income_qs.filter(date_received__lte=end_date)
-			expense_qs = expense_qs.filter(date_spent__lte=end_date)
-
-		income_total_raw = income_qs.aggregate(total=Sum("amount"))
-		expense_total_raw = expense_qs.aggregate(total=Sum("amount"))
-		total_income = income_total_raw["total"] or Decimal("0.00")
-		total_expense = expense_total_raw["total"] or Decimal("0.00")
+		totals = dashboard_totals(
+			request.user,
+			current_month_start=current_month_start,
+			previous_month_start=previous_month_start,
+			next_month_start=next_month_start,
+			start_date=start_date,
+			end_date=end_date,
+		)
+		total_income = totals.total_income
+		total_expense = totals.total_expense
 		net_balance = total_income - total_expense
-
-		income_current_month = Income.objects.filter(
-			user=request.user,
-			date_received__gte=current_month_start,
-			date_received__lt=next_month_start,
-		).aggregate(total=Sum("amount"))
-		expense_current_month = Expense.objects.filter(
-			user=request.user,
-			date_spent__gte=current_month_start,
-			date_spent__lt=next_month_start,
-		).aggregate(total=Sum("amount"))
-		current_income = income_current_month["total"] or Decimal("0.00")
-		current_expense = expense_current_month["total"] or Decimal("0.00")
+		current_income = totals.current_income
+		current_expense = totals.current_expense
 		current_balance = current_income - current_expense
-
-		income_previous_month = Income.objects.filter(
-			user=request.user,
-			date_received__gte=previous_month_start,
-			date_received__lt=current_month_start,
-		).aggregate(total=Sum("amount"))
-		expense_previous_month = Expense.objects.filter(
-			user=request.user,
-			date_spent__gte=previous_month_start,
-			date_spent__lt=current_month_start,
-		).aggregate(total=Sum("amount"))
-		previous_income = income_previous_month["total"] or Decimal("0.00")
-		previous_expense = expense_previous_month["total"] or Decimal("0.00")
+		previous_income = totals.previous_income
+		previous_expense = totals.previous_expense
 		previous_balance = previous_income - previous_expense
 
 		income_change = _percent_change(current_income, previous_income)
@@ -207,79 +336,114 @@ class FinanceSummaryViewSet(viewsets.ViewSet):
 		return Response(serializer.data)
 
 	@action(detail=False, methods=["get"], url_path="trends")
+	@cached_response("trends")
 	def trends(self, request: Request) -> Response:
-		"""Return income vs expense trend for previous months."""
+		"""Return income vs expense trend for previous weeks, months or quarters."""
 
+		granularity = request.query_params.get("granularity", "month")
+		if granularity not in GRANULARITIES:
+			return Response(
+				{"detail": f"Unsupported granularity. Use one of: {', '.join(GRANULARITIES)}."},
+				status=status.HTTP_400_BAD_REQUEST,
+			)
 		today = timezone.now().date()
-		current_month_start = today.replace(day=1)
+		current_bucket = bucket_start(today, granularity)
 		window_param = request.query_params.get("window", "6m")
-		window_months = _parse_window(window_param)
+		window = _parse_window(window_param, granularity)
 		include_current = request.query_params.get("include_current", "true").lower() != "false"
-		results: list[dict[str, object]] = []
 
-		start_offset = -(window_months - 1) if include_current and window_months > 0 else -window_months
+		start_offset = -(window - 1) if include_current and window > 0 else -window
 		end_offset = 1 if include_current else 0
+		income_totals, expense_totals = bucket_totals(
+			request.user,
+			granularity,
+			shift_bucket(current_bucket, granularity, start_offset),
+			shift_bucket(current_bucket, granularity, end_offset),
+		)
 
+		results: list[dict[str, object]] = []
 		for offset in range(start_offset, end_offset):
-			month_start = _shift_month(current_month_start, offset)
-			next_month = _shift_month(month_start, 1)
-			month_income = Income.objects.filter(
-				user=request.user,
-				date_received__gte=month_start,
-				date_received__lt=next_month,
-			).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-			month_expense = Expense.objects.filter(
-				user=request.user,
-				date_spent__gte=month_start,
-				date_spent__lt=next_month,
-			).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-			results.append(
-				{
-					"month": month_start.strftime("%b %Y"),
-					"income": month_income,
-					"expense": month_expense,
-				}
-			)
+			period_start = shift_bucket(current_bucket, granularity, offset)
+			entry: dict[str, object] = {
+				"period": bucket_label(period_start, granularity),
+				"period_start": period_start,
+				"income": income_totals.get(period_start, Decimal("0.00")),
+				"expense": expense_totals.get(period_start, Decimal("0.00")),
+			}
+			if granularity == "month":
+				entry["month"] = entry["period"]
+			results.append(entry)
 
-		return Response({"results": results})
+		return Response({"granularity": granularity, "results": results})
+
+	@action(detail=False, methods=["get"], url_path="forecast")
+	@cached_response("forecast")
+	def forecast(self, request: Request) -> Response:
+		"""Project income, expense and balance for the coming months with confidence bands."""
+
+		method = request.query_params.get("method", "holt")
+		if method not in FORECAST_METHODS:
+			return Response(
+				{"detail": f"Unsupported method. Use one of: {', '.join(FORECAST_METHODS)}."},
+				status=status.HTTP_400_BAD_REQUEST,
+			)
+		try:
+			horizon = int(request.query_params.get("months", DEFAULT_HORIZON))
+			confidence = float(request.query_params.get("confidence", DEFAULT_CONFIDENCE))
+		except ValueError:
+			return Response({"detail": "months and confidence must be numbers."}, status=status.HTTP_400_BAD_REQUEST)
+		if not 0.5 <= confidence < 1:
+			return Response({"detail": "confidence must be between 0.5 and 1."}, status=status.HTTP_400_BAD_REQUEST)
+		horizon = max(1, min(horizon, MAX_HORIZON))
+		history = DEFAULT_HISTORY
+		if "history" in request.query_params:
+			history = min(_parse_window(request.query_params["history"], "month"), MAX_HISTORY)
+
+		current_month = timezone.now().date().replace(day=1)
+		payload = cash_flow_forecast(
+			request.user,
+			current_month=current_month,
+			history_months=[_shift_month(current_month, offset) for offset in range(-history, 0)],
+			future_months=[_shift_month(current_month, offset) for offset in range(1, horizon + 1)],
+			method=method,
+			confidence=confidence,
+		)
+		return Response(payload)
 
 	@action(detail=False, methods=["get"], url_path="expenses/by-category")
+	@cached_response("expenses-by-category", global_scopes=("categories",))
 	def expenses_by_category(self, request: Request) -> Response:
 		"""Summarise expenses by category."""
 
 		period = request.query_params.get("period", "current_month")
 		today = timezone.now().date()
 		current_month_start = today.replace(day=1)
-		queryset = Expense.objects.filter(user=request.user)
+		queryset = MonthlyExpenseRollup.objects.filter(user=request.user)
 
 		if period == "current_month":
-			next_month_start = _shift_month(current_month_start, 1)
-			queryset = queryset.filter(date_spent__gte=current_month_start, date_spent__lt=next_month_start)
+			queryset = queryset.filter(month=current_month_start)
 		elif period == "last_6_months":
 			six_months_ago = _shift_month(current_month_start, -6)
-			queryset = queryset.filter(date_spent__gte=six_months_ago, date_spent__lt=current_month_start)
+			queryset = queryset.filter(month__gte=six_months_ago, month__lt=current_month_start)
 		elif period == "previous_month":
-			previous_month_start = _shift_month(current_month_start, -1)
-			queryset = queryset.filter(date_spent__gte=previous_month_start, date_spent__lt=current_month_start)
+			queryset = queryset.filter(month=_shift_month(current_month_start, -1))
 
-		category_totals = (
-			queryset
-			.values("category", "category__name")
-			.annotate(total=Sum("amount"))
-			.order_by("category__name")
+		category_totals = queryset.values("category").annotate(amount=Sum("total")).order_by()
+		names = catalog.names()
+		results = _sorted_by_category(
+			[
+				{
+					"category_id": entry["category"],
+					"category": names.get(entry["category"], "Uncategorised"),
+					"amount": entry["amount"] or Decimal("0.00"),
+				}
+				for entry in category_totals
+			]
 		)
-
-		results = [
-			{
-				"category_id": entry["category"],
-				"category": entry["category__name"] or "Uncategorised",
-				"amount": entry["total"] or Decimal("0.00"),
-			}
-			for entry in category_totals
-		]
 		return Response({"results": results})
 
 	@action(detail=False, methods=["get"], url_path="expenses/category-breakdown")
+	@cached_response("expenses-category-breakdown", global_scopes=("categories",))
 	def expenses_category_breakdown(self, request: Request) -> Response:
 		"""Return monthly expense breakdown per category for visual summaries."""
 
@@ -297,34 +461,60 @@ class FinanceSummaryViewSet(viewsets.ViewSet):
 			if not month_param:
 				return Response({"detail": "month parameter is required for mode=month."}, status=status.HTTP_400_BAD_REQUEST)
 			try:
-				year, month = map(int, month_param.split("-"))
-				month_starts = [date(year, month, 1)]
+				month_starts = [_parse_month(month_param)]
 			except ValueError:
 				return Response({"detail": "Invalid month format. Use YYYY-MM."}, status=status.HTTP_400_BAD_REQUEST)
+		elif mode == "range":
+			start_param = request.query_params.get("start")
+			end_param = request.query_params.get("end")
+			if not start_param or not end_param:
+				return Response(
+					{"detail": "start and end parameters are required for mode=range."},
+					status=status.HTTP_400_BAD_REQUEST,
+				)
+			try:
+				range_start = _parse_month(start_param)
+				range_end = _parse_month(end_param)
+			except ValueError:
+				return Response({"detail": "Invalid month format. Use YYYY-MM."}, status=status.HTTP_400_BAD_REQUEST)
+			span = (range_end.year - range_start.year) * 12 + range_end.month - range_start.month + 1
+			if span < 1:
+				return Response({"detail": "End month must not be before start month."}, status=status.HTTP_400_BAD_REQUEST)
+			if span > MAX_BUCKETS["month"]:
+				return Response(
+					{"detail": f"Range may span at most {MAX_BUCKETS['month']} months."},
+					status=status.HTTP_400_BAD_REQUEST,
+				)
+			month_starts = [_shift_month(range_start, offset) for offset in range(span)]
 		else:
 			return Response({"detail": "Unsupported mode."}, status=status.HTTP_400_BAD_REQUEST)
 
-		series: list[dict[str, object]] = []
-		for month_start in month_starts:
-			next_month = _shift_month(month_start, 1)
-			monthly_queryset = (
-				Expense.objects.filter(
-					user=request.user,
-					date_spent__gte=month_start,
-					date_spent__lt=next_month,
-				)
-				.values("category", "category__name")
-				.annotate(total=Sum("amount"))
-				.order_by("category__name")
+		rows = (
+			MonthlyExpenseRollup.objects.filter(
+				user=request.user,
+				month__gte=month_starts[0],
+				month__lt=_shift_month(month_starts[-1], 1),
 			)
-			categories = [
+			.values("month", "category")
+			.annotate(amount=Sum("total"))
+			.order_by()
+		)
+		names = catalog.names()
+		categories_by_month: dict[date, list[dict[str, object]]] = {}
+		for entry in rows:
+			categories_by_month.setdefault(entry["month"], []).append(
 				{
 					"category_id": entry["category"],
-					"category": entry["category__name"] or "Uncategorised",
-					"amount": entry["total"] or Decimal("0.00"),
+					"category": names.get(entry["category"], "Uncategorised"),
+					"amount": entry["amount"] or Decimal("0.00"),
 				}
-				for entry in monthly_queryset
-			]
+			)
+		for month_categories in categories_by_month.values():
+			month_categories[:] = _sorted_by_category(month_categories)
+
+		series: list[dict[str, object]] = []
+		for month_start in month_starts:
+			categories = categories_by_month.get(month_start, [])
 			total = sum(item["amount"] for item in categories) if categories else Decimal("0.00")
 			series.append(
 				{
@@ -338,40 +528,233 @@ class FinanceSummaryViewSet(viewsets.ViewSet):
 		return Response({"mode": mode, "series": series})
 
 	@action(detail=False, methods=["get"], url_path="incomes/by-category")
+	@cached_response("incomes-by-category")
 	def incomes_by_category(self, request: Request) -> Response:
 		"""Summarise incomes by source (category equivalent)."""
 
 		period = request.query_params.get("period", "all")
 		today = timezone.now().date()
 		current_month_start = today.replace(day=1)
-		queryset = Income.objects.filter(user=request.user)
+		queryset = MonthlyIncomeRollup.objects.filter(user=request.user)
 
 		if period == "current_month":
-			next_month_start = _shift_month(current_month_start, 1)
-			queryset = queryset.filter(date_received__gte=current_month_start, date_received__lt=next_month_start)
+			queryset = queryset.filter(month=current_month_start)
 		elif period == "last_6_months":
 			six_months_ago = _shift_month(current_month_start, -6)
-			queryset = queryset.filter(date_received__gte=six_months_ago, date_received__lt=current_month_start)
+			queryset = queryset.filter(month__gte=six_months_ago, month__lt=current_month_start)
 		elif period == "previous_month":
-			previous_month_start = _shift_month(current_month_start, -1)
-			queryset = queryset.filter(date_received__gte=previous_month_start, date_received__lt=current_month_start)
+			queryset = queryset.filter(month=_shift_month(current_month_start, -1))
 
 		results = (
 			queryset
 			.values("source")
-			.annotate(total=Sum("amount"))
+			.annotate(amount=Sum("total"))
 			.order_by("source")
 		)
 
 		payload = [
 			{
 				"category": entry["source"] or "Uncategorised",
-				"amount": entry["total"] or Decimal("0.00"),
+				"amount": entry["amount"] or Decimal("0.00"),
 			}
 			for entry in results
 		]
 		return Response({"results": payload})
 
+	@action(detail=False, methods=["get"], url_path="analytics")
+	@cached_response("analytics", global_scopes=("categories",))
+	def analytics(self, request: Request) -> Response:
+		"""Return rolling spend, per-category spread and outlier expenses."""
+
+		try:
+			series_days = int(request.query_params.get("days", DEFAULT_SERIES_DAYS))
+			threshold = float(request.query_params.get("threshold", DEFAULT_Z_THRESHOLD))
+		except ValueError:
+			return Response({"detail": "days must be an integer and threshold a number."}, status=status.HTTP_400_BAD_REQUEST)
+		if not math.isfinite(threshold) or threshold <= 0:
+			return Response({"detail": "threshold must be a positive number."}, status=status.HTTP_400_BAD_REQUEST)
+		payload = spending_analytics(
+			request.user,
+			end=timezone.localdate(),
+			series_days=max(1, min(series_days, MAX_SERIES_DAYS)),
+			threshold=threshold,
+			category_names=catalog.names(),
+		)
+		return Response(payload)
+
+	@action(
+		detail=False,
+		methods=["get"],
+		url_path="departments",
+		permission_classes=[IsAuthenticated, IsAdminUser],
+	)
+	@cached_response(
+		"departments",
+		scopes=(),
+		global_scopes=("categories", DEPARTMENT_SCOPE),
+		timeout=DEPARTMENT_CACHE_TIMEOUT,
+		shared=True,
+	)
+	def departments(self, request: Request) -> Response:
+		"""Return institution-wide income/expense/net by department, month and category."""
+
+		window = _parse_window(request.query_params.get("window", "12m"), "month")
+		current_month = timezone.now().date().replace(day=1)
+		department = request.query_params.get("department")
+		payload = department_cube(
+			months=[_shift_month(current_month, offset) for offset in range(-(window - 1), 1)],
+			department=department.strip() if department is not None else None,
+			category_names=catalog.names(),
+		)
+		return Response(payload)
+
+	@action(
+		detail=False,
+		methods=["get"],
+		url_path="cache-stats",
+		permission_classes=[IsAuthenticated, IsAdminUser],
+	)
+	def response_cache_stats(self, request: Request) -> Response:
+		"""Report response cache hit/miss counters for the summary endpoints."""
+
+		return Response({"results": cache_stats(list(self.cached_endpoints))})
+
+
+class SyncChangesView(APIView):
+	"""Return incomes, expenses and budgets changed or deleted since a sync token.
+
+	Without ``since`` the full data set is returned. Every response carries the
+	``token`` to send next time.
+	"""
+
+	permission_classes = [IsAuthenticated]
+
+	def get(self, request: Request) -> Response:
+		token = request.query_params.get("since")
+		try:
+			since = parse_token(token) if token else None
+			payload = changes_since(request.user, since)
+		except ValueError as exc:
+			return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+		except SyncTokenExpired:
+			return Response(
+				{"detail": "Sync token expired; request the full data set without 'since'."},
+				status=status.HTTP_410_GONE,
+			)
+		return Response(payload)
+
+
+class _ExportContentNegotiation(DefaultContentNegotiation):
+	"""Ignore ``?format=``, which selects the export format rather than a renderer."""
+
+	def select_renderer(self, request, renderers, format_suffix=None):
+		return renderers[0], renderers[0].media_type
+
+
+class TransactionExportView(APIView):
+	"""Stream the user's incomes and expenses as CSV or NDJSON."""
+
+	permission_classes = [IsAuthenticated]
+	renderer_classes = [JSONRenderer]
+	content_negotiation_class = _ExportContentNegotiation
+	content_types = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+	def get(self, request: Request) -> StreamingHttpResponse | Response:
+		export_format = request.query_params.get("format", "csv").lower()
+		if export_format not in EXPORT_FORMATS:
+			return Response(
+				{"detail": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}."},
+				status=status.HTTP_400_BAD_REQUEST,
+			)
+		start_param = request.query_params.get("start")
+		end_param = request.query_params.get("end")
+		try:
+			start_date = date.fromisoformat(start_param) if start_param else None
+			end_date = date.fromisoformat(end_param) if end_param else None
+		except ValueError:
+			return Response({"detail": "Invalid date format."}, status=status.HTTP_400_BAD_REQUEST)
+		if start_date and end_date and end_date < start_date:
+			return Response(
+				{"detail": "End date must be greater than or equal to start date."},
+				status=status.HTTP_400_BAD_REQUEST,
+			)
+
+		rows = transaction_rows(request.user, start_date, end_date)
+		response = StreamingHttpResponse(stream_export(export_format, rows), content_type=self.content_types[export_format])
+		response["Content-Disposition"] = f'attachment; filename="transactions.{export_format}"'
+		# Let proxies pass chunks through as they are produced.
+		response["X-Accel-Buffering"] = "no"
+		return response
+
+
+class TransactionImportView(APIView):
+	"""Import a bank-statement CSV upload (multipart field ``file``)."""
+
+	permission_classes = [IsAuthenticated]
+	parser_classes = [MultiPartParser]
+
+	def post(self, request: Request) -> Response:
+		upload = request.FILES.get("file")
+		if upload is None:
+			return Response({"detail": "file is required."}, status=status.HTTP_400_BAD_REQUEST)
+		date_format = request.data.get("date_format") or DEFAULT_DATE_FORMAT
+		stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+		try:
+			report = import_statement(request.user, stream, date_format=date_format)
+		except StatementFormatError as exc:
+			return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+		except UnicodeDecodeError:
+			return Response({"detail": "File must be UTF-8 encoded CSV."}, status=status.HTTP_400_BAD_REQUEST)
+		return Response(report.as_dict(), status=status.HTTP_201_CREATED)
+
+
+def _bulk_response(request: Request, create_rows) -> Response:
+	"""Validate a bulk upload envelope and report created ids and per-row errors.
+
+	The body is either a list of rows or ``{"items": [...], "partial": bool}``.
+	Without ``partial`` any invalid row rejects the whole upload.
+	"""
+
+	payload = request.data
+	if isinstance(payload, list):
+		payload = {"items": payload, "partial": request.query_params.get("partial", "false")}
+	envelope = BulkCreateRequestSerializer(data=payload, context={"max_items": MAX_BULK_ITEMS})
+	envelope.is_valid(raise_exception=True)
+	partial = envelope.validated_data["partial"]
+	outcome = create_rows(request.user, envelope.validated_data["items"], partial=partial)
+	if outcome.errors and not partial:
+		return Response({"created": 0, "ids": [], "errors": outcome.errors}, status=status.HTTP_400_BAD_REQUEST)
+	return Response(
+		{
+			"created": len(outcome.created),
+			"ids": [row.pk for row in outcome.created],
+			"errors": outcome.errors,
+		},
+		status=status.HTTP_201_CREATED,
+	)
+
+
+def _ranked_search(view: IncomeViewSet | ExpenseViewSet, spec: SearchSpec, request: Request) -> Response:
+	"""Serialize the best matches for ``?q=`` ordered by search rank."""
+
+	term = request.query_params.get("q", "").strip()
+	if not term:
+		return Response({"detail": "q parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+	try:
+		limit = max(1, min(int(request.query_params.get("limit", SEARCH_LIMIT)), MAX_SEARCH_LIMIT))
+	except ValueError:
+		limit = SEARCH_LIMIT
+	queryset = search_queryset(view.get_queryset(), spec, term, ranked=True)
+	matches = queryset.order_by("-search_rank", *view.keyset_ordering)[:limit]
+	serializer = view.get_serializer(matches, many=True)
+	return Response({"results": serializer.data})
+
+
+def _sorted_by_category(entries: list[dict[str, object]]) -> list[dict[str, object]]:
+	"""Order category totals by name with uncategorised spending first."""
+
+	return sorted(entries, key=lambda entry: (entry["category_id"] is not None, entry["category"]))
+
 
 def _shift_month(reference: date, offset: int) -> date:
 	"""Return the first day of the month offset from reference."""
@@ -382,6 +765,13 @@ def _shift_month(reference: date, offset: int) -> date:
 	return date(year, month, 1)
 
 
+def _parse_month(raw: str) -> date:
+	"""Parse a ``YYYY-MM`` string into the first day of that month."""
+
+	year, month = map(int, raw.split("-"))
+	return date(year, month, 1)
+
+
 def _percent_change(current: Decimal, previous: Decimal) -> Decimal | None:
 	"""Calculate percentage change handling division by zero."""
 
@@ -391,14 +781,24 @@ def _percent_change(current: Decimal, previous: Decimal) -> Decimal | None:
 	return change.quantize(Decimal("0.01"))
 
 
-def _parse_window(raw: str) -> int:
-	"""Parse window parameter like '6m' to integer months."""
+def _parse_window(raw: str, granularity: str = "month") -> int:
+	"""Parse a window like '6m', '2y', '12w' or '8q' into a bucket count.
+
+	Bare numbers count buckets of the requested granularity. The result is
+	rounded up to whole buckets and clamped to ``MAX_BUCKETS``.
+	"""
 
 	try:
-		if raw.endswith("m"):
-			value = int(raw[:-1])
+		raw = (raw or "").strip().lower()
+		if raw and raw[-1] in _WINDOW_UNITS:
+			value = math.ceil(int(raw[:-1]) * _WINDOW_UNITS[raw[-1]] / _WINDOW_UNITS[granularity[0]])
 		else:
 			value = int(raw)
 	except (TypeError, ValueError):
-		value = 6
-	return max(1, min(value, 24))
+		value = _DEFAULT_WINDOWS[granularity]
+	return max(1, min(value, MAX_BUCKETS[granularity]))
+
+
+# Window unit lengths measured in weeks.
+_WINDOW_UNITS = {"w": Fraction(1), "m": Fraction(52, 12), "q": Fraction(13), "y": Fraction(52)}
+_DEFAULT_WINDOWS = {"week": 12, "month": 6, "quarter": 4}
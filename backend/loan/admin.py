@@ -14,8 +14,8 @@ class RepaymentInline(admin.TabularInline):
 
 @admin.register(LoanScheme)
 class LoanSchemeAdmin(admin.ModelAdmin):
-	list_display = ("name", "lender_name", "principal", "interest_rate", "term_months", "is_active")
-	list_filter = ("is_active", "term_months")
+	list_display = ("name", "lender_name", "principal", "interest_rate", "term_months", "schedule_type", "is_active")
+	list_filter = ("is_active", "schedule_type", "term_months")
 	search_fields = ("name", "lender_name")
 	autocomplete_fields = ("created_by",)
 
@@ -28,13 +28,16 @@ class LoanAdmin(admin.ModelAdmin):
 		"principal",
 		"interest_rate",
 		"total_payable",
+		"outstanding_amount",
 		"status",
 		"start_date",
+		"next_due_date",
 		"due_date",
 	)
 	list_filter = ("status", "start_date", "due_date")
 	search_fields = ("user__email", "lender_name")
 	autocomplete_fields = ("user", "scheme")
+	readonly_fields = ("outstanding_amount", "next_due_date", "next_due_amount")
 	inlines = (RepaymentInline,)
 
 
@@ -0,0 +1,71 @@
+"""Reconciliation of the denormalized loan balance columns.
+
+``Loan.outstanding_amount``, ``next_due_date`` and ``next_due_amount`` are
+kept current by ``Loan.activate``, ``Loan.mark_paid`` and
+``Repayment.apply_payment``. Writes that bypass those paths (admin edits, raw
+SQL) can leave them behind; ``reconcile`` recomputes every loan's values from
+its repayments in one grouped query and reports, and optionally repairs, the
+rows that drifted.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import DecimalField, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from core.cache import bump_data_version
+
+from .models import Loan, Repayment
+
+BALANCE_FIELDS = ("outstanding_amount", "next_due_date", "next_due_amount")
+BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Drift:
+    """A loan whose stored balance columns differ from its repayments."""
+
+    loan_id: int
+    stored: tuple[Decimal, date | None, Decimal | None]
+    expected: tuple[Decimal, date | None, Decimal | None]
+
+
+def with_expected_balances(queryset: QuerySet[Loan]) -> QuerySet[Loan]:
+    """Annotate ``expected_*`` values computed from each loan's repayments."""
+
+    zero = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
+    upcoming = Repayment.objects.filter(loan=OuterRef("pk"), status=Repayment.Status.PENDING).order_by("due_date", "id")
+    return queryset.annotate(
+        expected_outstanding=Coalesce(Sum("repayments__amount_due"), zero) - Coalesce(Sum("repayments__paid_amount"), zero),
+        expected_next_due_date=Subquery(upcoming.values("due_date")[:1]),
+        expected_next_due_amount=Subquery(upcoming.values("amount_due")[:1]),
+    )
+
+
+def reconcile(*, fix: bool = True, batch_size: int = BATCH_SIZE) -> list[Drift]:
+    """Compare every loan with its repayments; rewrite drifted rows when ``fix``."""
+
+    drifted: list[Drift] = []
+    stale: list[Loan] = []
+    for loan in with_expected_balances(Loan.objects.order_by("id")).iterator(chunk_size=batch_size):
+        expected = (
+            Decimal(loan.expected_outstanding).quantize(Decimal("0.01")),
+            loan.expected_next_due_date,
+            loan.expected_next_due_amount,
+        )
+        stored = (loan.outstanding_amount, loan.next_due_date, loan.next_due_amount)
+        if stored == expected:
+            continue
+        drifted.append(Drift(loan.id, stored, expected))
+        loan.outstanding_amount, loan.next_due_date, loan.next_due_amount = expected
+        stale.append(loan)
+    if fix and stale:
+        Loan.objects.bulk_update(stale, BALANCE_FIELDS, batch_size=batch_size)
+        # ``bulk_update`` skips the signals that move the loan data versions.
+        for user_id in {loan.user_id for loan in stale}:
+            bump_data_version(user_id, "loan")
+        bump_data_version(None, "loan")
+    return drifted
@@ -0,0 +1,24 @@
+"""Recompute the denormalized loan balance columns and report drift."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from loan.balances import BATCH_SIZE, reconcile
+
+
+class Command(BaseCommand):
+    help = "Compare each loan's stored outstanding amount and next due installment with its repayments."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Loans read and written per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report drifted loans.")
+
+    def handle(self, *args, **options) -> None:
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        drifted = reconcile(fix=not options["dry_run"], batch_size=options["batch_size"])
+        for drift in drifted:
+            self.stdout.write(f"Loan {drift.loan_id}: stored {drift.stored} expected {drift.expected}")
+        verb = "Found" if options["dry_run"] else "Repaired"
+        style = self.style.WARNING if drifted and options["dry_run"] else self.style.SUCCESS
+        self.stdout.write(style(f"{verb} {len(drifted)} loans with drifted balance columns."))
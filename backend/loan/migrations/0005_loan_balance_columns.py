@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:29
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def backfill_balances(apps, schema_editor):
+    Loan = apps.get_model('loan', 'Loan')
+    Repayment = apps.get_model('loan', 'Repayment')
+    loans = {loan.pk: loan for loan in Loan.objects.all()}
+    for loan in loans.values():
+        loan.outstanding_amount = Decimal('0.00')
+    for repayment in Repayment.objects.order_by('loan_id', 'due_date', 'id'):
+        loan = loans[repayment.loan_id]
+        loan.outstanding_amount += repayment.amount_due - repayment.paid_amount
+        if repayment.status == 'pending' and loan.next_due_date is None:
+            loan.next_due_date = repayment.due_date
+            loan.next_due_amount = repayment.amount_due
+    Loan.objects.bulk_update(loans.values(), ['outstanding_amount', 'next_due_date', 'next_due_amount'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0004_rename_loan_loan_scheme_id_status_idx_loan_loan_scheme__ff0287_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='next_due_amount',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='next_due_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='outstanding_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
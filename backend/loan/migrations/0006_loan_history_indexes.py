@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0005_loan_balance_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['-created_at', '-id'], name='loan_loan_created_e66447_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='loan_loan_status_386437_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['scheme', '-created_at', '-id'], name='loan_loan_scheme__c5eadf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='loan_loan_user_id_31a4f9_idx'),
+        ),
+    ]
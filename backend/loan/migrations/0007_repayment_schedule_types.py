@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0006_loan_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='schedule_type',
+            field=models.CharField(choices=[('single', 'Single repayment at maturity'), ('equal_monthly', 'Equal monthly installments'), ('amortized', 'Amortized (reducing balance)'), ('interest_only', 'Interest only, then balloon')], default='single', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='loanscheme',
+            name='schedule_type',
+            field=models.CharField(choices=[('single', 'Single repayment at maturity'), ('equal_monthly', 'Equal monthly installments'), ('amortized', 'Amortized (reducing balance)'), ('interest_only', 'Interest only, then balloon')], default='single', max_length=20),
+        ),
+    ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import date
 from decimal import Decimal
 from typing import Iterable
 
@@ -9,11 +10,21 @@ from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+
+from .schedules import build_schedule, from_cents
+
+
 class LoanScheme(models.Model):
     """Reusable loan templates created by administrators."""
 
+    class ScheduleType(models.TextChoices):
+        SINGLE = "single", "Single repayment at maturity"
+        EQUAL_MONTHLY = "equal_monthly", "Equal monthly installments"
+        AMORTIZED = "amortized", "Amortized (reducing balance)"
+        INTEREST_ONLY = "interest_only", "Interest only, then balloon"
+
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     lender_name = models.CharField(max_length=255)
@@ -29,6 +40,7 @@ class LoanScheme(models.Model):
         help_text="Simple interest rate for the full loan term as a percentage.",
     )
     term_months = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    schedule_type = models.CharField(max_length=20, choices=ScheduleType.choices, default=ScheduleType.SINGLE)
     is_active = models.BooleanField(default=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -93,7 +105,16 @@ class Loan(models.Model):
     )
     start_date = models.DateField(null=True, blank=True)
     due_date = models.DateField(null=True, blank=True)
+    # Denormalized from the repayments; see ``loan.balances``.
+    outstanding_amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+    next_due_date = models.DateField(null=True, blank=True)
+    next_due_amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     term_months = models.PositiveIntegerField()
+    schedule_type = models.CharField(
+        max_length=20,
+        choices=LoanScheme.ScheduleType.choices,
+        default=LoanScheme.ScheduleType.SINGLE,
+    )
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     notes = models.TextField(blank=True)
     applied_at = models.DateTimeField(auto_now_add=True)
@@ -109,33 +130,48 @@ class Loan(models.Model):
             models.Index(fields=["user", "status"]),
             models.Index(fields=["scheme", "status"]),
             models.Index(fields=["start_date"]),
+            # Keyset pages of the admin history, unfiltered and per filter.
+            models.Index(fields=["-created_at", "-id"]),
+            models.Index(fields=["status", "-created_at", "-id"]),
+            models.Index(fields=["scheme", "-created_at", "-id"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
         ]
 
     def __str__(self) -> str:
         return f"Loan {self.principal} for {self.user}"  # pragma: no cover - human readable only
 
+    def repayment_list(self) -> list["Repayment"]:
+        """Repayments ordered by due date, read from the prefetch cache when present."""
+
+        return sorted(self.repayments.all(), key=lambda repayment: (repayment.due_date, repayment.pk or 0))
+
+    def pending_repayment(self, on_or_after: date | None = None) -> "Repayment" | None:
+        """Earliest pending repayment, optionally due on or after ``on_or_after``."""
+
+        for repayment in self.repayment_list():
+            if repayment.status != Repayment.Status.PENDING:
+                continue
+            if on_or_after is None or repayment.due_date >= on_or_after:
+                return repayment
+        return None
+
     @property
     def outstanding_balance(self) -> Decimal:
         """Return outstanding balance based on repayments."""
 
-        total_due = self.repayments.aggregate(total=models.Sum("amount_due"))  # type: ignore[arg-type]
-        total_paid = self.repayments.aggregate(total=models.Sum("paid_amount"))  # type: ignore[arg-type]
-        due = total_due["total"] or Decimal("0.00")
-        paid = total_paid["total"] or Decimal("0.00")
+        repayments = self.repayment_list()
+        due = sum((repayment.amount_due for repayment in repayments), Decimal("0.00"))
+        paid = sum((repayment.paid_amount for repayment in repayments), Decimal("0.00"))
         return (due - paid).quantize(Decimal("0.01"))
 
     @property
     def next_due(self) -> tuple[Decimal, "Repayment" | None]:
         """Return the next repayment amount and instance."""
 
-        repayment = self.repayments.filter(status=Repayment.Status.PENDING).order_by("due_date").first()
+        repayment = self.pending_repayment()
         if not repayment:
             return Decimal("0.00"), None
-        today = timezone.now().date()
-        amount = repayment.amount_due
-        if repayment.due_date and today >= repayment.due_date:
-            return amount, repayment
-        return amount, repayment
+        return repayment.amount_due, repayment
 
     def clean(self) -> None:
         if self.principal <= 0:
@@ -146,13 +182,26 @@ class Loan(models.Model):
             raise ValidationError("Total payable cannot be less than the principal amount.")
 
     def generate_repayment_schedule(self) -> Iterable["Repayment"]:
-        """Generate a single repayment covering the full amount due."""
+        """Generate the repayments of the loan's schedule type.
+
+        Single-repayment loans get one repayment covering the full amount due at
+        maturity; the other types get one installment per month of the term.
+        """
 
         if not self.start_date:
             raise ValidationError("Loan must have a start date to generate a repayment schedule.")
 
         maturity_date = self.start_date + relativedelta(months=self.term_months)
         self.due_date = maturity_date
+        if self.schedule_type != LoanScheme.ScheduleType.SINGLE:
+            plan = build_schedule(self.schedule_type, self.principal, self.interest_rate, self.term_months, self.start_date)
+            self.interest_amount = from_cents(plan.interest)
+            self.total_payable = from_cents(plan.total)
+            return [
+                Repayment(loan=self, amount_due=from_cents(cents), due_date=due_date, status=Repayment.Status.PENDING)
+                for cents, due_date in zip(plan.amounts.tolist(), plan.due_dates)
+            ]
+
         interest_raw = (self.principal * (self.interest_rate / Decimal("100")))
         self.interest_amount = interest_raw.quantize(Decimal("0.01"))
         total_due = (self.principal + self.interest_amount).quantize(Decimal("0.01"))
@@ -175,18 +224,27 @@ class Loan(models.Model):
         schedule = list(self.generate_repayment_schedule())
         self.status = self.Status.ACTIVE
         self.approved_at = timezone.now()
+        self.outstanding_amount = sum((repayment.amount_due for repayment in schedule), Decimal("0.00"))
+        first = min(schedule, key=lambda repayment: repayment.due_date)
+        self.next_due_date = first.due_date
+        self.next_due_amount = first.amount_due
         self.save(update_fields=[
             "status",
             "start_date",
             "due_date",
             "interest_amount",
             "total_payable",
+            "outstanding_amount",
+            "next_due_date",
+            "next_due_amount",
             "approved_at",
             "updated_at",
         ])
         # Remove stale repayments before creating the new schedule
         self.repayments.all().delete()
         Repayment.objects.bulk_create(schedule)
+        # Drop repayments prefetched before the schedule was replaced.
+        getattr(self, "_prefetched_objects_cache", {}).pop("repayments", None)
 
     def mark_declined(self, note: str | None = None) -> None:
         """Decline a pending loan application."""
@@ -199,6 +257,31 @@ class Loan(models.Model):
             self.notes = note
         self.save(update_fields=["status", "declined_at", "notes", "updated_at"])
 
+    def settle(self) -> Decimal:
+        """Pay every pending installment in full and mark the loan paid.
+
+        Returns the amount settled. Runs a fixed number of queries whatever the
+        number of installments.
+        """
+
+        with transaction.atomic():
+            # Lock the loan so concurrent payments cannot interleave with the settlement.
+            Loan.objects.select_for_update().filter(pk=self.pk).values_list("pk").get()
+            pending = self.repayments.filter(status=Repayment.Status.PENDING)
+            remaining = pending.aggregate(
+                total=models.Sum(models.F("amount_due") - models.F("paid_amount"))
+            )["total"] or Decimal("0.00")
+            pending.update(
+                paid_amount=models.F("amount_due"),
+                status=Repayment.Status.PAID,
+                paid_date=timezone.now().date(),
+            )
+            Loan.objects.filter(pk=self.pk).update(outstanding_amount=models.F("outstanding_amount") - remaining)
+            self.refresh_from_db(fields=["outstanding_amount"])
+            self.mark_paid()
+        getattr(self, "_prefetched_objects_cache", {}).pop("repayments", None)
+        return remaining.quantize(Decimal("0.01"))
+
     def mark_paid(self) -> None:
         """Mark the loan as fully repaid."""
 
@@ -206,7 +289,9 @@ class Loan(models.Model):
             raise ValidationError("Only active loans can be marked as paid.")
         self.status = self.Status.PAID
         self.paid_at = timezone.now()
-        self.save(update_fields=["status", "paid_at", "updated_at"])
+        self.next_due_date = None
+        self.next_due_amount = None
+        self.save(update_fields=["status", "paid_at", "next_due_date", "next_due_amount", "updated_at"])
 
 
 class Repayment(models.Model):
@@ -264,4 +349,18 @@ class Repayment(models.Model):
         if self.paid_amount == self.amount_due:
             self.status = self.Status.PAID
             self.paid_date = timezone.now().date()
-        self.save(update_fields=["paid_amount", "status", "paid_date"])
+        with transaction.atomic():
+            self.save(update_fields=["paid_amount", "status", "paid_date"])
+            changes: dict[str, object] = {"outstanding_amount": models.F("outstanding_amount") - amount}
+            if self.status == self.Status.PAID:
+                upcoming = (
+                    Repayment.objects.filter(loan_id=self.loan_id, status=self.Status.PENDING)
+                    .order_by("due_date", "id")
+                    .values("due_date", "amount_due")
+                    .first()
+                )
+                changes["next_due_date"] = upcoming["due_date"] if upcoming else None
+                changes["next_due_amount"] = upcoming["amount_due"] if upcoming else None
+            Loan.objects.filter(pk=self.loan_id).update(**changes)
+        if Repayment.loan.is_cached(self):
+            self.loan.refresh_from_db(fields=["outstanding_amount", "next_due_date", "next_due_amount"])
@@ -0,0 +1,106 @@
+"""Repayment schedule arithmetic for the loan schedule types.
+
+Amounts are computed in integer cents with NumPy, one array operation per
+column, so a long schedule costs no more than a short one. Every schedule is
+reconciled on its last installment: principal portions always add up to the
+principal exactly and the interest portions to the interest charged.
+
+``Loan.interest_rate`` is the rate for the whole term (see ``LoanScheme``), so
+the periodic rate used by the monthly schedules is ``rate / term_months``.
+With it, equal monthly and interest-only schedules charge the same interest as
+the single repayment, while the amortized schedule charges interest on the
+reducing balance only.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """Installment amounts (in cents) and due dates, oldest first."""
+
+    amounts: np.ndarray
+    due_dates: list[date]
+    interest: int
+
+    @property
+    def total(self) -> int:
+        return int(self.amounts.sum())
+
+
+def to_cents(amount: Decimal) -> int:
+    return int((amount.quantize(CENT) / CENT).to_integral_value())
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(int(cents)) * CENT).quantize(CENT)
+
+
+def monthly_due_dates(start: date, installments: int) -> list[date]:
+    return [start + relativedelta(months=month) for month in range(1, installments + 1)]
+
+
+def build_schedule(schedule_type: str, principal: Decimal, rate_percent: Decimal, term_months: int, start: date) -> Schedule:
+    """Compute the installments of a ``LoanScheme.ScheduleType`` schedule."""
+
+    if schedule_type == "equal_monthly":
+        amounts, interest = _equal_monthly(principal, rate_percent, term_months)
+    elif schedule_type == "amortized":
+        amounts, interest = _amortized(to_cents(principal), float(rate_percent) / 100 / term_months, term_months)
+    elif schedule_type == "interest_only":
+        amounts, interest = _interest_only(principal, rate_percent, term_months)
+    else:
+        raise ValueError(f"Unknown schedule type: {schedule_type}")
+    # Amounts too small to spread over every month (a 0% interest-only loan, say)
+    # leave zero-cent months; drop them rather than schedule empty installments.
+    # The last installment always carries the remainder, so maturity is kept.
+    payable = amounts > 0
+    due_dates = [day for day, keep in zip(monthly_due_dates(start, term_months), payable.tolist()) if keep]
+    return Schedule(amounts=amounts[payable], due_dates=due_dates, interest=interest)
+
+
+def _split_evenly(total: int, parts: int) -> np.ndarray:
+    """``parts`` cent amounts summing to ``total``; the last one absorbs the remainder."""
+
+    amounts = np.full(parts, total // parts, dtype=np.int64)
+    amounts[-1] += total - int(amounts.sum())
+    return amounts
+
+
+def simple_interest(principal: Decimal, rate_percent: Decimal) -> Decimal:
+    """Interest for the whole term, rounded like the single-repayment schedule."""
+
+    return (principal * (rate_percent / Decimal("100"))).quantize(CENT)
+
+
+def _equal_monthly(principal: Decimal, rate_percent: Decimal, installments: int) -> tuple[np.ndarray, int]:
+    interest = to_cents(simple_interest(principal, rate_percent))
+    return _split_evenly(to_cents(principal) + interest, installments), interest
+
+
+def _interest_only(principal: Decimal, rate_percent: Decimal, installments: int) -> tuple[np.ndarray, int]:
+    interest = to_cents(simple_interest(principal, rate_percent))
+    amounts = _split_evenly(interest, installments)
+    amounts[-1] += to_cents(principal)
+    return amounts, interest
+
+
+def _amortized(principal_cents: int, periodic_rate: float, installments: int) -> tuple[np.ndarray, int]:
+    if periodic_rate == 0:
+        return _split_evenly(principal_cents, installments), 0
+    growth = (1 + periodic_rate) ** np.arange(installments, dtype=np.float64)
+    payment = np.rint(principal_cents * periodic_rate / (1 - (1 + periodic_rate) ** -installments))
+    # Balance before each installment when every payment is the rounded amount.
+    opening = principal_cents * growth - payment * (growth - 1) / periodic_rate
+    interest = np.rint(opening * periodic_rate).astype(np.int64)
+    principal_part = np.full(installments, int(payment), dtype=np.int64) - interest
+    principal_part[-1] = principal_cents - int(principal_part[:-1].sum())
+    return principal_part + interest, int(interest.sum())
@@ -6,7 +6,7 @@ from decimal import Decimal
 from django.utils import timezone
 from rest_framework import serializers
 
-from users.serializers import UserMeSerializer
+from users.serializers import UserSummarySerializer
 
 from .models import Loan, LoanScheme, Repayment
 
@@ -26,6 +26,7 @@ class LoanSchemeSerializer(serializers.ModelSerializer[LoanScheme]):
             "principal",
             "interest_rate",
             "term_months",
+            "schedule_type",
             "max_payback_days",
             "is_active",
             "created_at",
@@ -54,11 +55,13 @@ class RepaymentSerializer(serializers.ModelSerializer[Repayment]):
 class LoanSerializer(serializers.ModelSerializer[Loan]):
     """Serialize loans with nested repayments."""
 
-    user = UserMeSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
     scheme = LoanSchemeSerializer(read_only=True)
-    outstanding_balance = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    outstanding_balance = serializers.DecimalField(
+        source="outstanding_amount", max_digits=12, decimal_places=2, read_only=True
+    )
     next_due_date = serializers.SerializerMethodField()
-    next_due_amount = serializers.SerializerMethodField()
+    next_due_amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
     max_payback_days = serializers.SerializerMethodField()
     current_amount_due = serializers.SerializerMethodField()
     repayments = RepaymentSerializer(many=True, read_only=True)
@@ -77,6 +80,7 @@ class LoanSerializer(serializers.ModelSerializer[Loan]):
             "start_date",
             "due_date",
             "term_months",
+            "schedule_type",
             "status",
             "created_at",
             "updated_at",
@@ -107,6 +111,7 @@ class LoanSerializer(serializers.ModelSerializer[Loan]):
             "scheme",
             "interest_amount",
             "total_payable",
+            "schedule_type",
             "applied_at",
             "approved_at",
             "declined_at",
@@ -124,16 +129,11 @@ class LoanSerializer(serializers.ModelSerializer[Loan]):
         return value
 
     def get_next_due_date(self, obj: Loan):
-        pending = obj.repayments.filter(status=Repayment.Status.PENDING, due_date__gte=timezone.now().date()).first()
+        pending = obj.pending_repayment(on_or_after=timezone.now().date())
         return pending.due_date if pending else None
 
-    def get_next_due_amount(self, obj: Loan):
-        pending = obj.repayments.filter(status=Repayment.Status.PENDING).first()
-        return pending.amount_due if pending else None
-
     def get_current_amount_due(self, obj: Loan):
-        amount, _ = obj.next_due
-        return amount
+        return obj.next_due_amount or Decimal("0.00")
 
     def get_max_payback_days(self, obj: Loan) -> int:
         scheme = obj.scheme
@@ -172,6 +172,7 @@ class LoanCreateSerializer(serializers.ModelSerializer[Loan]):
             interest_amount=Decimal("0.00"),
             total_payable=scheme.principal,
             term_months=scheme.term_months,
+            schedule_type=scheme.schedule_type,
             notes=validated_data.get("notes", ""),
         )
         return loan
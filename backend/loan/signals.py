@@ -1,12 +1,14 @@
 """Signals for loan app."""
 from __future__ import annotations
 
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from core.cache import bump_data_version_on_commit
 from notifications.utils import create_notification
 
-from .models import Loan
+from .models import Loan, LoanScheme, Repayment
 
 
 @receiver(post_save, sender=Loan)
@@ -22,3 +24,31 @@ def handle_loan_created(sender, instance: Loan, created: bool, **_: object) -> N
         message=f"Your application for {instance.lender_name} is pending review.",
         notification_type="loan",
     )
+
+
+@receiver(post_save, sender=Loan)
+@receiver(post_delete, sender=Loan)
+@receiver(post_save, sender=Repayment)
+@receiver(post_delete, sender=Repayment)
+def bump_loan_version(sender, instance: Loan | Repayment, **_: object) -> None:
+    """Invalidate ETags of the owner's loan reads (and admins' cross-user ones)."""
+
+    user_id = instance.user_id if isinstance(instance, Loan) else instance.loan.user_id
+    bump_data_version_on_commit(user_id, "loan")
+    bump_data_version_on_commit(None, "loan")
+
+
+@receiver(post_save, sender=LoanScheme)
+@receiver(post_delete, sender=LoanScheme)
+def bump_scheme_version(sender, instance: LoanScheme, **_: object) -> None:
+    bump_data_version_on_commit(None, "loan-schemes")
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_borrower_version(sender, instance, update_fields=None, **_: object) -> None:
+    """Loan payloads embed the borrower's profile; refresh them when it changes."""
+
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    bump_data_version_on_commit(instance.pk, "loan")
+    bump_data_version_on_commit(None, "loan")
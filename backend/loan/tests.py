@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from django.contrib.auth import get_user_model
 
+from .balances import reconcile
 from .models import Loan, LoanScheme
+from .schedules import build_schedule
 
 User = get_user_model()
 
@@ -76,3 +85,175 @@ class LoanWorkflowTests(APITestCase):
 		repayment = loan.repayments.first()
 		self.assertIsNotNone(repayment)
 		self.assertEqual(repayment.status, repayment.Status.PAID)
+
+	def test_computed_fields_read_prefetched_repayments(self) -> None:
+		self.scheme.refresh_from_db()
+		for _ in range(3):
+			loan = Loan.objects.create(
+				user=self.student,
+				scheme=self.scheme,
+				lender_name=self.scheme.lender_name,
+				principal=self.scheme.principal,
+				interest_rate=self.scheme.interest_rate,
+				term_months=self.scheme.term_months,
+			)
+			loan.activate()
+		first = loan.repayments.get()
+		first.apply_payment(Decimal("100.00"))
+
+		loans = list(Loan.objects.prefetch_related("repayments").order_by("id"))
+		with self.assertNumQueries(0):
+			balances = [loan.outstanding_balance for loan in loans]
+			pending = [loan.pending_repayment(on_or_after=date.today()) for loan in loans]
+			amounts = [loan.next_due[0] for loan in loans]
+		self.assertEqual(balances, [Decimal("630.00"), Decimal("630.00"), Decimal("530.00")])
+		self.assertTrue(all(repayment is not None for repayment in pending))
+		self.assertEqual(amounts, [Decimal("630.00")] * 3)
+
+	def test_balance_columns_follow_repayments_and_reconcile(self) -> None:
+		self.scheme.refresh_from_db()
+		loan = Loan.objects.create(
+			user=self.student,
+			scheme=self.scheme,
+			lender_name=self.scheme.lender_name,
+			principal=self.scheme.principal,
+			interest_rate=self.scheme.interest_rate,
+			term_months=self.scheme.term_months,
+		)
+		loan.activate()
+		loan.refresh_from_db()
+		self.assertEqual(loan.outstanding_amount, Decimal("630.00"))
+		self.assertEqual(loan.next_due_date, loan.due_date)
+		self.assertEqual(loan.next_due_amount, Decimal("630.00"))
+
+		repayment = loan.repayments.select_related("loan").get()
+		repayment.apply_payment(Decimal("30.00"))
+		self.assertEqual(repayment.loan.outstanding_amount, Decimal("600.00"))
+		repayment.apply_payment(Decimal("600.00"))
+		loan.refresh_from_db()
+		self.assertEqual(loan.outstanding_amount, Decimal("0.00"))
+		self.assertIsNone(loan.next_due_date)
+		self.assertIsNone(loan.next_due_amount)
+
+		Loan.objects.filter(pk=loan.pk).update(outstanding_amount=Decimal("12.00"))
+		out = StringIO()
+		call_command("reconcile_loan_balances", "--dry-run", stdout=out)
+		self.assertIn("Found 1 loans", out.getvalue())
+		call_command("reconcile_loan_balances", stdout=StringIO())
+		loan.refresh_from_db()
+		self.assertEqual(loan.outstanding_amount, Decimal("0.00"))
+		self.assertEqual(reconcile(fix=False), [])
+
+	def test_admin_history_pages_with_single_count_query(self) -> None:
+		other = User.objects.create_user(
+			email="otherstudent@example.com",
+			password="password123",
+			username="otherstudent",
+			role="student",
+		)
+		self.scheme.refresh_from_db()
+		for index, owner in enumerate([self.student, other] * 3):
+			loan = Loan.objects.create(
+				user=owner,
+				scheme=self.scheme,
+				lender_name=self.scheme.lender_name,
+				principal=self.scheme.principal,
+				interest_rate=self.scheme.interest_rate,
+				term_months=self.scheme.term_months,
+			)
+			if index % 2:
+				loan.activate()
+
+		self.authenticate("loanadmin@example.com", "password123")
+		url = reverse("loan-admin-history")
+		with CaptureQueriesContext(connection) as queries:
+			first = self.client.get(url, {"page_size": 4})
+		self.assertEqual(sum("COUNT(" in query["sql"] for query in queries.captured_queries), 1)
+		self.assertEqual(first.status_code, status.HTTP_200_OK)
+		body = first.json()
+		self.assertEqual(len(body["results"]), 4)
+		self.assertEqual(body["totals"]["pending"], 3)
+		self.assertEqual(body["totals"]["active"], 3)
+		self.assertEqual(body["totals"]["total"], 6)
+		second = self.client.get(body["next"]).json()
+		self.assertEqual(len(second["results"]), 2)
+		self.assertIsNone(second["next"])
+
+		filtered = self.client.get(url, {"status": "active", "email": "OtherStudent@example.com"}).json()
+		self.assertEqual(len(filtered["results"]), 3)
+		self.assertEqual(filtered["totals"]["total"], 3)
+		self.assertEqual(self.client.get(url, {"start": "2020-02-01", "end": "2020-01-01"}).status_code, 400)
+		self.assertEqual(self.client.get(url, {"status": "unknown"}).status_code, 400)
+
+	def test_nested_user_balance_is_opt_in(self) -> None:
+		Loan.objects.create(
+			user=self.student,
+			scheme=self.scheme,
+			lender_name=self.scheme.lender_name,
+			principal=self.scheme.principal,
+			interest_rate=self.scheme.interest_rate,
+			term_months=self.scheme.term_months,
+		)
+		self.authenticate("loanstudent@example.com", "password123")
+		url = reverse("loan-list")
+		compact = self.client.get(url).json()["results"][0]["user"]
+		self.assertEqual(set(compact), {"id", "email", "first_name", "last_name", "student_id"})
+		expanded = self.client.get(url, {"expand": "user.balance"})
+		self.assertEqual(expanded.json()["results"][0]["user"]["current_balance"], 0.0)
+		self.assertNotEqual(expanded["ETag"], self.client.get(url)["ETag"])
+
+	def test_installment_schedules_reconcile_and_payoff_settles_all(self) -> None:
+		self.scheme.refresh_from_db()
+		self.scheme.schedule_type = LoanScheme.ScheduleType.EQUAL_MONTHLY
+		self.scheme.principal = Decimal("100.00")
+		self.scheme.term_months = 3
+		self.scheme.save()
+		self.authenticate("loanstudent@example.com", "password123")
+		loan_id = self.client.post(reverse("loan-list"), {"scheme_id": self.scheme.id}).json()["id"]
+		loan = Loan.objects.get(pk=loan_id)
+		self.assertEqual(loan.schedule_type, LoanScheme.ScheduleType.EQUAL_MONTHLY)
+		# Loan update, stale schedule delete and one bulk insert.
+		with self.assertNumQueries(3):
+			loan.activate()
+		amounts = list(loan.repayments.order_by("due_date").values_list("amount_due", flat=True))
+		self.assertEqual(amounts, [Decimal("35.00"), Decimal("35.00"), Decimal("35.00")])
+		self.assertEqual(loan.total_payable, Decimal("105.00"))
+
+		response = self.client.post(reverse("loan-payoff", args=[loan_id]))
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(response.json()["outstanding_balance"], "0.00")
+		self.assertFalse(loan.repayments.filter(status="pending").exists())
+
+		for schedule_type in (LoanScheme.ScheduleType.AMORTIZED, LoanScheme.ScheduleType.INTEREST_ONLY):
+			long_loan = Loan(
+				user=self.student,
+				scheme=self.scheme,
+				lender_name="Bank",
+				principal=Decimal("25000.00"),
+				interest_rate=Decimal("60.00"),
+				term_months=120,
+				schedule_type=schedule_type,
+				start_date=date(2026, 1, 31),
+			)
+			schedule = list(long_loan.generate_repayment_schedule())
+			self.assertEqual(len(schedule), 120)
+			self.assertEqual(sum(repayment.amount_due for repayment in schedule), long_loan.total_payable)
+			self.assertEqual(long_loan.total_payable - long_loan.interest_amount, Decimal("25000.00"))
+			self.assertEqual(schedule[0].due_date, date(2026, 2, 28))
+			self.assertEqual(schedule[-1].due_date, long_loan.due_date)
+		self.assertEqual(schedule[0].amount_due, Decimal("125.00"))
+		self.assertEqual(schedule[-1].amount_due, Decimal("25125.00"))
+
+	def test_schedules_never_emit_zero_cent_installments(self) -> None:
+		start = date(2026, 1, 15)
+		balloon = build_schedule(LoanScheme.ScheduleType.INTEREST_ONLY, Decimal("100.00"), Decimal("0.00"), 120, start)
+		self.assertEqual(balloon.amounts.tolist(), [10000])
+		self.assertEqual(balloon.due_dates, [date(2036, 1, 15)])
+
+		tiny = build_schedule(LoanScheme.ScheduleType.INTEREST_ONLY, Decimal("100.00"), Decimal("0.05"), 120, start)
+		self.assertEqual(tiny.amounts.tolist(), [10005])
+		for schedule_type in LoanScheme.ScheduleType.values[1:]:
+			plan = build_schedule(schedule_type, Decimal("0.50"), Decimal("0.00"), 120, start)
+			self.assertTrue((plan.amounts > 0).all())
+			self.assertEqual(plan.total, 50)
+			self.assertEqual(plan.due_dates[-1], date(2036, 1, 15))
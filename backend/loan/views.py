@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import QuerySet
+from django.db.models import Count, QuerySet
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status, viewsets
@@ -17,7 +18,10 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
+from core.cache import get_data_version
+from core.conditional import ConditionalGetMixin
 from notifications.utils import create_notification
+from users.serializers import requested_expansions
 
 from .models import Loan, LoanScheme, Repayment
 from .serializers import LoanCreateSerializer, LoanSchemeSerializer, LoanSerializer, RepaymentSerializer
@@ -25,12 +29,16 @@ from .serializers import LoanCreateSerializer, LoanSchemeSerializer, LoanSeriali
 User = get_user_model()
 
 
-class LoanSchemeViewSet(viewsets.ModelViewSet[LoanScheme]):
+class LoanSchemeViewSet(ConditionalGetMixin, viewsets.ModelViewSet[LoanScheme]):
     """Expose loan schemes to administrators and students."""
 
     serializer_class = LoanSchemeSerializer
     permission_classes = [IsAuthenticated]
+    # Students do not see schemes they already applied to.
+    etag_scopes = ("loan",)
+    etag_global_scopes = ("loan-schemes",)
     ordering = ("-created_at",)
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self) -> QuerySet[LoanScheme]:
         queryset = LoanScheme.objects.all()
@@ -62,12 +70,23 @@ class LoanSchemeViewSet(viewsets.ModelViewSet[LoanScheme]):
         serializer.save()
 
 
-class LoanViewSet(viewsets.ModelViewSet[Loan]):
+class LoanViewSet(ConditionalGetMixin, viewsets.ModelViewSet[Loan]):
     """Manage loan applications and lifecycle."""
 
     serializer_class = LoanSerializer
     permission_classes = [IsAuthenticated]
+    etag_scopes = ("loan",)
+    etag_global_scopes = ("loan-schemes",)
+    etag_staff_sees_all = True
     ordering = ("-created_at",)
+    keyset_ordering = ("-created_at", "-id")
+
+    def etag_versions(self, request: Request) -> list[int]:
+        versions = super().etag_versions(request)
+        if any(path.endswith(".balance") for path in requested_expansions(request)):
+            # Expanded borrower balances change with any of their finance writes.
+            versions.append(get_data_version(None, "finance"))
+        return versions
 
     def create(self, request: Request, *args, **kwargs) -> Response:
         serializer = self.get_serializer(data=request.data)
@@ -144,7 +163,6 @@ class LoanViewSet(viewsets.ModelViewSet[Loan]):
 
         loans = (
             Loan.objects.select_related("scheme")
-            .prefetch_related("repayments")
             .filter(user=target_user, status=Loan.Status.ACTIVE)
             .order_by("due_date", "created_at")
         )
@@ -152,8 +170,8 @@ class LoanViewSet(viewsets.ModelViewSet[Loan]):
         today = timezone.now().date()
         payload = []
         for loan in loans:
-            amount_due, next_repayment = loan.next_due
-            due_date = next_repayment.due_date if next_repayment else loan.due_date
+            amount_due = loan.next_due_amount
+            due_date = loan.next_due_date or loan.due_date
             payload.append(
                 {
                     "id": loan.id,
@@ -162,7 +180,7 @@ class LoanViewSet(viewsets.ModelViewSet[Loan]):
                     "status": loan.status,
                     "due_date": due_date,
                     "amount_due": amount_due or loan.total_payable,
-                    "outstanding_balance": loan.outstanding_balance,
+                    "outstanding_balance": loan.outstanding_amount,
                     "days_until_due": (due_date - today).days if due_date else None,
                 }
             )
@@ -193,18 +211,58 @@ class LoanViewSet(viewsets.ModelViewSet[Loan]):
         permission_classes=[IsAuthenticated, IsAdminUser],
     )
     def admin_history(self, request: Request) -> Response:
-        """Provide administrators with full loan history overview."""
+        """Provide administrators with a paginated loan history and status totals.
+
+        Accepts ``status``, ``scheme``, ``email`` and an applied ``start``/``end``
+        date range. The totals cover every status within the other filters.
+        """
+
+        params = request.query_params
+        queryset = Loan.objects.all()
+        scheme_id = params.get("scheme")
+        if scheme_id:
+            if not scheme_id.isdigit():
+                return Response({"detail": "Invalid scheme id."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(scheme_id=int(scheme_id))
+        email = params.get("email")
+        if email:
+            queryset = queryset.filter(user__in=User.objects.filter(email__iexact=email.strip()).values("id"))
+        try:
+            start = date.fromisoformat(params["start"]) if params.get("start") else None
+            end = date.fromisoformat(params["end"]) if params.get("end") else None
+        except ValueError:
+            return Response({"detail": "Invalid date format."}, status=status.HTTP_400_BAD_REQUEST)
+        if start and end and end < start:
+            return Response(
+                {"detail": "End date must be greater than or equal to start date."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # Compare against datetimes so the created_at indexes stay usable.
+        if start:
+            queryset = queryset.filter(created_at__gte=_day_start(start))
+        if end:
+            queryset = queryset.filter(created_at__lt=_day_start(end + timedelta(days=1)))
+
+        totals = {choice: 0 for choice in Loan.Status.values}
+        for row in queryset.values("status").annotate(count=Count("id")).order_by():
+            totals[row["status"]] = row["count"]
+        totals["total"] = sum(totals.values())
+
+        status_filter = params.get("status")
+        if status_filter:
+            if status_filter not in Loan.Status.values:
+                return Response({"detail": "Invalid status."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(status=status_filter)
 
-        queryset = Loan.objects.select_related("user", "scheme").prefetch_related("repayments")
-        serializer = LoanSerializer(queryset, many=True, context=self.get_serializer_context())
-        totals = {
-            "pending": queryset.filter(status=Loan.Status.PENDING).count(),
-            "active": queryset.filter(status=Loan.Status.ACTIVE).count(),
-            "paid": queryset.filter(status=Loan.Status.PAID).count(),
-            "closed": queryset.filter(status=Loan.Status.CLOSED).count(),
-            "defaulted": queryset.filter(status=Loan.Status.DEFAULTED).count(),
-        }
-        return Response({"results": serializer.data, "totals": totals})
+        queryset = queryset.select_related("user", "scheme").prefetch_related("repayments")
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            serializer = LoanSerializer(queryset.order_by(*self.keyset_ordering), many=True, context=self.get_serializer_context())
+            return Response({"results": serializer.data, "totals": totals})
+        serializer = LoanSerializer(page, many=True, context=self.get_serializer_context())
+        response = self.get_paginated_response(serializer.data)
+        response.data["totals"] = totals
+        return response
 
     @action(
         detail=True,
@@ -263,17 +321,15 @@ class LoanViewSet(viewsets.ModelViewSet[Loan]):
         if loan.status != Loan.Status.ACTIVE:
             return Response({"detail": "Only active loans can be paid off."}, status=status.HTTP_400_BAD_REQUEST)
 
-        repayment = loan.repayments.filter(status=Repayment.Status.PENDING).order_by("due_date").first()
-        if not repayment:
+        pending = [repayment for repayment in loan.repayment_list() if repayment.status == Repayment.Status.PENDING]
+        if not pending:
             return Response({"detail": "No pending repayments found."}, status=status.HTTP_400_BAD_REQUEST)
 
-        outstanding = (repayment.amount_due - repayment.paid_amount).quantize(Decimal("0.01"))
+        outstanding = sum((repayment.amount_due - repayment.paid_amount for repayment in pending), Decimal("0.00"))
         if outstanding <= Decimal("0.00"):
             return Response({"detail": "This loan is already settled."}, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            repayment.apply_payment(outstanding)
-            loan.mark_paid()
+        loan.settle()
 
         lender_name = loan.scheme.lender_name if loan.scheme else loan.lender_name
         create_notification(
@@ -289,3 +345,7 @@ class LoanViewSet(viewsets.ModelViewSet[Loan]):
         loan = self.get_object()
         serializer = RepaymentSerializer(loan.repayments.all(), many=True)
         return Response(serializer.data)
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
@@ -1,4 +1,17 @@
-"""Placeholder for notification-related signals."""
+"""Signals for the notifications app."""
 from __future__ import annotations
 
-# Signals can be added here when notification side effects are needed.
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_data_version_on_commit
+
+from .models import Notification
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def bump_notification_version(sender, instance: Notification, **_: object) -> None:
+    """Invalidate ETags of the owner's notification list."""
+
+    bump_data_version_on_commit(instance.user_id, "notifications")
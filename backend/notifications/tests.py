@@ -32,6 +32,11 @@ class NotificationAPITests(APITestCase):
 	def test_list_notifications(self) -> None:
 		response = self.client.get(reverse("notification-list"))
 		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(len(response.json()["results"]), 1)
+
+	def test_list_notifications_legacy_mode(self) -> None:
+		response = self.client.get(reverse("notification-list"), {"paginate": "false"})
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
 		self.assertEqual(len(response.json()), 1)
 
 	def test_mark_notifications_read(self) -> None:
@@ -40,3 +45,20 @@ class NotificationAPITests(APITestCase):
 		self.assertEqual(response.status_code, status.HTTP_200_OK)
 		note.refresh_from_db()
 		self.assertTrue(note.is_read)
+
+	def test_list_revalidates_with_etag(self) -> None:
+		url = reverse("notification-list")
+		first = self.client.get(url)
+		etag = first["ETag"]
+
+		with self.assertNumQueries(1):
+			unchanged = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+		self.assertEqual(unchanged.content, b"")
+
+		with self.captureOnCommitCallbacks(execute=True):
+			self.client.post(reverse("notification-mark-read"), {"mark_all": True})
+		refreshed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+		self.assertTrue(refreshed.json()["results"][0]["is_read"])
+		self.assertNotEqual(refreshed["ETag"], etag)
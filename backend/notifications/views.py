@@ -8,15 +8,20 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from core.cache import bump_data_version_on_commit
+from core.conditional import ConditionalGetMixin
+
 from .models import Notification
 from .serializers import NotificationMarkSerializer, NotificationSerializer
 
 
-class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet[Notification]):
+class NotificationViewSet(ConditionalGetMixin, mixins.ListModelMixin, viewsets.GenericViewSet[Notification]):
 	"""List and update notifications for the current user."""
 
 	serializer_class = NotificationSerializer
 	permission_classes = [IsAuthenticated]
+	etag_scopes = ("notifications",)
+	keyset_ordering = ("-created_at", "-id")
 
 	def get_queryset(self):
 		return Notification.objects.filter(user=self.request.user)
@@ -32,6 +37,9 @@ class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet[Notific
 		else:
 			ids = data.get("ids", [])
 			updated = queryset.filter(id__in=ids).update(is_read=True)
+		if updated:
+			# ``update`` skips the model signals that normally bump the version.
+			bump_data_version_on_commit(request.user.pk, "notifications")
 		return Response({"updated": updated}, status=status.HTTP_200_OK)
 
 	@action(detail=True, methods=["post"], url_path="mark-read")
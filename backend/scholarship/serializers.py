@@ -5,7 +5,7 @@ from __future__ import annotations
 from django.utils import timezone
 from rest_framework import serializers
 
-from users.serializers import UserMeSerializer
+from users.serializers import UserSummarySerializer
 
 from .models import Scholarship, ScholarshipApplication
 
@@ -76,7 +76,7 @@ class ScholarshipListSerializer(serializers.ModelSerializer[Scholarship]):
 class ScholarshipApplicationSerializer(serializers.ModelSerializer[ScholarshipApplication]):
 	scholarship = serializers.PrimaryKeyRelatedField(read_only=True)
 	scholarship_name = serializers.CharField(source="scholarship.name", read_only=True)
-	applicant = UserMeSerializer(read_only=True)
+	applicant = UserSummarySerializer(read_only=True)
 	note = serializers.CharField(allow_blank=False, trim_whitespace=True)
 
 	class Meta:
@@ -36,6 +36,7 @@ class ScholarshipViewSet(viewsets.ModelViewSet[Scholarship]):
 
 	queryset = Scholarship.objects.all()
 	permission_classes = [IsAuthenticated]
+	keyset_ordering = ("deadline", "name", "id")
 
 	def _ensure_admin(self, request: Request) -> None:
 		if not _is_admin_user(request.user):
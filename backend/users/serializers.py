@@ -94,24 +94,62 @@ class UserMeSerializer(serializers.ModelSerializer[User]):
         read_only_fields = ("id", "email", "role")
 
     def get_current_balance(self, obj: User) -> Decimal:
-        today = timezone.now().date()
-        current_month_start = today.replace(day=1)
-        next_month_start = _shift_month(current_month_start, 1)
-
-        income_total = (
-            obj.incomes.filter(date_received__gte=current_month_start, date_received__lt=next_month_start)
-            .aggregate(total=Sum("amount"))
-            .get("total")
-            or Decimal("0.00")
-        )
-        expense_total = (
-            obj.expenses.filter(date_spent__gte=current_month_start, date_spent__lt=next_month_start)
-            .aggregate(total=Sum("amount"))
-            .get("total")
-            or Decimal("0.00")
-        )
-        balance = Decimal(income_total) - Decimal(expense_total)
-        return balance.quantize(Decimal("0.01"))
+        return month_balance(obj)
+
+
+class UserSummarySerializer(serializers.ModelSerializer[User]):
+    """Compact user representation embedded in loan, scholarship and admin payloads.
+
+    The month balance costs two aggregates per user, so it is only included when
+    the request asks for it with ``?expand=user.balance`` (or
+    ``<field>.balance`` for the name the user is nested under).
+    """
+
+    class Meta:
+        model = User
+        fields = ("id", "email", "first_name", "last_name", "student_id")
+        read_only_fields = fields
+
+    def to_representation(self, instance: User) -> dict[str, Any]:
+        data = super().to_representation(instance)
+        if self.is_expanded("balance"):
+            data["current_balance"] = month_balance(instance)
+        return data
+
+    def is_expanded(self, name: str) -> bool:
+        request = self.context.get("request")
+        if request is None:
+            return False
+        return bool(requested_expansions(request) & {f"user.{name}", f"{self.field_name}.{name}"})
+
+
+def requested_expansions(request) -> set[str]:
+    """Paths listed in ``?expand=`` (comma separated or repeated)."""
+
+    return {item.strip() for value in request.query_params.getlist("expand") for item in value.split(",") if item.strip()}
+
+
+def month_balance(user: User) -> Decimal:
+    """Income minus expenses for the current calendar month."""
+
+    today = timezone.now().date()
+    current_month_start = today.replace(day=1)
+    next_month_start = _shift_month(current_month_start, 1)
+
+    income_total = (
+        user.incomes.filter(date_received__gte=current_month_start, date_received__lt=next_month_start)
+        .aggregate(total=Sum("amount"))
+        .get("total")
+        or Decimal("0.00")
+    )
+    expense_total = (
+        user.expenses.filter(date_spent__gte=current_month_start, date_spent__lt=next_month_start)
+        .aggregate(total=Sum("amount"))
+        .get("total")
+        or Decimal("0.00")
+    )
+    balance = Decimal(income_total) - Decimal(expense_total)
+    return balance.quantize(Decimal("0.01"))
 
 
 def _shift_month(reference: date, offset: int) -> date:
@@ -44,6 +44,7 @@ class UserViewSet(viewsets.ModelViewSet[User]):
 	filterset_fields = ("role", "is_active")
 	search_fields = ("email", "first_name", "last_name", "student_id")
 	ordering_fields = ("email", "date_joined")
+	keyset_ordering = ("email",)
 
 	def get_permissions(self):
 		if self.action in {"list", "destroy", "create"}:
@@ -41,7 +41,7 @@ const TransactionForm = ({
   const { data: categoriesData } = useQuery({
     queryKey: ['finance', 'categories', 'options'],
     queryFn: async () => {
-      const { data } = await api.get('/api/finance/categories/');
+      const { data } = await api.get('/api/finance/categories/', { params: { paginate: false } });
       return data;
     },
     enabled: type === 'expense'
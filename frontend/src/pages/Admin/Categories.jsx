@@ -23,7 +23,7 @@ const Categories = () => {
   const { data, isLoading } = useQuery({
     queryKey: ['finance', 'categories', 'admin'],
     queryFn: async () => {
-      const { data: response } = await api.get('/api/finance/categories/');
+      const { data: response } = await api.get('/api/finance/categories/', { params: { paginate: false } });
       return response;
     },
     enabled: isAdmin
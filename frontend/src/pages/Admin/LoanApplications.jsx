@@ -1,4 +1,3 @@
-import { useMemo } from 'react';
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import api from '../../api/api.js';
 import { formatCurrency, formatDate } from '../../utils/format.js';
@@ -12,6 +11,25 @@ const parseList = (payload) => {
   return [];
 };
 
+const HISTORY_URL = '/api/loan/loans/admin/history/';
+const STATUSES = ['pending', 'active', 'paid', 'closed'];
+
+// The history endpoint is keyset paginated: follow `next` until every loan of the status is loaded.
+const fetchStatusHistory = async (status) => {
+  const loans = [];
+  let totals = {};
+  let url = HISTORY_URL;
+  let params = { status, page_size: 200 };
+  while (url) {
+    const { data } = await api.get(url, { params });
+    loans.push(...parseList(data));
+    totals = data?.totals ?? totals;
+    url = data?.next ?? null;
+    params = undefined;
+  }
+  return { loans, totals };
+};
+
 const LoanApplications = () => {
   const { user } = useAuth();
   const queryClient = useQueryClient();
@@ -20,8 +38,9 @@ const LoanApplications = () => {
   const { data, isLoading } = useQuery({
     queryKey: ['loan', 'admin', 'history'],
     queryFn: async () => {
-      const { data } = await api.get('/api/loan/loans/admin/history/');
-      return data;
+      const pages = await Promise.all(STATUSES.map(fetchStatusHistory));
+      const byStatus = Object.fromEntries(STATUSES.map((status, index) => [status, pages[index].loans]));
+      return { byStatus, totals: pages[0].totals };
     }
   });
 
@@ -45,13 +64,13 @@ const LoanApplications = () => {
     onError: () => pushToast('Unable to decline loan.', 'error')
   });
 
-  const applications = useMemo(() => parseList(data?.results), [data]);
+  const byStatus = data?.byStatus ?? {};
   const totals = data?.totals ?? {};
 
-  const pending = applications.filter((loan) => loan.status === 'pending');
-  const active = applications.filter((loan) => loan.status === 'active');
-  const paid = applications.filter((loan) => loan.status === 'paid');
-  const closed = applications.filter((loan) => loan.status === 'closed');
+  const pending = byStatus.pending ?? [];
+  const active = byStatus.active ?? [];
+  const paid = byStatus.paid ?? [];
+  const closed = byStatus.closed ?? [];
 
   const handleApprove = (loanId) => approveMutation.mutate(loanId);
   const handleDecline = (loanId) => {
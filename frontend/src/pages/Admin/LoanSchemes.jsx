@@ -36,7 +36,7 @@ const LoanSchemes = () => {
   const { data: schemesData, isLoading } = useQuery({
     queryKey: ['loan', 'schemes', 'admin'],
     queryFn: async () => {
-      const { data } = await api.get('/api/loan/schemes/');
+      const { data } = await api.get('/api/loan/schemes/', { params: { paginate: false } });
       return data;
     }
   });
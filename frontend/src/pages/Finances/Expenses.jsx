@@ -25,7 +25,7 @@ const Expenses = () => {
   const { data: expensesData, isLoading } = useQuery({
     queryKey: ['finance', 'expenses', queryFilters],
     queryFn: async () => {
-      const { data } = await api.get('/api/finance/expenses/', { params: queryFilters });
+      const { data } = await api.get('/api/finance/expenses/', { params: { ...queryFilters, paginate: false } });
       return data;
     }
   });
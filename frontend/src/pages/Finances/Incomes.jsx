@@ -25,7 +25,7 @@ const Incomes = () => {
   const { data: incomesData, isLoading } = useQuery({
     queryKey: ['finance', 'incomes', queryFilters],
     queryFn: async () => {
-      const { data } = await api.get('/api/finance/incomes/', { params: queryFilters });
+      const { data } = await api.get('/api/finance/incomes/', { params: { ...queryFilters, paginate: false } });
       return data;
     }
   });
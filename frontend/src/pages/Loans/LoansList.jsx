@@ -23,7 +23,7 @@ const LoansList = () => {
   const { data: schemesData, isLoading: schemesLoading } = useQuery({
     queryKey: ['loan', 'schemes'],
     queryFn: async () => {
-      const { data } = await api.get('/api/loan/schemes/');
+      const { data } = await api.get('/api/loan/schemes/', { params: { paginate: false } });
       return data;
     },
     staleTime: 5 * 60 * 1000
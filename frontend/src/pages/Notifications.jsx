@@ -15,7 +15,7 @@ const Notifications = () => {
     queryKey: ['notifications', { unread: showUnread }],
     queryFn: async () => {
       const { data: response } = await api.get('/api/notifications/', {
-        params: { unread: showUnread || undefined }
+        params: { unread: showUnread || undefined, paginate: false }
       });
       return response;
     }
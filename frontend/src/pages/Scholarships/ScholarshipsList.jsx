@@ -10,7 +10,7 @@ const ScholarshipsList = () => {
   const { data, isLoading } = useQuery({
     queryKey: ['scholarships', 'list'],
     queryFn: async () => {
-      const { data: response } = await api.get('/api/scholarships/');
+      const { data: response } = await api.get('/api/scholarships/', { params: { paginate: false } });
       return response;
     }
   });